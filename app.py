@@ -2,6 +2,11 @@
 
 # app.py
 
+import importlib.util
+
+# spawn işçileri bu betik yerine içe aktarılabilir giriş modülünü __main__ olarak yükler (isci_girisi.py)
+__spec__ = importlib.util.find_spec("isci_girisi")
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -17,13 +22,42 @@ from solar_panel_analysis import (
     adjust_parameters,
     calculate_max_power,
     generate_hourly_irradiance,
-    calculate_panel_voltage_and_current
+    calculate_panel_voltage_and_current,
+    generate_hourly_production_profile,
+    hourly_time_index
 )
 
-from finansal_hesaplamalar import FinansalAnalizler
+from finansal_hesaplamalar import FinansalAnalizler, ORNEK_MARJINAL_EMISYON
 finansal_analizler = FinansalAnalizler()
 
+from tarife_hesaplamalari import (
+    TEK_ZAMANLI_TARIFE,
+    UC_ZAMANLI_TARIFE,
+    saatlik_sebeke_akisi,
+    tarife_fiyatlandir,
+    tarife_tablosu,
+    tarifeleri_karsilastir
+)
+
+from battery_storage import batarya_boyutlandirma
 from building_energy_analysis import calculate_building_energy
+from load_profiles import yuk_profilleri, yuk_profili_ozeti
+from building_registry import BuildingRegistry
+from peak_demand import tepe_talep_analizi
+from network_aggregation import (
+    sebeke_topolojisi,
+    agac_yuklenmesi,
+    FIDER_KAPASITESI_KVA,
+    TRAFO_KAPASITESI_KVA
+)
+from reactive_compensation import (
+    kompanzasyon_boyutlandir,
+    saatlik_guc_faktoru,
+    ENDUKTIF_SINIR,
+    KAPASITIF_SINIR
+)
+from scenario_store import ScenarioStore, input_hash
+from computation_graph import ComputationGraph
 from calisir import program_nasil_calisir
 from simulink_comparison import simulink_karsilastirma
 from time_series_analysis import show_time_series_analysis
@@ -61,6 +95,13 @@ average_temperatures_default = [
 
 days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
 
+# Senaryo sonuçları Streamlit yeniden çalıştırmaları ve yeniden başlatmalar arasında korunur
+@st.cache_resource
+def senaryo_deposunu_ac():
+    return ScenarioStore()
+
+senaryo_deposu = senaryo_deposunu_ac()
+
 # ==========================================
 # Streamlit Başlığı ve Açıklama
 # ==========================================
@@ -284,143 +325,154 @@ panel_parameters = {
 # Hesaplamalar
 yearly_optimum_angle = calculate_annual_optimum_angle(latitude)
 
-solar_data = {
-    'Ay': [],
-    'Gun Sayisi (J)': [],
-    'Gunes Sapma Acisi (°)': [],
-    'Optimum Panel Acisi (°)': [],
-    'Ortalama Gunluk Isinim (W/m²)': [],
-    'Ortalama Hava Sicakligi (°C)': [],
-    'Panel Sicakligi (°C)': []
-}
-
-panel_data = {
-    'Ay': [],
-    'Toplam Gerilim (V)': [],
-    'Toplam Akım (A)': [],
-    'Maksimum Güç (W)': []
-}
-
-for i in range(len(months)):
-    month = months[i]
-    if month not in selected_months:
-        continue  # Sadece seçili aylarda hesaplama yap
-    day = days_of_year[i]
-    G_radiation = global_radiation[i]
-    daylight = daylight_hours[i]
-    Ta = average_temperatures[i]
-
-    # Saatlik ışınım verilerini oluştur
-    hourly_irradiance = generate_hourly_irradiance(daylight, G_radiation)
-
-    # Ortalama günlük ışınımı hesapla
-    Gg = calculate_average_daily_irradiance_hourly(hourly_irradiance)
-
-    # Güneş sapma açısı
-    declination = calculate_declination(day)
-
-    # Optimum panel açısı
-    optimum_angle = latitude - declination
-
-    # Panel sıcaklığı
-    Tc = calculate_panel_temperature(Gg, Ta)
-
-    # Sıcaklık farkı
-    delta_T = Ta - T_ref
-
-    # Gerilim ve akım değerlerini sıcaklığa göre ayarla
-    Vmp, Imp = adjust_parameters(panel_parameters['Vmp_ref'], panel_parameters['Imp_ref'], panel_parameters['Kv'], panel_parameters['Ki'], delta_T)
-    Voc, Isc = adjust_parameters(panel_parameters['Voc_ref'], panel_parameters['Isc_ref'], panel_parameters['Kv'], panel_parameters['Ki'], delta_T)
-
-    # Panel verilerini hazırlama
-    panel_info = {
-        'Voc': Voc,
-        'Isc': Isc,
-        'Vmp': Vmp,
-        'Imp': Imp,
-        'parallel_strings': panel_parameters['parallel_strings'],
-        'series_modules': panel_parameters['series_modules']
+def hava_verisi_hazirla(daylight_hours, average_temperatures, global_radiation):
+    """
+    Aylık hava verilerini ve veri seti kimliğini bir araya getirir.
+    """
+    return {
+        'daylight_hours': daylight_hours,
+        'average_temperatures': average_temperatures,
+        'global_radiation': global_radiation,
+        'kimlik': input_hash(daylight_hours, average_temperatures, global_radiation)
     }
 
-    # Hesaplama
-    V_total, I_total = calculate_panel_voltage_and_current(
-        panel_data=panel_info,
-        irradiance=Gg,      # Ortalama günlük ışınım (W/m²)
-        temperature=Tc      # Panel sıcaklığı (°C)
-    )
+def gunes_verilerini_hesapla(latitude, selected_months, hava):
+    """
+    Seçili aylar için güneş sapma açısı, ortalama ışınım ve panel sıcaklığını hesaplar.
+    """
+    def hesapla():
+        solar_data = {
+            'Ay': [],
+            'Gun Sayisi (J)': [],
+            'Gunes Sapma Acisi (°)': [],
+            'Optimum Panel Acisi (°)': [],
+            'Ortalama Gunluk Isinim (W/m²)': [],
+            'Ortalama Hava Sicakligi (°C)': [],
+            'Panel Sicakligi (°C)': []
+        }
+        # Panel hesabı için yuvarlanmamış değerler
+        ham_veriler = {'Ay': [], 'Isinim': [], 'Panel_Sicakligi': [], 'Hava_Sicakligi': []}
+
+        for i in range(len(months)):
+            month = months[i]
+            if month not in selected_months:
+                continue  # Sadece seçili aylarda hesaplama yap
+            day = days_of_year[i]
+            G_radiation = hava['global_radiation'][i]
+            daylight = hava['daylight_hours'][i]
+            Ta = hava['average_temperatures'][i]
+
+            # Saatlik ışınım verilerini oluştur
+            hourly_irradiance = generate_hourly_irradiance(daylight, G_radiation)
+
+            # Ortalama günlük ışınımı hesapla
+            Gg = calculate_average_daily_irradiance_hourly(hourly_irradiance)
+
+            # Güneş sapma açısı
+            declination = calculate_declination(day)
+
+            # Optimum panel açısı
+            optimum_angle = latitude - declination
+
+            # Panel sıcaklığı
+            Tc = calculate_panel_temperature(Gg, Ta)
+
+            # Solar Data'ya ekle
+            solar_data['Ay'].append(month)
+            solar_data['Gun Sayisi (J)'].append(day)
+            solar_data['Gunes Sapma Acisi (°)'].append(round(declination, 2))
+            solar_data['Optimum Panel Acisi (°)'].append(round(optimum_angle, 2))
+            solar_data['Ortalama Gunluk Isinim (W/m²)'].append(round(Gg, 2))
+            solar_data['Ortalama Hava Sicakligi (°C)'].append(Ta)
+            solar_data['Panel Sicakligi (°C)'].append(round(Tc, 2))
+
+            ham_veriler['Ay'].append(month)
+            ham_veriler['Isinim'].append(Gg)
+            ham_veriler['Panel_Sicakligi'].append(Tc)
+            ham_veriler['Hava_Sicakligi'].append(Ta)
+
+        return {
+            'df_solar': pd.DataFrame(solar_data),
+            'ham_veriler': pd.DataFrame(ham_veriler)
+        }
 
-    # Maksimum güç
-    P_total = calculate_max_power(V_total, I_total)
+    # Aynı girdilerle daha önce hesaplanmış sonuçlar senaryo deposundan okunur
+    return senaryo_deposu.get_or_compute(
+        {
+            'hesap': 'gunes',
+            'latitude': latitude,
+            'selected_months': selected_months,
+            'hava_veri_kimligi': hava['kimlik']
+        },
+        hesapla
+    )
 
-    # Solar Data'ya ekle
-    solar_data['Ay'].append(month)
-    solar_data['Gun Sayisi (J)'].append(day)
-    solar_data['Gunes Sapma Acisi (°)'].append(round(declination, 2))
-    solar_data['Optimum Panel Acisi (°)'].append(round(optimum_angle, 2))
-    solar_data['Ortalama Gunluk Isinim (W/m²)'].append(round(Gg, 2))
-    solar_data['Ortalama Hava Sicakligi (°C)'].append(Ta)
-    solar_data['Panel Sicakligi (°C)'].append(round(Tc, 2))
+def panel_verilerini_hesapla(panel_parameters, gunes):
+    """
+    Aylık ışınım ve sıcaklık değerlerinden toplam gerilim, akım ve maksimum gücü hesaplar.
+    """
+    ham_veriler = gunes['ham_veriler']
+
+    def hesapla():
+        panel_data = {
+            'Ay': [],
+            'Toplam Gerilim (V)': [],
+            'Toplam Akım (A)': [],
+            'Maksimum Güç (W)': []
+        }
 
-    # Panel Data'ya ekle
-    panel_data['Ay'].append(month)
-    panel_data['Toplam Gerilim (V)'].append(round(V_total, 2))
-    panel_data['Toplam Akım (A)'].append(round(I_total, 2))
-    panel_data['Maksimum Güç (W)'].append(round(P_total, 2))
+        for month, Gg, Tc, Ta in zip(ham_veriler['Ay'], ham_veriler['Isinim'],
+                                     ham_veriler['Panel_Sicakligi'], ham_veriler['Hava_Sicakligi']):
+            # Sıcaklık farkı
+            delta_T = Ta - panel_parameters['T_ref']
+
+            # Gerilim ve akım değerlerini sıcaklığa göre ayarla
+            Vmp, Imp = adjust_parameters(panel_parameters['Vmp_ref'], panel_parameters['Imp_ref'], panel_parameters['Kv'], panel_parameters['Ki'], delta_T)
+            Voc, Isc = adjust_parameters(panel_parameters['Voc_ref'], panel_parameters['Isc_ref'], panel_parameters['Kv'], panel_parameters['Ki'], delta_T)
+
+            # Panel verilerini hazırlama
+            panel_info = {
+                'Voc': Voc,
+                'Isc': Isc,
+                'Vmp': Vmp,
+                'Imp': Imp,
+                'parallel_strings': panel_parameters['parallel_strings'],
+                'series_modules': panel_parameters['series_modules']
+            }
+
+            # Hesaplama
+            V_total, I_total = calculate_panel_voltage_and_current(
+                panel_data=panel_info,
+                irradiance=Gg,      # Ortalama günlük ışınım (W/m²)
+                temperature=Tc      # Panel sıcaklığı (°C)
+            )
 
-# DataFrame oluştur
-df_solar = pd.DataFrame(solar_data)
-df_panel = pd.DataFrame(panel_data)
+            # Maksimum güç
+            P_total = calculate_max_power(V_total, I_total)
 
-# Yıllık optimum panel açısı için ayrı DataFrame
-df_yearly = pd.DataFrame({
-    'Yıllık Optimum Panel Açısı (°)': [round(yearly_optimum_angle, 2)]
-})
-
-# ==========================================
-# Bina Enerji Tüketimi Analizi
-# ==========================================
-# Veri Tanımlamaları
-data_with_counts = {
-    "Bina Tipi": [
-        "Fakülteler",
-        "Kültürel ve Sosyal Alanlar",
-        "Sağlık Tesisleri",
-        "Araştırma ve Uygulama Merkezleri",
-        "Spor Alanları",
-        "Yemek ve Konaklama",
-        "Park ve Açık Alanlar",
-        "Helikopter Pisti"
-    ],
-    "Adet": [9, 10, 3, 7, 4, 2, 2, 1],
-    "Yıllık Ortalama Enerji (kWh)": [400.0, 395.0, 385.0, 335.0, 260.0, 150.0, 30, 7.5]
-}
+            # Panel Data'ya ekle
+            panel_data['Ay'].append(month)
+            panel_data['Toplam Gerilim (V)'].append(round(V_total, 2))
+            panel_data['Toplam Akım (A)'].append(round(I_total, 2))
+            panel_data['Maksimum Güç (W)'].append(round(P_total, 2))
 
-# Hesaplamalar
-results_with_counts_df = calculate_building_energy(data_with_counts, power_factor=power_factor)
+        return {'df_panel': pd.DataFrame(panel_data)}
 
-# ==========================================
-# Tabs
-# ==========================================
-tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-    "Güneş Paneli Analizi",
-    "Bina Enerji Tüketimi Analizi", 
-    "Finansal Hesaplamalar",
-    "Tablolar ve Veri İndirme",
-    "Program Nasıl Çalışır",
-    "Simulink Karşılaştırma",
-    "Forecast Sonuçları"
-])
+    return senaryo_deposu.get_or_compute(
+        {
+            'hesap': 'panel',
+            'panel_parameters': panel_parameters,
+            'gunes_verileri': ham_veriler
+        },
+        hesapla
+    )
 
-# ==========================================
-# Güneş Paneli Analizi Sekmesi
-# ==========================================
-with tab1:
-    st.markdown("""
-    <div style='background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin-bottom: 20px'>
-        <h2 style='text-align: center; color: #1f77b4; margin-bottom: 10px'>🌞 Güneş Paneli Analizi Grafikleri</h2>
-        <p style='text-align: center'>Aşağıdaki grafikler güneş paneli sisteminin detaylı performans analizini göstermektedir.</p>
-    </div>
-    """, unsafe_allow_html=True)
+def gunes_grafiklerini_olustur(yearly_optimum_angle, daylight_hours, gunes, panel):
+    """
+    Güneş paneli analizi sekmesinin grafiklerini oluşturur.
+    """
+    df_solar = gunes['df_solar']
+    df_panel = panel['df_panel']
 
     # Aylara Göre Güneş Sapma Açısı ve Optimum Panel A��ıs��
     fig1 = go.Figure()
@@ -583,6 +635,300 @@ with tab1:
         font=dict(size=14)
     )
 
+    return {'fig1': fig1, 'fig3': fig3, 'fig4': fig4, 'fig5': fig5, 'fig6': fig6, 'fig7': fig7}
+
+def bina_grafiklerini_olustur(bina_enerjisi):
+    """
+    Bina enerji tüketimi sekmesinin grafiklerini oluşturur.
+    """
+    results_with_counts_df = bina_enerjisi
+
+    fig8 = px.bar(
+        results_with_counts_df,
+        x='Bina Tipi',
+        y='Toplam Günlük Enerji (kWh)',
+        title='Bina Tiplerine Göre Toplam Günlük Enerji Tüketimi',
+        labels={'Toplam Günlük Enerji (kWh)': 'Toplam Günlük Enerji (kWh)'},
+        color='Toplam Günlük Enerji (kWh)',
+        color_continuous_scale='Viridis'
+    )
+    fig8.update_layout(
+        xaxis_tickangle=-45,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        margin=dict(t=50, b=50)
+    )
+    fig8.update_xaxes(gridcolor='#f0f0f0')
+    fig8.update_yaxes(gridcolor='#f0f0f0')
+
+    fig_active = px.bar(
+        results_with_counts_df,
+        x='Bina Tipi',
+        y='Toplam Aktif Güç (W)',
+        title='Bina Tiplerine Göre Toplam Aktif Güç',
+        color='Toplam Aktif Güç (W)',
+        color_continuous_scale='Blues'
+    )
+    fig_active.update_layout(
+        xaxis_tickangle=-45,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12),
+        showlegend=False
+    )
+    fig_active.update_xaxes(gridcolor='#f0f0f0')
+    fig_active.update_yaxes(gridcolor='#f0f0f0')
+
+    fig_reactive = px.line(
+        results_with_counts_df,
+        x='Bina Tipi',
+        y='Toplam Reaktif Güç (VAR)',
+        title='Bina Tiplerine Göre Toplam Reaktif Güç',
+        markers=True
+    )
+    fig_reactive.update_traces(
+        line=dict(color='#ff7f0e', width=3),
+        marker=dict(size=8)
+    )
+    fig_reactive.update_layout(
+        xaxis_tickangle=-45,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(size=12)
+    )
+    fig_reactive.update_xaxes(gridcolor='#f0f0f0')
+    fig_reactive.update_yaxes(gridcolor='#f0f0f0')
+
+    return {'fig8': fig8, 'fig_active': fig_active, 'fig_reactive': fig_reactive}
+
+def yuk_profillerini_hesapla(data_with_counts, hava):
+    """
+    Bina tiplerinin yıllık enerjisini (adet × birim enerji) 8760 saatlik yük profillerine dağıtır.
+    """
+    toplam_enerji = np.asarray(data_with_counts["Adet"]) * np.asarray(data_with_counts["Yıllık Ortalama Enerji (kWh)"])
+    profiller = yuk_profilleri(data_with_counts["Bina Tipi"], toplam_enerji, hava['average_temperatures'])
+    return {
+        'profiller': profiller,
+        'ozet': yuk_profili_ozeti(data_with_counts["Bina Tipi"], profiller)
+    }
+
+def tepe_talep_hesapla(data_with_counts, yuk_profilleri):
+    """
+    Saatlik yük profilleri üzerinde kayan pencere tepe talep analizini yapar.
+    """
+    return tepe_talep_analizi(
+        yuk_profilleri['profiller'], hourly_time_index(),
+        sayac_adlari=data_with_counts["Bina Tipi"],
+        aralik_dk=60,
+        pencereler=(60, 120, 240),
+        ilk_n=10
+    )
+
+def kompanzasyon_hesapla(data_with_counts, power_factor, hedef_guc_faktoru, hedef_uyum_orani, yuk_profilleri):
+    """
+    Saatlik yük profilleri ve yüke bağlı güç faktörü serileri üzerinden kademeli kompanzasyon boyutlandırır.
+    """
+    aktif_guc = yuk_profilleri['profiller']  # Saatlik enerji (kWh) = ortalama aktif güç (kW)
+    guc_faktoru = saatlik_guc_faktoru(aktif_guc, power_factor, max(power_factor - 0.15, 0.5))
+    return kompanzasyon_boyutlandir(
+        aktif_guc, guc_faktoru,
+        hedef_guc_faktoru=hedef_guc_faktoru,
+        hedef_uyum_orani=hedef_uyum_orani,
+        bina_adlari=list(data_with_counts["Bina Tipi"]),
+        zaman=hourly_time_index()
+    )
+
+def finansal_analiz_hesapla(yillik_uretim, yillik_tuketim, elektrik_birim_fiyat, panel_verim,
+                            sistem_kayip, sistem_maliyeti, golgelenme_kayip, sicaklik_kayip,
+                            kablo_kayip, inverter_verim, finansal_parametreler):
+    """
+    25 yıllık üretim/finans analizini ve performans metriklerini hesaplar.
+    """
+    def hesapla():
+        uretim_analizi, amortisman_yili = finansal_analizler.detayli_elektrik_analizi(
+            yillik_uretim=yillik_uretim,
+            elektrik_birim_fiyat=elektrik_birim_fiyat,
+            panel_verim=panel_verim,
+            sistem_kayip=sistem_kayip,
+            sistem_maliyeti=sistem_maliyeti,
+            yillik_tuketim=yillik_tuketim,
+            golgelenme_kayip=golgelenme_kayip,
+            sicaklik_kayip=sicaklik_kayip,
+            kablo_kayip=kablo_kayip,
+            inverter_verim=inverter_verim
+        )
+
+        # Performans metrikleri
+        performans = finansal_analizler.hesapla_performans_metrikleri(uretim_analizi, sistem_maliyeti)
+        return {
+            'uretim_analizi': uretim_analizi,
+            'amortisman_yili': amortisman_yili,
+            'performans': performans
+        }
+
+    return senaryo_deposu.get_or_compute(
+        {
+            'hesap': 'finansal_analiz',
+            'girdiler': [yillik_uretim, yillik_tuketim, elektrik_birim_fiyat, panel_verim, sistem_kayip,
+                         sistem_maliyeti, golgelenme_kayip, sicaklik_kayip, kablo_kayip, inverter_verim],
+            'finansal_parametreler': finansal_parametreler
+        },
+        hesapla
+    )
+
+def saatlik_akis_hesapla(yillik_uretim, yillik_tuketim, daylight_hours, global_radiation, yuk_profilleri):
+    """
+    Saatlik PV üretim profilini ve bina yük profillerinin toplam şekline göre dağıtılan saatlik
+    tüketimi üretir; şebekeden alınan/şebekeye verilen enerji dizilerini hesaplar.
+    """
+    saatlik_uretim = generate_hourly_production_profile(yillik_uretim, daylight_hours, global_radiation)
+    toplam_yuk = yuk_profilleri['profiller'].sum(axis=0)
+    saatlik_tuketim = yillik_tuketim * toplam_yuk / toplam_yuk.sum()
+    return {
+        'uretim': saatlik_uretim,
+        'tuketim': saatlik_tuketim,
+        'sebeke_akisi': saatlik_sebeke_akisi(saatlik_uretim, saatlik_tuketim)
+    }
+
+def tarife_karsilastirmasi_hesapla(tarifeler, elektrik_birim_fiyat, saatlik_akis):
+    """
+    Tarifelerin yıllık fatura ve tasarruf karşılaştırmasını yapar.
+    """
+    return tarifeleri_karsilastir(saatlik_akis['uretim'], saatlik_akis['tuketim'], tarifeler, elektrik_birim_fiyat)
+
+def aylik_fatura_hesapla(tarife, elektrik_birim_fiyat, saatlik_akis):
+    """
+    Seçilen tarifenin aylık fatura kalemlerini hesaplar.
+    """
+    sebeke_akisi = saatlik_akis['sebeke_akisi']
+    return tarife_tablosu(tarife_fiyatlandir(
+        sebeke_akisi['sebekeden_alinan'], sebeke_akisi['sebekeye_verilen'], tarife, elektrik_birim_fiyat
+    ))
+
+def batarya_analizi_hesapla(maks_batarya, tarife, elektrik_birim_fiyat, batarya_birim_maliyeti,
+                            elektrik_zam_orani, faiz_orani, gidis_donus_verimi, c_orani, saatlik_akis):
+    """
+    0 - maks_batarya aralığındaki 41 batarya kapasitesi için öz tüketim ve NPV taramasını yapar.
+    """
+    return batarya_boyutlandirma(
+        saatlik_akis['uretim'], saatlik_akis['tuketim'],
+        kapasiteler=np.linspace(0, maks_batarya, 41),
+        elektrik_birim_fiyat=elektrik_birim_fiyat,
+        tarife=tarife,
+        batarya_birim_maliyeti=batarya_birim_maliyeti,
+        elektrik_zam_orani=elektrik_zam_orani,
+        faiz_orani=faiz_orani,
+        gidis_donus_verimi=gidis_donus_verimi,
+        c_orani=c_orani
+    )
+
+def tornado_hesapla(finansal_parametreler, **girdiler):
+    """
+    Finansal girdilerin ±değişim oranı kadar değiştirildiği tornado duyarlılık analizini yapar.
+    finansal_parametreler yalnızca düğüm özetine girer; analiz paylaşılan FinansalAnalizler ile yapılır.
+    """
+    return finansal_analizler.tornado_analizi(**girdiler)
+
+# Yıllık optimum panel açısı için ayrı DataFrame
+df_yearly = pd.DataFrame({
+    'Yıllık Optimum Panel Açısı (°)': [round(yearly_optimum_angle, 2)]
+})
+
+# ==========================================
+# Bina Enerji Tüketimi Analizi
+# ==========================================
+# Veri Tanımlamaları
+data_with_counts = {
+    "Bina Tipi": [
+        "Fakülteler",
+        "Kültürel ve Sosyal Alanlar",
+        "Sağlık Tesisleri",
+        "Araştırma ve Uygulama Merkezleri",
+        "Spor Alanları",
+        "Yemek ve Konaklama",
+        "Park ve Açık Alanlar",
+        "Helikopter Pisti"
+    ],
+    "Adet": [9, 10, 3, 7, 4, 2, 2, 1],
+    "Yıllık Ortalama Enerji (kWh)": [400.0, 395.0, 385.0, 335.0, 260.0, 150.0, 30, 7.5]
+}
+
+# ==========================================
+# Hesaplama Grafiği
+# ==========================================
+# Grafik oturum boyunca korunur; her çalıştırmada yalnızca kendi girdisi veya
+# bağımlı olduğu bir düğüm değişen düğümler yeniden hesaplanır.
+if 'hesap_grafigi' not in st.session_state:
+    st.session_state.hesap_grafigi = ComputationGraph()
+hesap_grafigi = st.session_state.hesap_grafigi
+hesap_grafigi.begin_run()
+
+hesap_grafigi.add_node('hava', hava_verisi_hazirla)
+hesap_grafigi.add_node('gunes', gunes_verilerini_hesapla, ['hava'])
+hesap_grafigi.add_node('panel', panel_verilerini_hesapla, ['gunes'])
+hesap_grafigi.add_node('bina_enerjisi', calculate_building_energy)
+hesap_grafigi.add_node('yuk_profilleri', yuk_profillerini_hesapla, ['hava'])
+hesap_grafigi.add_node('kompanzasyon', kompanzasyon_hesapla, ['yuk_profilleri'])
+hesap_grafigi.add_node('tepe_talep', tepe_talep_hesapla, ['yuk_profilleri'])
+hesap_grafigi.add_node('finans', finansal_analiz_hesapla)
+hesap_grafigi.add_node('saatlik_akis', saatlik_akis_hesapla, ['yuk_profilleri'])
+hesap_grafigi.add_node('tarife_karsilastirmasi', tarife_karsilastirmasi_hesapla, ['saatlik_akis'])
+hesap_grafigi.add_node('aylik_fatura', aylik_fatura_hesapla, ['saatlik_akis'])
+hesap_grafigi.add_node('batarya', batarya_analizi_hesapla, ['saatlik_akis'])
+hesap_grafigi.add_node('tornado', tornado_hesapla)
+hesap_grafigi.add_node('gunes_grafikleri', gunes_grafiklerini_olustur, ['gunes', 'panel'])
+hesap_grafigi.add_node('bina_grafikleri', bina_grafiklerini_olustur, ['bina_enerjisi'])
+
+hesap_grafigi.set_inputs(
+    'hava',
+    daylight_hours=daylight_hours,
+    average_temperatures=average_temperatures,
+    global_radiation=global_radiation
+)
+hesap_grafigi.set_inputs('gunes', latitude=latitude, selected_months=selected_months)
+hesap_grafigi.set_inputs('panel', panel_parameters=panel_parameters)
+hesap_grafigi.set_inputs('bina_enerjisi', data_with_counts=data_with_counts, power_factor=power_factor)
+hesap_grafigi.set_inputs('yuk_profilleri', data_with_counts=data_with_counts)
+hesap_grafigi.set_inputs('tepe_talep', data_with_counts=data_with_counts)
+hesap_grafigi.set_inputs('gunes_grafikleri', yearly_optimum_angle=yearly_optimum_angle, daylight_hours=daylight_hours)
+hesap_grafigi.set_inputs('bina_grafikleri')
+
+# Hesaplamalar
+df_solar = hesap_grafigi.get('gunes')['df_solar']
+df_panel = hesap_grafigi.get('panel')['df_panel']
+solar_data = df_solar.to_dict('list')
+panel_data = df_panel.to_dict('list')
+results_with_counts_df = hesap_grafigi.get('bina_enerjisi')
+yuk_profili = hesap_grafigi.get('yuk_profilleri')
+
+# ==========================================
+# Tabs
+# ==========================================
+tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
+    "Güneş Paneli Analizi",
+    "Bina Enerji Tüketimi Analizi", 
+    "Finansal Hesaplamalar",
+    "Tablolar ve Veri İndirme",
+    "Program Nasıl Çalışır",
+    "Simulink Karşılaştırma",
+    "Forecast Sonuçları"
+])
+
+# ==========================================
+# Güneş Paneli Analizi Sekmesi
+# ==========================================
+with tab1:
+    st.markdown("""
+    <div style='background-color: #f0f2f6; padding: 20px; border-radius: 10px; margin-bottom: 20px'>
+        <h2 style='text-align: center; color: #1f77b4; margin-bottom: 10px'>🌞 Güneş Paneli Analizi Grafikleri</h2>
+        <p style='text-align: center'>Aşağıdaki grafikler güneş paneli sisteminin detaylı performans analizini göstermektedir.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    gunes_grafikleri = hesap_grafigi.get('gunes_grafikleri')
+    fig1, fig3, fig4, fig5, fig6, fig7 = (gunes_grafikleri[ad] for ad in ('fig1', 'fig3', 'fig4', 'fig5', 'fig6', 'fig7'))
+
     # Görsellerin Yerleşimi
     st.markdown("<div style='height: 20px'></div>", unsafe_allow_html=True)
     
@@ -620,25 +966,8 @@ with tab2:
     Renk skalası, tüketim miktarına göre değişmektedir.
     """)
     
-    fig8 = px.bar(
-        results_with_counts_df,
-        x='Bina Tipi',
-        y='Toplam Günlük Enerji (kWh)',
-        title='Bina Tiplerine Göre Toplam Günlük Enerji Tüketimi',
-        labels={'Toplam Günlük Enerji (kWh)': 'Toplam Günlük Enerji (kWh)'},
-        color='Toplam Günlük Enerji (kWh)',
-        color_continuous_scale='Viridis'
-    )
-    fig8.update_layout(
-        xaxis_tickangle=-45,
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(size=12),
-        margin=dict(t=50, b=50)
-    )
-    fig8.update_xaxes(gridcolor='#f0f0f0')
-    fig8.update_yaxes(gridcolor='#f0f0f0')
-    
+    bina_grafikleri = hesap_grafigi.get('bina_grafikleri')
+    fig8 = bina_grafikleri['fig8']
     st.plotly_chart(fig8, use_container_width=True)
     
     st.markdown("<div style='height: 30px'></div>", unsafe_allow_html=True)
@@ -657,24 +986,7 @@ with tab2:
         Binaların tükettiği gerçek güç miktarını gösterir.
         """)
         
-        fig_active = px.bar(
-            results_with_counts_df,
-            x='Bina Tipi',
-            y='Toplam Aktif Güç (W)',
-            title='Bina Tiplerine Göre Toplam Aktif Güç',
-            color='Toplam Aktif Güç (W)',
-            color_continuous_scale='Blues'
-        )
-        fig_active.update_layout(
-            xaxis_tickangle=-45,
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(size=12),
-            showlegend=False
-        )
-        fig_active.update_xaxes(gridcolor='#f0f0f0')
-        fig_active.update_yaxes(gridcolor='#f0f0f0')
-        
+        fig_active = bina_grafikleri['fig_active']
         st.plotly_chart(fig_active, use_container_width=True)
 
     with col2:
@@ -683,28 +995,186 @@ with tab2:
         Sistemdeki reaktif güç tüketimini gösterir.
         """)
         
-        fig_reactive = px.line(
-            results_with_counts_df,
-            x='Bina Tipi',
-            y='Toplam Reaktif Güç (VAR)',
-            title='Bina Tiplerine Göre Toplam Reaktif Güç',
-            markers=True
-        )
-        fig_reactive.update_traces(
-            line=dict(color='#ff7f0e', width=3),
-            marker=dict(size=8)
-        )
-        fig_reactive.update_layout(
-            xaxis_tickangle=-45,
-            plot_bgcolor='white',
-            paper_bgcolor='white',
-            font=dict(size=12)
-        )
-        fig_reactive.update_xaxes(gridcolor='#f0f0f0')
-        fig_reactive.update_yaxes(gridcolor='#f0f0f0')
-        
+        fig_reactive = bina_grafikleri['fig_reactive']
         st.plotly_chart(fig_reactive, use_container_width=True)
 
+    # Saatlik Yük Profilleri
+    st.markdown("""
+    ### 🕒 Saatlik Yük Profilleri
+    Yıllık enerji, bina tipine özgü hafta içi/hafta sonu şablonları, akademik dönem takvimi ve
+    aylık sıcaklıklara göre 8760 saate dağıtılmıştır. Günlük ortalamada görünmeyen tepe yükler bu profillerden okunur.
+    """)
+
+    profil_ayi = st.selectbox("Profil Haftası (Ay)", months, index=2)
+    hafta_baslangic = pd.Timestamp(2025, months.index(profil_ayi) + 1, 1)
+    hafta_baslangic += pd.Timedelta(days=(7 - hafta_baslangic.dayofweek) % 7)  # Ayın ilk pazartesisi
+    hafta_saatleri = pd.date_range(hafta_baslangic, periods=168, freq="h")
+    hafta_dilimi = slice(hafta_saatleri[0].dayofyear * 24 - 24, hafta_saatleri[0].dayofyear * 24 + 144)
+
+    fig_yuk = go.Figure()
+    for tip, profil in zip(data_with_counts["Bina Tipi"], yuk_profili['profiller']):
+        fig_yuk.add_trace(go.Scatter(
+            x=hafta_saatleri,
+            y=profil[hafta_dilimi],
+            name=tip,
+            stackgroup='yuk'
+        ))
+    fig_yuk.update_layout(
+        title=f'{profil_ayi} Ayı Örnek Hafta - Bina Tiplerine Göre Saatlik Yük',
+        xaxis_title='Zaman',
+        yaxis_title='Yük (kW)',
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    st.plotly_chart(fig_yuk, use_container_width=True)
+
+    st.dataframe(
+        yuk_profili['ozet'].style.format({
+            'Yıllık Enerji (kWh)': '{:,.1f}',
+            'Ortalama Yük (kW)': '{:,.3f}',
+            'Tepe Yük (kW)': '{:,.3f}',
+            'Yük Faktörü': '{:.2f}'
+        }),
+        use_container_width=True
+    )
+
+    # Tepe Talep Analizi
+    st.markdown("""
+    ### 📈 Tepe Talep Analizi
+    Kayan pencere ortalama talepleri üzerinden bina tepe talepleri, tüm kampüsün eşzamanlı tepesi ve
+    bina tepelerinin toplamı (eşzamansız tepe) karşılaştırılır. Saatlik profillerde en kısa pencere 60 dakikadır;
+    15 dakikalık sayaç verisinde aynı analiz 15/30/60 dakikalık pencerelerle çalışır.
+    """)
+    tepe_talep = hesap_grafigi.get('tepe_talep')
+    st.dataframe(tepe_talep['ozet'].style.format({
+        'Eşzamanlı Tepe (kW)': '{:,.3f}',
+        'Eşzamansız Tepe (kW)': '{:,.3f}',
+        'Çeşitlilik Faktörü': '{:.2f}'
+    }), use_container_width=True)
+
+    tepe_penceresi = st.selectbox("Pencere (dk)", tepe_talep['ozet']['Pencere (dk)'].tolist())
+    sayac_tepeleri = tepe_talep['sayac_tepeleri'][tepe_talep['sayac_tepeleri']['Pencere (dk)'] == tepe_penceresi]
+    fig_tepe = go.Figure()
+    fig_tepe.add_trace(go.Bar(
+        x=sayac_tepeleri['Sayaç'],
+        y=sayac_tepeleri['Tepe Talep (kW)'],
+        name='Bina Tepe Talebi',
+        marker_color='#e74c3c'
+    ))
+    fig_tepe.add_trace(go.Bar(
+        x=sayac_tepeleri['Sayaç'],
+        y=sayac_tepeleri['Eşzamanlı Tepedeki Talep (kW)'],
+        name='Kampüs Tepesi Anındaki Talep',
+        marker_color='#3498db'
+    ))
+    fig_tepe.update_layout(
+        title=f'{tepe_penceresi} Dakikalık Pencere - Bina Tepe Talepleri',
+        xaxis_tickangle=-45,
+        yaxis_title='Talep (kW)',
+        barmode='group',
+        plot_bgcolor='white',
+        paper_bgcolor='white'
+    )
+    st.plotly_chart(fig_tepe, use_container_width=True)
+
+    ilk_tepeler = tepe_talep['ilk_tepeler']
+    st.dataframe(
+        ilk_tepeler[ilk_tepeler['Pencere (dk)'] == tepe_penceresi].style.format({'Toplam Talep (kW)': '{:,.3f}'}),
+        use_container_width=True
+    )
+
+    # Bina Kayıt Defteri
+    st.markdown("""
+    ### 🗂️ Bina Kayıt Defteri
+    Binalar tip, kampüs bölgesi ve fider üzerinden indekslenir. Toplamlar bina eklendikçe veya
+    silindikçe artımlı olarak güncellenir.
+    """)
+
+    # Defter oturum boyunca korunur; bina tablosu veya yük profilleri değişirse yeniden kurulur
+    defter_kimligi = input_hash(data_with_counts, yuk_profili['ozet'])
+    if st.session_state.get('bina_defteri_kimligi') != defter_kimligi:
+        st.session_state.bina_defteri = BuildingRegistry.from_data_with_counts(
+            data_with_counts, tepe_gucleri=yuk_profili['ozet']['Tepe Yük (kW)'].values
+        )
+        st.session_state.bina_defteri_kimligi = defter_kimligi
+    bina_defteri = st.session_state.bina_defteri
+
+    with st.expander("Bina Ekle / Sil"):
+        with st.form("bina_defteri_formu"):
+            col_d1, col_d2, col_d3 = st.columns(3)
+            with col_d1:
+                yeni_bina_adi = st.text_input("Bina Adı")
+                yeni_bina_tipi = st.selectbox("Bina Tipi", data_with_counts["Bina Tipi"])
+            with col_d2:
+                yeni_bina_bolgesi = st.text_input("Bölge", value="Meşelik")
+                yeni_bina_fideri = st.text_input("Fider", value="F1")
+            with col_d3:
+                yeni_bina_enerjisi = st.number_input("Yıllık Enerji (kWh)", value=400.0, step=10.0)
+                yeni_bina_tepesi = st.number_input("Tepe Güç (kW)", value=0.2, step=0.05)
+            silinecek_bina = st.selectbox("Silinecek Bina", ["-"] + sorted(bina_defteri.to_frame()['Bina']))
+            if st.form_submit_button("Uygula"):
+                if yeni_bina_adi and yeni_bina_adi not in bina_defteri:
+                    bina_defteri.add(yeni_bina_adi, yeni_bina_tipi, yeni_bina_bolgesi, yeni_bina_fideri,
+                                     yeni_bina_enerjisi, yeni_bina_tepesi)
+                if silinecek_bina != "-" and silinecek_bina in bina_defteri:
+                    bina_defteri.remove(silinecek_bina)
+
+    kampus_toplami = bina_defteri.totals()
+    col_k1, col_k2, col_k3 = st.columns(3)
+    with col_k1:
+        st.metric("Kayıtlı Bina", kampus_toplami['Bina Sayısı'])
+    with col_k2:
+        st.metric("Toplam Yıllık Enerji", f"{kampus_toplami['Yıllık Enerji (kWh)']:,.0f} kWh")
+    with col_k3:
+        st.metric("En Yüksek Bina Tepesi", f"{kampus_toplami['En Yüksek Bina Tepesi (kW)']:,.3f} kW",
+                  help=kampus_toplami['En Yüksek Tepeli Bina'])
+
+    gruplama = st.radio("Gruplama", ['tip', 'bolge', 'fider'], horizontal=True,
+                        format_func={'tip': 'Bina Tipi', 'bolge': 'Bölge', 'fider': 'Fider'}.get)
+    st.dataframe(bina_defteri.aggregate_table(gruplama), use_container_width=True)
+
+    # Kompanzasyon Boyutlandırma
+    st.markdown("""
+    ### 🔌 Kompanzasyon Boyutlandırma
+    Saatlik aktif güç ve yüke bağlı güç faktörü serileri üzerinden, hedef güç faktörünü sağlayan
+    en düşük maliyetli kademeli kondansatör bankası her bina tipi için seçilir.
+    """)
+    col3, col4 = st.columns(2)
+    with col3:
+        hedef_guc_faktoru = st.slider("Hedef Güç Faktörü", min_value=0.90, max_value=0.99, value=0.95, step=0.01)
+    with col4:
+        hedef_uyum_orani = st.slider("Hedefin Sağlanacağı Saat Oranı (%)", min_value=50, max_value=100, value=95)
+
+    hesap_grafigi.set_inputs(
+        'kompanzasyon',
+        data_with_counts=data_with_counts,
+        power_factor=power_factor,
+        hedef_guc_faktoru=hedef_guc_faktoru,
+        hedef_uyum_orani=hedef_uyum_orani / 100
+    )
+    kompanzasyon_tablosu = hesap_grafigi.get('kompanzasyon')
+    st.dataframe(
+        kompanzasyon_tablosu.style.format({
+            'Kademe Boyutu (kVAr)': '{:.1f}',
+            'Toplam Kapasite (kVAr)': '{:.1f}',
+            'Yatırım Maliyeti (TL)': '{:,.0f}',
+            'Uyum Oranı (%)': '{:.1f}',
+            'Ortalama GF (Öncesi)': '{:.3f}',
+            'Ortalama GF (Sonrası)': '{:.3f}',
+            'Maks. Aylık Endüktif Oran Öncesi (%)': '{:.1f}',
+            'Maks. Aylık Endüktif Oran Sonrası (%)': '{:.1f}',
+            'Maks. Aylık Kapasitif Oran Sonrası (%)': '{:.1f}'
+        }, na_rep='-'),
+        use_container_width=True
+    )
+    st.caption(
+        f"Aylık sınırlar: endüktif reaktif enerji aktif enerjinin %{ENDUKTIF_SINIR * 100:.0f}'sini, "
+        f"kapasitif reaktif enerji %{KAPASITIF_SINIR * 100:.0f}'ini aşmamalıdır. Sınırlar her ay için "
+        f"ayrı değerlendirilir; sınır aşmayan konfigürasyonlar maliyetten önce tercih edilir. Röle her saatte "
+        f"hedef güç faktörünün ve endüktif sınıra karşılık gelen {np.cos(np.arctan(ENDUKTIF_SINIR)):.3f} "
+        f"değerinin büyüğünü hedefler."
+    )
+
     # Açıklama kutusu
     st.markdown("""
     <div style='background-color: #e1f5fe; padding: 15px; border-radius: 5px; margin-top: 20px'>
@@ -886,25 +1356,25 @@ with tab3:
             yaz_orani = st.slider("Yaz Üretim Oranı (%)", min_value=20, max_value=50, value=35)
             sonbahar_orani = st.slider("Sonbahar Üretim Oranı (%)", min_value=10, max_value=40, value=20)
 
-        # Üretim analizi hesaplamaları
-        uretim_analizi, amortisman_yili = finansal_analizler.detayli_elektrik_analizi(
+        # Üretim analizi hesaplamaları (yalnızca finans girdileri değiştiğinde yeniden hesaplanır)
+        hesap_grafigi.set_inputs(
+            'finans',
             yillik_uretim=yillik_uretim,
+            yillik_tuketim=yillik_tuketim,
             elektrik_birim_fiyat=elektrik_birim_fiyat,
             panel_verim=panel_verimi/100,
             sistem_kayip=sistem_kayiplari/100,
             sistem_maliyeti=maliyet_sonuclari['toplam_maliyet'] + kurulum_sonuclari['toplam_kurulum'],
-            yillik_tuketim=yillik_tuketim,
             golgelenme_kayip=golgelenme_kaybi/100,
             sicaklik_kayip=sicaklik_kaybi/100,
             kablo_kayip=kablo_kaybi/100,
-            inverter_verim=inverter_verimi/100
-        )
-
-        # Performans metrikleri
-        performans = finansal_analizler.hesapla_performans_metrikleri(
-            uretim_analizi,
-            maliyet_sonuclari['toplam_maliyet'] + kurulum_sonuclari['toplam_kurulum']
+            inverter_verim=inverter_verimi/100,
+            finansal_parametreler=vars(finansal_analizler)
         )
+        finansal_sonuclar = hesap_grafigi.get('finans')
+        uretim_analizi = finansal_sonuclar['uretim_analizi']
+        amortisman_yili = finansal_sonuclar['amortisman_yili']
+        performans = finansal_sonuclar['performans']
 
         # Sonuçları göster
         st.markdown("#### 📊 Temel Performans Göstergeleri")
@@ -1041,6 +1511,127 @@ with tab3:
             })
         )
 
+        # Zamana bağlı tarife ve mahsuplaşma analizi
+        st.markdown("#### 🕒 Tarife ve Mahsuplaşma Analizi")
+        st.markdown("""
+            Saatlik üretim profili bir kez oluşturulur; tarife değiştiğinde yalnızca şebeke
+            alış/satış dizileri yeniden fiyatlandırılır.
+        """)
+        col14, col15, col16 = st.columns(3)
+        with col14:
+            mahsuplasma = st.selectbox("Mahsuplaşma Kuralı", ["saatlik", "aylik"])
+        with col15:
+            talep_ucreti = st.number_input("Talep Ücreti (TL/kW-ay)", value=0.0, step=10.0)
+        with col16:
+            ihracat_limiti = st.number_input("Yıllık Satış Limiti (kWh, 0 = limitsiz)", value=0.0, step=1000.0)
+
+        # Tüketim, bina yük profillerinin toplam şekline göre saatlere dağıtılır
+        hesap_grafigi.set_inputs(
+            'saatlik_akis',
+            yillik_uretim=yillik_uretim,
+            yillik_tuketim=yillik_tuketim,
+            daylight_hours=daylight_hours,
+            global_radiation=global_radiation
+        )
+        saatlik_uretim = hesap_grafigi.get('saatlik_akis')['uretim']
+        tarifeler = [
+            dict(tarife, mahsuplasma=mahsuplasma, talep_ucreti=talep_ucreti,
+                 ihracat_limiti=ihracat_limiti or None)
+            for tarife in (TEK_ZAMANLI_TARIFE, UC_ZAMANLI_TARIFE)
+        ]
+        hesap_grafigi.set_inputs('tarife_karsilastirmasi', tarifeler=tarifeler, elektrik_birim_fiyat=elektrik_birim_fiyat)
+        tarife_karsilastirma = hesap_grafigi.get('tarife_karsilastirmasi')
+        st.dataframe(
+            tarife_karsilastirma.style.format({
+                'PV Olmadan Fatura (TL)': '{:,.2f}',
+                'PV ile Fatura (TL)': '{:,.2f}',
+                'Satış Geliri (TL)': '{:,.2f}',
+                'Talep Bedeli (TL)': '{:,.2f}',
+                'Yıllık Tasarruf (TL)': '{:,.2f}'
+            })
+        )
+
+        secili_tarife = st.selectbox("Aylık Fatura Detayı", [t['ad'] for t in tarifeler])
+        hesap_grafigi.set_inputs(
+            'aylik_fatura',
+            tarife=next(t for t in tarifeler if t['ad'] == secili_tarife),
+            elektrik_birim_fiyat=elektrik_birim_fiyat
+        )
+        aylik_fatura = hesap_grafigi.get('aylik_fatura')
+        fig_fatura = go.Figure()
+        fig_fatura.add_trace(go.Bar(
+            name='Enerji + Talep + Sabit Bedel',
+            x=aylik_fatura['Ay'],
+            y=aylik_fatura['Enerji Bedeli (TL)'] + aylik_fatura['Talep Bedeli (TL)'] + aylik_fatura['Sabit Bedel (TL)'],
+            marker_color='#e74c3c'
+        ))
+        fig_fatura.add_trace(go.Bar(
+            name='Satış Geliri',
+            x=aylik_fatura['Ay'],
+            y=-aylik_fatura['Satış Geliri (TL)'],
+            marker_color='#2ecc71'
+        ))
+        fig_fatura.update_layout(
+            title=f'{secili_tarife} Tarifesi - Aylık Fatura Dağılımı',
+            barmode='relative',
+            xaxis_title='Ay',
+            yaxis_title='Tutar (TL)'
+        )
+        st.plotly_chart(fig_fatura, use_container_width=True)
+
+        # Batarya Boyutlandırma
+        st.markdown("#### 🔋 Batarya Depolama Boyutlandırması")
+        col17, col18, col19, col20 = st.columns(4)
+        with col17:
+            maks_batarya = st.number_input("Maksimum Batarya Kapasitesi (kWh)", value=20000.0, step=1000.0)
+        with col18:
+            batarya_birim_maliyeti = st.number_input("Batarya Birim Maliyeti (TL/kWh)", value=12000.0, step=500.0)
+        with col19:
+            gidis_donus_verimi = st.slider("Gidiş-Dönüş Verimi (%)", min_value=70, max_value=98, value=90)
+        with col20:
+            c_orani = st.slider("C Oranı (Güç/Kapasite)", min_value=0.1, max_value=1.0, value=0.5, step=0.05)
+
+        hesap_grafigi.set_inputs(
+            'batarya',
+            maks_batarya=maks_batarya,
+            tarife=next(t for t in tarifeler if t['ad'] == secili_tarife),
+            elektrik_birim_fiyat=elektrik_birim_fiyat,
+            batarya_birim_maliyeti=batarya_birim_maliyeti,
+            elektrik_zam_orani=finansal_analizler.elektrik_zam_orani,
+            faiz_orani=finansal_analizler.faiz_orani,
+            gidis_donus_verimi=gidis_donus_verimi / 100,
+            c_orani=c_orani
+        )
+        batarya_tablosu = hesap_grafigi.get('batarya')
+
+        fig_batarya = go.Figure()
+        fig_batarya.add_trace(go.Scatter(
+            x=batarya_tablosu['Kapasite (kWh)'],
+            y=batarya_tablosu['Öz Tüketim Oranı (%)'],
+            name='Öz Tüketim Oranı (%)',
+            line=dict(color='#3498db')
+        ))
+        fig_batarya.add_trace(go.Scatter(
+            x=batarya_tablosu['Kapasite (kWh)'],
+            y=batarya_tablosu['NPV (TL)'],
+            name='Batarya NPV (TL)',
+            yaxis='y2',
+            line=dict(color='#e67e22')
+        ))
+        fig_batarya.update_layout(
+            title=f'Batarya Kapasitesine Göre Öz Tüketim ve NPV ({secili_tarife} Tarifesi)',
+            xaxis_title='Batarya Kapasitesi (kWh)',
+            yaxis=dict(title='Öz Tüketim Oranı (%)'),
+            yaxis2=dict(title='NPV (TL)', overlaying='y', side='right')
+        )
+        st.plotly_chart(fig_batarya, use_container_width=True)
+
+        en_iyi_batarya = batarya_tablosu.loc[batarya_tablosu['NPV (TL)'].idxmax()]
+        st.info(
+            f"En yüksek NPV: {en_iyi_batarya['Kapasite (kWh)']:,.0f} kWh batarya ile "
+            f"{en_iyi_batarya['NPV (TL)']:,.0f} TL (öz tüketim %{en_iyi_batarya['Öz Tüketim Oranı (%)']:.1f})"
+        )
+
     # Finansal Metrikler Sekmesi
     with fin_tab4:
         st.markdown("""
@@ -1200,6 +1791,66 @@ with tab3:
             </div>
         """, unsafe_allow_html=True)
 
+        # Tornado duyarlılık analizi
+        st.markdown("#### 🌪️ Duyarlılık (Tornado) Analizi")
+        degisim_orani = st.slider("Parametre Değişim Oranı (±%)", min_value=5, max_value=50, value=20)
+        hesap_grafigi.set_inputs(
+            'tornado',
+            finansal_parametreler=vars(finansal_analizler),
+            yillik_uretim=yillik_uretim,
+            elektrik_birim_fiyat=elektrik_birim_fiyat,
+            panel_maliyeti=maliyet_sonuclari['panel_maliyeti'],
+            kurulum_maliyeti=kurulum_sonuclari['toplam_kurulum'],
+            yillik_tuketim=yillik_tuketim,
+            sistem_kayip=sistem_kayiplari/100,
+            degisim_orani=degisim_orani/100,
+            kdv_orani=kdv_orani/100,
+            golgelenme_kaybi=golgelenme_kaybi/100,
+            sicaklik_kaybi=sicaklik_kaybi/100,
+            kablo_kaybi=kablo_kaybi/100,
+            inverter_verimi=inverter_verimi/100
+        )
+        tornado_tablosu, tornado_temel = hesap_grafigi.get('tornado')
+
+        tornado_sirali = tornado_tablosu.iloc[::-1]
+        fig_tornado = go.Figure()
+        fig_tornado.add_trace(go.Bar(
+            y=tornado_sirali['Parametre'],
+            x=tornado_sirali['NPV Düşük (TL)'] - tornado_temel['npv'],
+            base=tornado_temel['npv'],
+            orientation='h',
+            name=f'-%{degisim_orani}',
+            marker_color='#e74c3c'
+        ))
+        fig_tornado.add_trace(go.Bar(
+            y=tornado_sirali['Parametre'],
+            x=tornado_sirali['NPV Yüksek (TL)'] - tornado_temel['npv'],
+            base=tornado_temel['npv'],
+            orientation='h',
+            name=f'+%{degisim_orani}',
+            marker_color='#2ecc71'
+        ))
+        fig_tornado.update_layout(
+            title=f"NPV Duyarlılığı (Temel NPV: {tornado_temel['npv']:,.0f} TL)",
+            barmode='overlay',
+            xaxis_title='NPV (TL)',
+            height=600
+        )
+        st.plotly_chart(fig_tornado, use_container_width=True)
+
+        st.dataframe(
+            tornado_tablosu.style.format({
+                'Temel Değer': '{:,.4g}',
+                'Düşük Değer': '{:,.4g}',
+                'Yüksek Değer': '{:,.4g}',
+                'NPV Düşük (TL)': '{:,.0f}',
+                'NPV Yüksek (TL)': '{:,.0f}',
+                'NPV Salınımı (TL)': '{:,.0f}',
+                'Geri Ödeme Düşük (Yıl)': '{:.0f}',
+                'Geri Ödeme Yüksek (Yıl)': '{:.0f}'
+            })
+        )
+
 # ==========================================
 # Program Nasıl Çalışır Sekmesi
 # ==========================================
@@ -1473,31 +2124,54 @@ with fin_tab5:
             help="1 ton CO₂'nin emilimi için gereken ağaç sayısı"
         )
 
-    # Karbon ayak izi analizi
-    karbon_analizi = finansal_analizler.karbon_ayak_izi_analizi(
-        yillik_uretim=yillik_uretim,
-        sera_gazi_faktoru=sera_gazi_faktoru,
+    col5b, col6b = st.columns(2)
+    with col5b:
+        sebeke_iyilesme_orani = st.slider(
+            "Şebeke Karbonsuzlaşma Oranı (%/yıl)",
+            min_value=0.0,
+            max_value=5.0,
+            value=2.0,
+            step=0.5,
+            help="Şebeke emisyon faktörünün yıllık düşüş oranı (yenilenebilir payının artışı)"
+        )
+    with col6b:
+        st.markdown("""
+            Karbon tasarrufu, saatlik üretim profili ile saatlik emisyon faktörleri eşleştirilerek hesaplanır.
+            Marjinal faktör senaryosu, öğle saatlerinde daha düşük, gece ve akşam puantında daha yüksek
+            emisyonlu örnek bir mevsim×saat tablosu kullanır.
+        """)
+
+    # Karbon ayak izi analizi (saatlik üretim × saatlik emisyon faktörü, tüm senaryolar tek geçişte)
+    karbon_senaryolari = {
+        'Sabit Faktör': (np.full((4, 24), sera_gazi_faktoru), 0.0),
+        'Marjinal Faktör (Örnek)': (ORNEK_MARJINAL_EMISYON, 0.0),
+        'Marjinal Faktör + Şebeke Karbonsuzlaşması': (ORNEK_MARJINAL_EMISYON, sebeke_iyilesme_orani / 100),
+    }
+    karbon_analizi = finansal_analizler.saatlik_karbon_analizi(
+        saatlik_uretim,
+        emisyon_faktoru=np.stack([faktor for faktor, _ in karbon_senaryolari.values()]),
+        sebeke_iyilesme_orani=np.array([oran for _, oran in karbon_senaryolari.values()]),
         agac_esdeger_faktoru=agac_esdeger_faktoru
     )
 
-    # Çevresel etki metrikleri
+    # Çevresel etki metrikleri (sabit faktör senaryosu)
     col7, col8, col9 = st.columns(3)
     with col7:
         st.metric(
             "Yıllık CO₂ Tasarrufu",
-            f"{karbon_analizi['yillik_karbon_tasarrufu']:,.2f} ton",
+            f"{karbon_analizi['yillik_karbon_tasarrufu'][0]:,.2f} ton",
             help="Yıllık önlenen CO₂ emisyonu miktarı"
         )
     with col8:
         st.metric(
             "25 Yıllık CO₂ Tasarrufu",
-            f"{karbon_analizi['25_yillik_tasarruf']:,.2f} ton",
-            help="Sistemin ömrü boyunca önlenen toplam CO₂ emisyonu"
+            f"{karbon_analizi['toplam_tasarruf'][0]:,.2f} ton",
+            help="Sistemin ömrü boyunca, panel yaşlanması dahil önlenen toplam CO₂ emisyonu"
         )
     with col9:
         st.metric(
             "Ağaç Eşdeğeri",
-            f"{karbon_analizi['agac_esdegeri']:,.0f} ağaç",
+            f"{karbon_analizi['agac_esdegeri'][0]:,.0f} ağaç",
             help="CO₂ tasarrufuna eşdeğer ağaç sayısı"
         )
 
@@ -1505,24 +2179,39 @@ with fin_tab5:
     st.markdown("#### 📊 Yıllık Çevresel Etki Projeksiyonu")
     fig_cevre = go.Figure()
     yillar = list(range(1, 26))
-    karbon_tasarruf = [karbon_analizi['yillik_karbon_tasarrufu'] * (1 - i * 0.005) for i in range(25)]  # Panel yaşlanması etkisi
-    
-    fig_cevre.add_trace(go.Scatter(
-        x=yillar,
-        y=karbon_tasarruf,
-        mode='lines+markers',
-        name='CO₂ Tasarrufu',
-        fill='tozeroy',
-        line=dict(color='#27ae60')
-    ))
+    renkler = ['#27ae60', '#e67e22', '#2980b9']
+
+    for i, senaryo in enumerate(karbon_senaryolari):
+        fig_cevre.add_trace(go.Scatter(
+            x=yillar,
+            y=karbon_analizi['yillik_projeksiyon'][i],
+            mode='lines+markers',
+            name=senaryo,
+            fill='tozeroy' if i == 0 else None,
+            line=dict(color=renkler[i])
+        ))
     fig_cevre.update_layout(
         title='25 Yıllık CO₂ Tasarrufu Projeksiyonu',
         xaxis_title='Yıl',
         yaxis_title='CO₂ Tasarrufu (ton/yıl)',
-        showlegend=False
+        showlegend=True
     )
     st.plotly_chart(fig_cevre, use_container_width=True)
 
+    karbon_ozet = pd.DataFrame({
+        'Senaryo': list(karbon_senaryolari),
+        'Ortalama Emisyon Faktörü (kg/kWh)': karbon_analizi['ortalama_emisyon_faktoru'],
+        'İlk Yıl CO₂ Tasarrufu (ton)': karbon_analizi['yillik_karbon_tasarrufu'],
+        '25 Yıllık CO₂ Tasarrufu (ton)': karbon_analizi['toplam_tasarruf'],
+        'Ağaç Eşdeğeri': karbon_analizi['agac_esdegeri']
+    })
+    st.dataframe(karbon_ozet.style.format({
+        'Ortalama Emisyon Faktörü (kg/kWh)': '{:.3f}',
+        'İlk Yıl CO₂ Tasarrufu (ton)': '{:,.2f}',
+        '25 Yıllık CO₂ Tasarrufu (ton)': '{:,.2f}',
+        'Ağaç Eşdeğeri': '{:,.0f}'
+    }), use_container_width=True)
+
     # Risk analizi özet tablosu
     st.markdown("#### 📋 Risk Analizi Özeti")
     risk_ozet = pd.DataFrame({
@@ -1553,6 +2242,50 @@ with fin_tab5:
 
 # Yeni sekme içeriği
 with tab6:
+    # Fider ve Trafo Yüklenmesi
+    st.markdown("""
+    ### 🔌 Fider ve Trafo Yüklenmesi
+    Bina kayıt defterindeki her bina, tipinin saatlik yük profiliyle yüklenir; PV üretimi binalara yıllık
+    enerjileri oranında dağıtılır. Net yük bina → fider → trafo (120/25 kV, 47 MVA) ağacı boyunca toplanır.
+    """)
+    col_s1, col_s2 = st.columns(2)
+    with col_s1:
+        fider_kapasitesi = st.number_input("Fider Kapasitesi (kVA)", value=float(FIDER_KAPASITESI_KVA), step=500.0)
+    with col_s2:
+        trafo_kapasitesi = st.number_input("Trafo Kapasitesi (kVA)", value=float(TRAFO_KAPASITESI_KVA), step=1000.0)
+
+    defter_tablosu = bina_defteri.to_frame()
+    tip_profilleri = dict(zip(data_with_counts["Bina Tipi"], yuk_profili['profiller']))
+    bina_yukleri = np.stack([
+        tip_profilleri[tip] / max(tip_profilleri[tip].sum(), 1e-12) * enerji
+        if tip in tip_profilleri else np.full(8760, enerji / 8760)
+        for tip, enerji in zip(defter_tablosu['Bina Tipi'], defter_tablosu['Yıllık Enerji (kWh)'])
+    ])
+    enerji_paylari = defter_tablosu['Yıllık Enerji (kWh)'].values / defter_tablosu['Yıllık Enerji (kWh)'].sum()
+    sebeke = sebeke_topolojisi(dict(zip(defter_tablosu['Bina'], defter_tablosu['Fider'])))
+    sebeke_yuklenmesi = agac_yuklenmesi(
+        sebeke, bina_yukleri, enerji_paylari[:, None] * saatlik_uretim[None, :],
+        fider_kapasitesi=fider_kapasitesi,
+        trafo_kapasitesi=trafo_kapasitesi,
+        guc_faktoru=power_factor,
+        zaman=hourly_time_index()
+    )
+    st.dataframe(sebeke_yuklenmesi['ozet'].style.format({
+        'Kapasite (kVA)': '{:,.0f}',
+        'Tepe Yük (kVA)': '{:,.3f}',
+        'Maks. Yüklenme (%)': '{:.2f}'
+    }), use_container_width=True)
+
+    fig_sebeke = go.Figure()
+    for dugum, seri in zip(sebeke_yuklenmesi['ozet']['Düğüm'], sebeke_yuklenmesi['dugum_net']):
+        fig_sebeke.add_trace(go.Scatter(x=hourly_time_index(), y=seri, name=dugum, mode='lines'))
+    fig_sebeke.update_layout(
+        title='Fider ve Trafo Net Aktif Gücü (negatif değerler şebekeye ters akıştır)',
+        xaxis_title='Zaman',
+        yaxis_title='Net Güç (kW)'
+    )
+    st.plotly_chart(fig_sebeke, use_container_width=True)
+
     st.markdown("### 🔄 Simulink Karşılaştırma")
     try:
         simulink_karsilastirma(panel_data, solar_data, panel_parameters, results_with_counts_df)
@@ -1562,3 +2295,7 @@ with tab6:
 # Zaman Serisi Analizi Sekmesi
 with tab7:
     show_time_series_analysis()
+
+# Hesaplama grafiği durumu
+with st.sidebar.expander("⚙️ Hesaplama Grafiği"):
+    st.dataframe(hesap_grafigi.stats().style.format({'Son Süre (ms)': '{:.1f}'}))
@@ -0,0 +1,138 @@
+# backtesting.py
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from fast_forecast import HIZLI_MODELLER, hizli_tahmin
+from forecast_models import (
+    VARSAYILAN_ORDER,
+    VARSAYILAN_SEASONAL_ORDER,
+    _paralel_calistir,
+    sarimax_fit,
+    varsayilan_isci_sayisi
+)
+from scenario_store import input_hash
+
+# Geriye dönük testte değerlendirilebilen modeller ve görünen adları
+TEST_MODELLERI = {'sarimax': 'SARIMAX', **HIZLI_MODELLER}
+
+
+def geriye_donuk_katlar(n, ufuk=12, min_egitim=24, adim=1, yontem='genisleyen'):
+    """
+    Kayan başlangıçlı (rolling-origin) değerlendirme katlarını üretir. 'genisleyen' yöntemde
+    eğitim penceresi serinin başından başlar ve her katta büyür; 'kayan' yöntemde min_egitim
+    uzunluğunda sabit kalarak ilerler. Yalnızca tüm ufku gözlenmiş katlar üretilir.
+
+    Returns:
+        list: (eğitim başlangıcı, eğitim bitişi) demetleri; test aralığı [bitiş, bitiş + ufuk).
+    """
+    if yontem not in ('genisleyen', 'kayan'):
+        raise ValueError(f"Bilinmeyen pencere yöntemi: {yontem}")
+    return [(0 if yontem == 'genisleyen' else bitis - min_egitim, bitis)
+            for bitis in range(min_egitim, n - ufuk + 1, adim)]
+
+
+def sarimax_kat_tahmini(y_train, train_exog, test_exog, order, seasonal_order):
+    """Tek bir bina ve kat için SARIMAX eğitip test ufku boyunca tahmin üretir (süreç havuzu işçisi)."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = sarimax_fit(y_train, train_exog, order, seasonal_order)['model']
+            return np.asarray(results.get_forecast(steps=len(test_exog), exog=test_exog).predicted_mean)
+    except (ValueError, np.linalg.LinAlgError):
+        return np.full(len(test_exog), np.nan)
+
+
+def geriye_donuk_test(df_binalar, df_exog, eksojen_sutunlari, modeller=tuple(TEST_MODELLERI), ufuk=12,
+                      min_egitim=24, adim=3, yontem='genisleyen', maks_isci=None, onbellek=None,
+                      mertebeler=None):
+    """
+    Her bina ve model için kayan başlangıçlı geriye dönük test yapar. SARIMAX yeniden eğitimleri
+    (kat × bina) süreç havuzuna dağıtılır; hızlı modeller her katta tüm binaları tek seferde
+    tahmin eder. onbellek (ModelCache) verilirse her katın tahmini, eğitim verisi, test eksojenleri
+    ve model ayarlarının özetiyle saklanır; değişmeyen katlar yeniden hesaplanmaz.
+
+    Returns:
+        dict: Ufuk başına hata tablosu ('ufuk'), bina başına tablo ('bina'), model özeti ('ozet'),
+        kat sayısı, önbellekten okunan/hesaplanan kat-model sayıları ve süre.
+    """
+    baslangic = time.perf_counter()
+    Y = df_binalar.to_numpy(dtype=float)
+    X = df_exog.loc[df_binalar.index, eksojen_sutunlari]
+    binalar = list(df_binalar.columns)
+    katlar = geriye_donuk_katlar(len(df_binalar), ufuk, min_egitim, adim, yontem)
+    if not katlar:
+        raise ValueError(f"Geriye dönük test için en az {min_egitim + ufuk} ay veri gerekir")
+
+    tahmin = np.full((len(modeller), len(katlar), ufuk, len(binalar)), np.nan)
+    gercek = np.stack([Y[bitis:bitis + ufuk] for _, bitis in katlar])
+    onbellekten = 0
+    sarimax_gorevleri = []   # (model sırası, kat sırası, bina sırası, anahtar, argümanlar)
+
+    for m, model in enumerate(modeller):
+        for f, (bas, bitis) in enumerate(katlar):
+            egitim, egitim_exog, test_exog = df_binalar.iloc[bas:bitis], X.iloc[bas:bitis], X.iloc[bitis:bitis + ufuk]
+            if model == 'sarimax':
+                for b, bina in enumerate(binalar):
+                    order, seasonal_order = (mertebeler or {}).get(
+                        bina, (VARSAYILAN_ORDER, VARSAYILAN_SEASONAL_ORDER))
+                    anahtar = input_hash(egitim[bina], egitim_exog, test_exog, model=model,
+                                         order=order, seasonal_order=seasonal_order)
+                    kayit = onbellek.get(anahtar) if onbellek is not None else None
+                    if kayit is not None:
+                        tahmin[m, f, :, b] = kayit
+                        onbellekten += 1
+                    else:
+                        sarimax_gorevleri.append(
+                            (m, f, b, anahtar, (egitim[bina], egitim_exog, test_exog, order, seasonal_order)))
+            else:
+                anahtar = input_hash(egitim, egitim_exog, test_exog, model=model)
+                kayit = onbellek.get(anahtar) if onbellek is not None else None
+                if kayit is None:
+                    sonuclar, _ = hizli_tahmin(egitim, egitim_exog, test_exog, model=model)
+                    kayit = np.column_stack([r['tahmin'].to_numpy() for r in sonuclar])
+                    if onbellek is not None:
+                        onbellek.put(anahtar, kayit)
+                else:
+                    onbellekten += len(binalar)
+                tahmin[m, f] = kayit
+
+    isci_sayisi = max(1, min(maks_isci or varsayilan_isci_sayisi(), len(sarimax_gorevleri) or 1))
+    sonuclar = _paralel_calistir(sarimax_kat_tahmini, [g[4] for g in sarimax_gorevleri], isci_sayisi)
+    for (m, f, b, anahtar, _), sonuc in zip(sarimax_gorevleri, sonuclar):
+        tahmin[m, f, :, b] = sonuc
+        if onbellek is not None:
+            onbellek.put(anahtar, sonuc)
+
+    # Hatalar katlar üzerinden ufuk başına özetlenir: (model, ufuk, bina)
+    hata = tahmin - gercek
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mape = np.nanmean(np.abs(hata) / np.abs(gercek), axis=1) * 100
+        rmse = np.sqrt(np.nanmean(hata ** 2, axis=1))
+
+    m_idx, h_idx, b_idx = np.indices(mape.shape).reshape(3, -1)
+    bina_tablosu = pd.DataFrame({
+        'Model': np.array([TEST_MODELLERI[model] for model in modeller])[m_idx],
+        'Bina': np.array(binalar, dtype=object)[b_idx],
+        'Ufuk (ay)': h_idx + 1,
+        'MAPE (%)': mape.ravel(),
+        'RMSE (kWh)': rmse.ravel()
+    })
+    ufuk_tablosu = (bina_tablosu.groupby(['Model', 'Ufuk (ay)'], sort=False)[['MAPE (%)', 'RMSE (kWh)']]
+                    .mean().reset_index())
+    ozet = (bina_tablosu.groupby('Model', sort=False)[['MAPE (%)', 'RMSE (kWh)']].mean()
+            .sort_values('MAPE (%)').reset_index())
+
+    return {
+        'ufuk': ufuk_tablosu,
+        'bina': bina_tablosu,
+        'ozet': ozet,
+        'kat_sayisi': len(katlar),
+        'onbellekten': onbellekten,
+        'hesaplanan': len(modeller) * len(katlar) * len(binalar) - onbellekten,
+        'isci_sayisi': isci_sayisi,
+        'sure': time.perf_counter() - baslangic
+    }
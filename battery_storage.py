@@ -0,0 +1,112 @@
+# battery_storage.py
+
+import numpy as np
+import pandas as pd
+
+from tarife_hesaplamalari import TEK_ZAMANLI_TARIFE, saatlik_sebeke_akisi, tarife_fiyatlandir
+
+
+def batarya_dagitimi(saatlik_uretim, saatlik_tuketim, kapasiteler, gidis_donus_verimi=0.90,
+                     min_soc=0.10, max_soc=1.00, c_orani=0.5):
+    """
+    Açgözlü (greedy) saatlik batarya dağıtımı: üretim fazlası bataryayı şarj eder, tüketim açığı
+    bataryadan karşılanır. Zaman adımları sırayla işlenir, tüm batarya boyutları ise her adımda
+    tek bir vektörel işlemle güncellenir.
+
+    Args:
+        saatlik_uretim (array): Saatlik üretim (kWh), şekil (8760,).
+        saatlik_tuketim (array): Saatlik tüketim (kWh), şekil (8760,).
+        kapasiteler (array): Batarya kapasiteleri (kWh), şekil (n,).
+        gidis_donus_verimi (float): Şarj-deşarj çevrim verimi; şarj ve deşarja eşit bölünür.
+        min_soc, max_soc (float): İzin verilen şarj durumu aralığı (kapasiteye oran).
+        c_orani (float): Saatlik maksimum şarj/deşarj gücünün kapasiteye oranı.
+
+    Returns:
+        dict: Şebekeden alınan/şebekeye verilen enerji ve şarj durumu, şekil (n, 8760).
+    """
+    uretim = np.asarray(saatlik_uretim, dtype=float)
+    tuketim = np.asarray(saatlik_tuketim, dtype=float)
+    kapasite = np.atleast_1d(np.asarray(kapasiteler, dtype=float))
+
+    net = uretim - tuketim
+    tek_yon_verim = np.sqrt(gidis_donus_verimi)
+    alt_sinir = kapasite * min_soc
+    ust_sinir = kapasite * max_soc
+    guc = kapasite * c_orani
+
+    soc = alt_sinir.copy()
+    batarya_akisi = np.empty((len(net), len(kapasite)))  # + şarj, - deşarj (sistem tarafı, kWh)
+    soc_gecmisi = np.empty((len(net), len(kapasite)))
+
+    for t, fark in enumerate(net):
+        if fark >= 0:
+            sarj = np.minimum(np.minimum(fark, guc), (ust_sinir - soc) / tek_yon_verim)
+            soc += sarj * tek_yon_verim
+            batarya_akisi[t] = sarj
+        else:
+            desarj = np.minimum(np.minimum(-fark, guc), (soc - alt_sinir) * tek_yon_verim)
+            soc -= desarj / tek_yon_verim
+            batarya_akisi[t] = -desarj
+        soc_gecmisi[t] = soc
+
+    batarya_akisi = batarya_akisi.T
+    sarj = np.clip(batarya_akisi, 0, None)
+    desarj = np.clip(-batarya_akisi, 0, None)
+
+    return {
+        'sebekeden_alinan': np.clip(-net, 0, None) - desarj,
+        'sebekeye_verilen': np.clip(net, 0, None) - sarj,
+        'sarj': sarj,
+        'desarj': desarj,
+        'soc': soc_gecmisi.T
+    }
+
+
+def batarya_boyutlandirma(saatlik_uretim, saatlik_tuketim, kapasiteler, elektrik_birim_fiyat,
+                          tarife=TEK_ZAMANLI_TARIFE, batarya_birim_maliyeti=12000,
+                          omur=15, kapasite_kaybi=0.02, elektrik_zam_orani=0.35, faiz_orani=0.35,
+                          **dagitim_parametreleri):
+    """
+    Batarya kapasitesi taraması: her boyut için öz tüketim oranını, yıllık fatura tasarrufunu ve
+    batarya yatırımının net bugünkü değerini (NPV) hesaplar. Dağıtım ve tarife fiyatlandırması
+    tüm boyutlar için tek seferde yapılır.
+
+    Args:
+        kapasiteler (array): Taranacak batarya kapasiteleri (kWh).
+        batarya_birim_maliyeti (float): Kurulu batarya maliyeti (TL/kWh).
+        omur (int): Batarya ekonomik ömrü (yıl).
+        kapasite_kaybi (float): Yıllık kapasite (ve tasarruf) kaybı oranı.
+
+    Returns:
+        DataFrame: Kapasite başına öz tüketim, tasarruf ve NPV tablosu.
+    """
+    kapasite = np.atleast_1d(np.asarray(kapasiteler, dtype=float))
+    uretim = np.asarray(saatlik_uretim, dtype=float)
+
+    dagitim = batarya_dagitimi(uretim, saatlik_tuketim, kapasite, **dagitim_parametreleri)
+    bataryasiz = saatlik_sebeke_akisi(uretim, saatlik_tuketim)
+
+    fatura = tarife_fiyatlandir(dagitim['sebekeden_alinan'], dagitim['sebekeye_verilen'],
+                                tarife, elektrik_birim_fiyat)['yillik_fatura']
+    bataryasiz_fatura = tarife_fiyatlandir(bataryasiz['sebekeden_alinan'], bataryasiz['sebekeye_verilen'],
+                                           tarife, elektrik_birim_fiyat)['yillik_fatura']
+    yillik_tasarruf = bataryasiz_fatura - fatura
+
+    yil = np.arange(1, omur + 1)
+    carpan = ((1 + elektrik_zam_orani) ** (yil - 1) * (1 - kapasite_kaybi) ** (yil - 1)
+              / (1 + faiz_orani) ** yil)
+    yatirim = kapasite * batarya_birim_maliyeti
+    npv = yillik_tasarruf * carpan.sum() - yatirim
+
+    oz_tuketim = uretim.sum() - dagitim['sebekeye_verilen'].sum(axis=-1)
+    return pd.DataFrame({
+        'Kapasite (kWh)': kapasite,
+        'Öz Tüketim Oranı (%)': oz_tuketim / uretim.sum() * 100,
+        'Şebekeden Alınan (kWh)': dagitim['sebekeden_alinan'].sum(axis=-1),
+        'Şebekeye Verilen (kWh)': dagitim['sebekeye_verilen'].sum(axis=-1),
+        'Yıllık Çevrim Sayısı': np.divide(dagitim['desarj'].sum(axis=-1), kapasite,
+                                          out=np.zeros_like(kapasite), where=kapasite > 0),
+        'Yıllık Tasarruf (TL)': yillik_tasarruf,
+        'Batarya Maliyeti (TL)': yatirim,
+        'NPV (TL)': npv
+    })
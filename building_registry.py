@@ -0,0 +1,188 @@
+# building_registry.py
+
+import heapq
+
+import pandas as pd
+
+# Bina tiplerinin varsayılan kampüs bölgesi ataması
+VARSAYILAN_BOLGELER = {
+    "Fakülteler": "Meşelik",
+    "Kültürel ve Sosyal Alanlar": "Meşelik",
+    "Sağlık Tesisleri": "Meşelik - Hastane",
+    "Araştırma ve Uygulama Merkezleri": "Meşelik",
+    "Spor Alanları": "Meşelik - Spor",
+    "Yemek ve Konaklama": "Meşelik",
+    "Park ve Açık Alanlar": "Meşelik",
+    "Helikopter Pisti": "Meşelik - Hastane"
+}
+
+INDEKSLER = ('tip', 'bolge', 'fider')
+
+
+class _Toplam:
+    """
+    Bir bina grubunun adet, enerji toplamı ve tepe gücünü artımlı olarak tutar.
+    Tepe güç için tembel silmeli (lazy deletion) bir maksimum yığını kullanılır: silinen veya
+    değişen binaların eski kayıtları ancak yığının tepesine geldiklerinde atılır.
+    """
+
+    __slots__ = ('adet', 'enerji', 'tepe_toplami', '_yigin', '_gecerli')
+
+    def __init__(self):
+        self.adet = 0
+        self.enerji = 0.0
+        self.tepe_toplami = 0.0
+        self._yigin = []
+        self._gecerli = {}  # bina_id -> geçerli tepe güç
+
+    def ekle(self, bina_id, enerji, tepe):
+        self.adet += 1
+        self.enerji += enerji
+        self.tepe_toplami += tepe
+        self._gecerli[bina_id] = tepe
+        heapq.heappush(self._yigin, (-tepe, bina_id))
+
+    def cikar(self, bina_id, enerji, tepe):
+        self.adet -= 1
+        self.enerji -= enerji
+        self.tepe_toplami -= tepe
+        del self._gecerli[bina_id]
+        # Eski kayıtlar yığını şişirmesin diye yığın gerektiğinde yeniden kurulur
+        if len(self._yigin) > 2 * len(self._gecerli) + 16:
+            self._yigin = [(-t, b) for b, t in self._gecerli.items()]
+            heapq.heapify(self._yigin)
+
+    def tepe(self):
+        """Gruptaki en yüksek tepe gücü döndürür (amortize O(1))."""
+        while self._yigin:
+            eksi_tepe, bina_id = self._yigin[0]
+            if self._gecerli.get(bina_id) == -eksi_tepe:
+                return -eksi_tepe, bina_id
+            heapq.heappop(self._yigin)
+        return 0.0, None
+
+    def sozluk(self):
+        tepe, tepe_bina = self.tepe()
+        return {
+            'Bina Sayısı': self.adet,
+            'Yıllık Enerji (kWh)': self.enerji,
+            'Eşzamansız Tepe Toplamı (kW)': self.tepe_toplami,
+            'En Yüksek Bina Tepesi (kW)': tepe,
+            'En Yüksek Tepeli Bina': tepe_bina
+        }
+
+
+class BuildingRegistry:
+    """
+    Bina kayıt defteri. Binalar tip, kampüs bölgesi ve fider üzerinden indekslenir; her indeks
+    değeri ve tüm kampüs için toplamlar ekleme/silme/güncelleme sırasında artımlı olarak
+    güncellendiğinden pano toplamları tam tarama gerektirmez.
+    """
+
+    def __init__(self):
+        self._binalar = {}
+        self._indeksler = {ad: {} for ad in INDEKSLER}   # indeks -> değer -> bina_id kümesi
+        self._toplamlar = {ad: {} for ad in INDEKSLER}   # indeks -> değer -> _Toplam
+        self._genel = _Toplam()
+
+    def __len__(self):
+        return len(self._binalar)
+
+    def __contains__(self, bina_id):
+        return bina_id in self._binalar
+
+    def _kaydet(self, bina_id, bina):
+        self._binalar[bina_id] = bina
+        self._genel.ekle(bina_id, bina['yillik_enerji'], bina['tepe_guc'])
+        for ad in INDEKSLER:
+            self._indeksler[ad].setdefault(bina[ad], set()).add(bina_id)
+            self._toplamlar[ad].setdefault(bina[ad], _Toplam()).ekle(
+                bina_id, bina['yillik_enerji'], bina['tepe_guc'])
+
+    def _sil(self, bina_id):
+        bina = self._binalar.pop(bina_id)
+        self._genel.cikar(bina_id, bina['yillik_enerji'], bina['tepe_guc'])
+        for ad in INDEKSLER:
+            self._indeksler[ad][bina[ad]].discard(bina_id)
+            self._toplamlar[ad][bina[ad]].cikar(bina_id, bina['yillik_enerji'], bina['tepe_guc'])
+            if not self._indeksler[ad][bina[ad]]:
+                del self._indeksler[ad][bina[ad]]
+                del self._toplamlar[ad][bina[ad]]
+        return bina
+
+    def add(self, bina_id, tip, bolge, fider, yillik_enerji, tepe_guc):
+        """Yeni bina ekler."""
+        if bina_id in self._binalar:
+            raise KeyError(f"Bina zaten kayıtlı: {bina_id}")
+        self._kaydet(bina_id, {
+            'tip': tip,
+            'bolge': bolge,
+            'fider': fider,
+            'yillik_enerji': float(yillik_enerji),
+            'tepe_guc': float(tepe_guc)
+        })
+
+    def remove(self, bina_id):
+        """Binayı kayıttan siler ve kaydını döndürür."""
+        return self._sil(bina_id)
+
+    def update(self, bina_id, **alanlar):
+        """Binanın bir veya birkaç alanını günceller; indeksler ve toplamlar buna göre taşınır."""
+        bilinmeyen = set(alanlar) - {'tip', 'bolge', 'fider', 'yillik_enerji', 'tepe_guc'}
+        if bilinmeyen:
+            raise KeyError(f"Bilinmeyen bina alanları: {', '.join(sorted(bilinmeyen))}")
+        bina = {**self._sil(bina_id), **alanlar}
+        bina['yillik_enerji'] = float(bina['yillik_enerji'])
+        bina['tepe_guc'] = float(bina['tepe_guc'])
+        self._kaydet(bina_id, bina)
+
+    def get(self, bina_id):
+        return dict(self._binalar[bina_id])
+
+    def lookup(self, indeks, deger):
+        """İndeks değerine ('tip', 'bolge' veya 'fider') sahip bina kimliklerini döndürür."""
+        return set(self._indeksler[indeks].get(deger, ()))
+
+    def totals(self, indeks=None, deger=None):
+        """Tüm kampüs veya tek bir indeks değeri için toplamları döndürür (O(1))."""
+        if indeks is None:
+            return self._genel.sozluk()
+        toplam = self._toplamlar[indeks].get(deger)
+        return toplam.sozluk() if toplam is not None else _Toplam().sozluk()
+
+    def aggregate_table(self, indeks):
+        """İndeks değerlerine göre toplam tablosu (grup sayısı kadar satır)."""
+        etiket = {'tip': 'Bina Tipi', 'bolge': 'Bölge', 'fider': 'Fider'}[indeks]
+        return pd.DataFrame([
+            {etiket: deger, **toplam.sozluk()}
+            for deger, toplam in sorted(self._toplamlar[indeks].items())
+        ])
+
+    def to_frame(self):
+        """Kayıtlı binaları tablo olarak döndürür."""
+        return pd.DataFrame([
+            {'Bina': bina_id, 'Bina Tipi': b['tip'], 'Bölge': b['bolge'], 'Fider': b['fider'],
+             'Yıllık Enerji (kWh)': b['yillik_enerji'], 'Tepe Güç (kW)': b['tepe_guc']}
+            for bina_id, b in self._binalar.items()
+        ])
+
+    @classmethod
+    def from_data_with_counts(cls, data_with_counts, tepe_gucleri=None, fider_sayisi=4, bolgeler=None):
+        """
+        Bina tipi/adet tablosundan, her binayı ayrı kayıt olarak içeren defter oluşturur.
+        tepe_gucleri verilirse tip başına toplam tepe güç (kW) bina sayısına bölünerek atanır;
+        fiderler binalara sırayla dağıtılır.
+        """
+        bolgeler = {**VARSAYILAN_BOLGELER, **(bolgeler or {})}
+        defter = cls()
+        sira = 0
+        for i, tip in enumerate(data_with_counts["Bina Tipi"]):
+            adet = int(data_with_counts["Adet"][i])
+            tepe = (tepe_gucleri[i] / adet) if tepe_gucleri is not None and adet else 0.0
+            for j in range(adet):
+                defter.add(
+                    f"{tip} {j + 1}", tip, bolgeler.get(tip, "Diğer"), f"F{sira % fider_sayisi + 1}",
+                    data_with_counts["Yıllık Ortalama Enerji (kWh)"][i], tepe
+                )
+                sira += 1
+        return defter
@@ -0,0 +1,82 @@
+# computation_graph.py
+
+import time
+
+import pandas as pd
+
+from scenario_store import input_hash
+
+
+class ComputationGraph:
+    """
+    Hesaplama adımlarını (hava → güneş → panel → enerji → finans → grafikler) düğümler olarak tutan
+    ve yalnızca girdisi veya bağımlı olduğu bir düğüm değişen düğümleri yeniden hesaplayan grafik.
+
+    Her düğüm, kendi girdilerinin özeti ile bağımlılıklarının sürüm numaralarını saklar. Bunlardan biri
+    değişmedikçe önceki sonuç (aynı nesne referansı) döndürülür.
+    """
+
+    def __init__(self):
+        self._dugumler = {}
+        self._hesaplanan = set()
+
+    def add_node(self, ad, fonksiyon, bagimliliklar=()):
+        """
+        Düğüm ekler veya mevcut düğümün fonksiyonunu günceller (önbellek korunur).
+        fonksiyon, girdileri ve bağımlılık sonuçlarını anahtar kelime argümanı olarak alır.
+        """
+        dugum = self._dugumler.setdefault(ad, {
+            'girdiler': {},
+            'girdi_ozeti': None,
+            'deger': None,
+            'anahtar': None,
+            'surum': 0,
+            'hesaplama_sayisi': 0,
+            'sure': 0.0
+        })
+        dugum['fonksiyon'] = fonksiyon
+        dugum['bagimliliklar'] = tuple(bagimliliklar)
+
+    def set_inputs(self, ad, **girdiler):
+        """Düğümün kendi girdilerini ayarlar."""
+        dugum = self._dugumler[ad]
+        dugum['girdiler'] = girdiler
+        dugum['girdi_ozeti'] = input_hash(**girdiler)
+
+    def begin_run(self):
+        """Yeni bir çalıştırma başlatır (yeniden hesaplanan düğüm listesini sıfırlar)."""
+        self._hesaplanan = set()
+
+    def get(self, ad, _yol=()):
+        """Düğümün güncel sonucunu döndürür; gerekirse önce bağımlılıklarını hesaplar."""
+        if ad in _yol:
+            raise ValueError(f"Hesaplama grafiğinde döngü: {' → '.join(_yol + (ad,))}")
+        dugum = self._dugumler[ad]
+
+        ust_degerler = {b: self.get(b, _yol + (ad,)) for b in dugum['bagimliliklar']}
+        anahtar = (dugum['girdi_ozeti'],
+                   tuple(self._dugumler[b]['surum'] for b in dugum['bagimliliklar']))
+
+        if dugum['anahtar'] != anahtar:
+            baslangic = time.perf_counter()
+            dugum['deger'] = dugum['fonksiyon'](**dugum['girdiler'], **ust_degerler)
+            dugum['sure'] = time.perf_counter() - baslangic
+            dugum['anahtar'] = anahtar
+            dugum['surum'] += 1
+            dugum['hesaplama_sayisi'] += 1
+            self._hesaplanan.add(ad)
+        return dugum['deger']
+
+    def stats(self):
+        """Düğüm başına sürüm ve yeniden hesaplama bilgisini tablo olarak döndürür."""
+        return pd.DataFrame([
+            {
+                'Düğüm': ad,
+                'Bağımlılıklar': ', '.join(dugum['bagimliliklar']) or '-',
+                'Sürüm': dugum['surum'],
+                'Hesaplama Sayısı': dugum['hesaplama_sayisi'],
+                'Bu Çalıştırmada Hesaplandı': ad in self._hesaplanan,
+                'Son Süre (ms)': dugum['sure'] * 1000
+            }
+            for ad, dugum in self._dugumler.items()
+        ])
@@ -0,0 +1,141 @@
+# exog_features.py
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from hourly_forecast import ISITMA_ESIGI, SOGUTMA_ESIGI
+from scenario_store import input_hash
+
+# Gecikmeli ve kayan ortalamalı özelliklerin üretildiği hava durumu sütunları
+HAVA_SUTUNLARI = ('Sicaklik', 'Nem', 'Guneslenme')
+VARSAYILAN_GECIKMELER = (1, 2, 12)
+VARSAYILAN_PENCERELER = (3, 6)
+
+# SARIMAX için genişletilmiş özellik seti; kısa eğitim pencerelerinde parametre sayısı sınırlı tutulur
+GENISLETILMIS_SUTUNLAR = [
+    'Isitma_Derece_Gun', 'Sogutma_Derece_Gun', 'Sicaklik_Gecikme_1', 'Sicaklik_Ort_3',
+    'Donem_Aktivitesi', 'Mesai_Saatleri', 'Is_Gunu_Sayisi'
+]
+
+
+def iklim_ile_uzat(df_exog, geri=0, ileri=0):
+    """
+    Aylık eksojen tabloyu başa 'geri' ve sona 'ileri' ay ekleyerek uzatır; eklenen aylar tablonun
+    takvim ayı ortalamalarıyla (iklim normali) doldurulur.
+    """
+    iklim = df_exog.groupby(df_exog.index.month).mean()
+    ay_sonu = pd.offsets.MonthEnd(1)
+    parcalar = []
+    if geri > 0:
+        onceki = pd.date_range(end=df_exog.index[0] - ay_sonu, periods=geri, freq=ay_sonu)
+        parcalar.append(iklim.reindex(onceki.month).set_axis(onceki))
+    parcalar.append(df_exog)
+    if ileri > 0:
+        sonraki = pd.date_range(df_exog.index[-1] + ay_sonu, periods=ileri, freq=ay_sonu)
+        parcalar.append(iklim.reindex(sonraki.month).set_axis(sonraki))
+    return pd.concat(parcalar) if len(parcalar) > 1 else df_exog
+
+
+def gecikmeli_degerler(X, gecikmeler):
+    """
+    Gecikmeli değerleri tek bir indeksleme işlemiyle üretir: çıktı[t, i, j] = X[t - gecikme_i, j].
+    Serinin başından önceye düşen gecikmeler NaN olur.
+    """
+    X = np.asarray(X, dtype=float)
+    indeks = np.arange(len(X))[:, None] - np.asarray(gecikmeler)[None, :]
+    degerler = X[np.clip(indeks, 0, None)]
+    degerler[indeks < 0] = np.nan
+    return degerler
+
+
+def kayan_ortalamalar(X, pencereler):
+    """
+    Geriye dönük kayan ortalamaları kümülatif toplamdan hesaplar: çıktı[t, i, j] = ortalama(X[t-w_i+1 .. t, j]).
+    Tam pencere oluşmayan satırlar NaN olur.
+    """
+    X = np.asarray(X, dtype=float)
+    kumulatif = np.vstack([np.zeros((1, X.shape[1])), np.cumsum(X, axis=0)])
+    pencereler = np.asarray(pencereler)
+    bitis = np.arange(1, len(X) + 1)[:, None]
+    baslangic = bitis - pencereler[None, :]
+    ortalama = (kumulatif[bitis] - kumulatif[np.clip(baslangic, 0, None)]) / pencereler[None, :, None]
+    ortalama[baslangic < 0] = np.nan
+    return ortalama
+
+
+def takvim_ozellikleri(zaman):
+    """Ay sonu indeksli zaman için takvim özellikleri: ayın sin/cos terimleri, gün ve iş günü sayısı."""
+    zaman = pd.DatetimeIndex(zaman)
+    aci = 2 * np.pi * (zaman.month.to_numpy() - 1) / 12
+    ay_basi = zaman.to_period('M').to_timestamp().to_numpy().astype('datetime64[D]')
+    sonraki_ay_basi = (zaman + pd.Timedelta(days=1)).to_numpy().astype('datetime64[D]')
+    return pd.DataFrame({
+        'Ay_Sin': np.sin(aci),
+        'Ay_Cos': np.cos(aci),
+        'Gun_Sayisi': zaman.days_in_month.to_numpy(),
+        'Is_Gunu_Sayisi': np.busday_count(ay_basi, sonraki_ay_basi)
+    }, index=zaman)
+
+
+def ozellik_matrisi(df_exog, ufuk=0, gecikmeler=VARSAYILAN_GECIKMELER, pencereler=VARSAYILAN_PENCERELER,
+                    hava_sutunlari=HAVA_SUTUNLARI):
+    """
+    Aylık eksojen tablodan model özellik matrisini üretir: özgün sütunlar, hava durumu
+    gecikmeleri ve kayan ortalamaları, ısıtma/soğutma derece-günleri ve takvim özellikleri.
+    Tablo sona 'ufuk' ay uzatılır; ilk satırların gecikmeleri için başa da aynı şekilde
+    iklim normali eklenir, böylece matriste eksik değer kalmaz. Derece-günler aylık ortalama
+    sıcaklık üzerinden yaklaşık olarak (gün sayısı × eşik farkı) hesaplanır.
+
+    Args:
+        df_exog (DataFrame): Ay sonu indeksli eksojen tablo (eksojen_veri()).
+        ufuk (int): Tablonun sonundan sonra özellik üretilecek ay sayısı.
+
+    Returns:
+        DataFrame: (len(df_exog) + ufuk) satırlık özellik matrisi.
+    """
+    geri = max(max(gecikmeler, default=0), max(pencereler, default=1) - 1)
+    kaynak = iklim_ile_uzat(df_exog, geri=geri, ileri=ufuk)
+    hava = kaynak[list(hava_sutunlari)].to_numpy(dtype=float)
+    zaman = kaynak.index
+
+    gecikmeli = gecikmeli_degerler(hava, gecikmeler)                   # (zaman, gecikme, sütun)
+    ortalamalar = kayan_ortalamalar(hava, pencereler)                   # (zaman, pencere, sütun)
+    gun = zaman.days_in_month.to_numpy()
+    sicaklik = kaynak['Sicaklik'].to_numpy(dtype=float)
+
+    ozellikler = pd.concat([
+        kaynak,
+        pd.DataFrame(gecikmeli.reshape(len(zaman), -1), index=zaman,
+                     columns=[f"{sutun}_Gecikme_{g}" for g in gecikmeler for sutun in hava_sutunlari]),
+        pd.DataFrame(ortalamalar.reshape(len(zaman), -1), index=zaman,
+                     columns=[f"{sutun}_Ort_{w}" for w in pencereler for sutun in hava_sutunlari]),
+        pd.DataFrame({
+            'Isitma_Derece_Gun': gun * np.clip(ISITMA_ESIGI - sicaklik, 0, None),
+            'Sogutma_Derece_Gun': gun * np.clip(sicaklik - SOGUTMA_ESIGI, 0, None)
+        }, index=zaman),
+        takvim_ozellikleri(zaman)
+    ], axis=1)
+    return ozellikler.iloc[geri:]
+
+
+def onbellekli_ozellik_matrisi(df_exog, onbellek=None, ufuk=0, gecikmeler=VARSAYILAN_GECIKMELER,
+                               pencereler=VARSAYILAN_PENCERELER, hava_sutunlari=HAVA_SUTUNLARI):
+    """
+    ozellik_matrisi'ni kaynak tablonun ve ayarların içerik özetiyle önbelleğe alır (ModelCache);
+    aynı eksojen veriyle çalışan tüm bina modelleri tek bir üretimi paylaşır.
+
+    Returns:
+        tuple: (özellik matrisi, önbellekten okundu mu, süre)
+    """
+    baslangic = time.perf_counter()
+    anahtar = input_hash(df_exog, islem='ozellik_matrisi', ufuk=ufuk, gecikmeler=gecikmeler,
+                         pencereler=pencereler, hava_sutunlari=hava_sutunlari)
+    ozellikler = onbellek.get(anahtar) if onbellek is not None else None
+    onbellekten = ozellikler is not None
+    if not onbellekten:
+        ozellikler = ozellik_matrisi(df_exog, ufuk, gecikmeler, pencereler, hava_sutunlari)
+        if onbellek is not None:
+            onbellek.put(anahtar, ozellikler)
+    return ozellikler, onbellekten, time.perf_counter() - baslangic
@@ -0,0 +1,247 @@
+# fast_forecast.py
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from forecast_models import paralel_sarimax_fit
+
+# Hızlı tahmin modelleri ve görünen adları
+HIZLI_MODELLER = {
+    'mevsimsel_naif': 'Mevsimsel Naif',
+    'holt_winters': 'Holt-Winters',
+    'ridge': 'Ridge (Eksojen)'
+}
+
+# Holt-Winters düzleştirme parametresi ızgarası (alfa, beta, gama)
+HW_ALFA = (0.05, 0.2, 0.4, 0.6, 0.8)
+HW_BETA = (0.0, 0.05, 0.2)
+HW_GAMA = (0.05, 0.2, 0.4, 0.6)
+
+# Ridge ceza katsayısı adayları (standartlaştırılmış eksojenler için)
+RIDGE_LAMBDALARI = np.logspace(-3, 3, 25)
+
+# %95 güven aralığı için normal dağılım katsayısı
+Z_95 = 1.959964
+
+
+def mevsimsel_naif(Y, ufuk, s=12):
+    """
+    Her sütun için son mevsimi tekrarlar.
+
+    Args:
+        Y (array): Eğitim serileri, şekil (zaman, bina).
+        ufuk (int): Tahmin adımı sayısı.
+
+    Returns:
+        dict: 'tahmin' ve 'std' (zaman, bina), 'artik' (zaman - s, bina) ve parametre sayısı.
+    """
+    Y = np.asarray(Y, dtype=float)
+    n = Y.shape[0]
+    h = np.arange(ufuk)
+    tahmin = Y[n - s + h % s]
+    artik = Y[s:] - Y[:-s]
+    sigma = np.sqrt(np.mean(artik ** 2, axis=0))
+    # h adım ilerideki hata, geçen tam mevsim sayısı kadar mevsimsel farkın toplamıdır
+    std = sigma * np.sqrt(h // s + 1)[:, None]
+    return {'tahmin': tahmin, 'std': std, 'artik': artik, 'parametre': 0}
+
+
+def holt_winters(Y, ufuk, s=12, alfalar=HW_ALFA, betalar=HW_BETA, gamalar=HW_GAMA):
+    """
+    Toplamsal Holt-Winters modelini tüm binalar ve tüm (alfa, beta, gama) ızgarası için aynı anda
+    çalıştırır: durumlar (ızgara, bina) dizileridir ve tek Python döngüsü zaman üzerindedir.
+    Her bina için bir adımlı hata kareleri toplamı en küçük olan parametreler seçilir.
+
+    Returns:
+        dict: 'tahmin', 'std', 'artik', parametre sayısı ve bina başına seçilen 'parametreler' (bina, 3).
+    """
+    Y = np.asarray(Y, dtype=float)
+    n, k = Y.shape
+    if n < 2 * s:
+        raise ValueError(f"Holt-Winters başlangıcı için en az {2 * s} gözlem gerekir")
+
+    izgara = np.array(np.meshgrid(alfalar, betalar, gamalar, indexing='ij')).reshape(3, -1)
+    alfa, beta, gama = (p[:, None] for p in izgara)                      # (ızgara, 1)
+    g = izgara.shape[1]
+
+    # Başlangıç durumları ilk iki mevsimden
+    ilk = Y[:s].mean(axis=0)
+    seviye = np.broadcast_to(ilk, (g, k)).copy()
+    egilim = np.broadcast_to((Y[s:2 * s].mean(axis=0) - ilk) / s, (g, k)).copy()
+    mevsim = np.broadcast_to(Y[:s] - ilk, (g, s, k)).copy()
+
+    artiklar = np.empty((n, g, k))
+    for t in range(n):
+        m = t % s
+        artiklar[t] = Y[t] - (seviye + egilim + mevsim[:, m])
+        onceki_seviye = seviye
+        seviye = alfa * (Y[t] - mevsim[:, m]) + (1 - alfa) * (seviye + egilim)
+        egilim = beta * (seviye - onceki_seviye) + (1 - beta) * egilim
+        mevsim[:, m] = gama * (Y[t] - seviye) + (1 - gama) * mevsim[:, m]
+
+    # İlk mevsim başlangıç durumlarına bağlı olduğundan seçimde kullanılmaz
+    sse = (artiklar[s:] ** 2).sum(axis=0)                                # (ızgara, bina)
+    secim = sse.argmin(axis=0)
+    binalar = np.arange(k)
+
+    h = np.arange(1, ufuk + 1)[:, None]
+    tahmin = (seviye[secim, binalar] + h * egilim[secim, binalar]
+              + mevsim[secim, (n + h - 1) % s, binalar])
+    artik = artiklar[s:, secim, binalar]
+    sigma2 = np.mean(artik ** 2, axis=0)
+
+    # Toplamsal Holt-Winters tahmin varyansı: σ² [1 + Σ_{j<h} (α + jαβ + γ·1{j mod s = 0})²]
+    a, b, c = (izgara[i, secim] for i in range(3))
+    j = np.arange(1, ufuk)[:, None]
+    katsayi = (a + j * a * b + c * (j % s == 0)) ** 2
+    varyans = sigma2 * (1 + np.r_[np.zeros((1, k)), np.cumsum(katsayi, axis=0)])
+    return {
+        'tahmin': tahmin,
+        'std': np.sqrt(varyans),
+        'artik': artik,
+        'parametre': 3 + s + 2,
+        'parametreler': izgara[:, secim].T
+    }
+
+
+def ridge_eksojen(Y, X, X_ileri, lambdalar=RIDGE_LAMBDALARI):
+    """
+    Eksojen değişkenler ve doğrusal eğilim üzerine ridge regresyonu. Standartlaştırılmış tasarım
+    matrisinin tek bir SVD'si ile tüm ceza katsayıları ve tüm binalar için çözüm aynı anda
+    bulunur; her bina için genelleştirilmiş çapraz doğrulama (GCV) hatası en küçük olan ceza seçilir.
+
+    Returns:
+        dict: 'tahmin', 'std', 'artik', etkin parametre sayısı (bina) ve seçilen 'lambda' (bina).
+    """
+    Y = np.asarray(Y, dtype=float)
+    n = Y.shape[0]
+    egilim = np.arange(n + len(X_ileri), dtype=float)[:, None] / n
+    X = np.hstack([np.asarray(X, dtype=float), egilim[:n]])
+    X_ileri = np.hstack([np.asarray(X_ileri, dtype=float), egilim[n:]])
+
+    ort, std = X.mean(axis=0), X.std(axis=0)
+    std[std == 0] = 1.0
+    Z, Z_ileri = (X - ort) / std, (X_ileri - ort) / std
+    y_ort = Y.mean(axis=0)
+    Yc = Y - y_ort
+
+    U, S, Vt = np.linalg.svd(Z, full_matrices=False)
+    lambdalar = np.asarray(lambdalar, dtype=float)
+    kuculme = S ** 2 / (S ** 2 + lambdalar[:, None])                    # (lambda, bileşen)
+    UtY = U.T @ Yc                                                      # (bileşen, bina)
+    uyum = np.einsum('ic,lc,ck->lik', U, kuculme, UtY)                  # (lambda, zaman, bina)
+    sse = ((Yc - uyum) ** 2).sum(axis=1)                                # (lambda, bina)
+    serbestlik = kuculme.sum(axis=1)                                    # (lambda,)
+    gcv = n * sse / ((n - serbestlik)[:, None] ** 2)
+    secim = gcv.argmin(axis=0)
+    binalar = np.arange(Y.shape[1])
+
+    # β = V diag(s / (s² + λ)) Uᵀ y, seçilen λ ile her bina için
+    carpan = (S / (S ** 2 + lambdalar[secim][:, None])).T               # (bileşen, bina)
+    beta = Vt.T @ (carpan * UtY)                                        # (özellik, bina)
+    tahmin = y_ort + Z_ileri @ beta
+    artik = Yc - uyum[secim, :, binalar].T
+    sigma = np.sqrt(sse[secim, binalar] / np.maximum(n - serbestlik[secim], 1))
+    return {
+        'tahmin': tahmin,
+        'std': np.broadcast_to(sigma, tahmin.shape),
+        'artik': artik,
+        'parametre': serbestlik[secim] + 1,
+        'lambda': lambdalar[secim]
+    }
+
+
+def hizli_model_calistir(model, Y, ufuk, train_exog=None, forecast_exog=None, s=12):
+    """Hızlı modeli (zaman, seri) matrisine uygular; ridge için eksojen tablolar gereklidir."""
+    if model == 'mevsimsel_naif':
+        return mevsimsel_naif(Y, ufuk, s)
+    if model == 'holt_winters':
+        return holt_winters(Y, ufuk, s)
+    if model == 'ridge':
+        return ridge_eksojen(Y, train_exog, forecast_exog)
+    raise ValueError(f"Bilinmeyen hızlı model: {model}")
+
+
+def hizli_tahmin(train_data, train_exog, forecast_exog, model='holt_winters', s=12):
+    """
+    Seçilen hızlı modeli tüm bina sütunlarına tek seferde uygular. Sonuçlar, SARIMAX yolundaki
+    sarimax_tahmin çıktısıyla aynı anahtarlara sahip bina başına sözlükler olarak döndürülür;
+    AIC/BIC, artıkların Gauss olabilirliğinden hesaplanır.
+
+    Returns:
+        tuple: (sütun sırasıyla sonuç listesi, toplam süre)
+    """
+    baslangic = time.perf_counter()
+    sonuc = hizli_model_calistir(model, train_data.to_numpy(dtype=float), len(forecast_exog),
+                                 train_exog, forecast_exog, s)
+
+    artik = sonuc['artik']
+    m = artik.shape[0]
+    mse = np.mean(artik ** 2, axis=0)
+    log_olabilirlik = -0.5 * m * (np.log(2 * np.pi * np.maximum(mse, 1e-12)) + 1)
+    parametre = np.broadcast_to(np.asarray(sonuc['parametre'], dtype=float) + 1, mse.shape)
+    aic = 2 * parametre - 2 * log_olabilirlik
+    bic = np.log(m) * parametre - 2 * log_olabilirlik
+    alt = sonuc['tahmin'] - Z_95 * sonuc['std']
+    ust = sonuc['tahmin'] + Z_95 * sonuc['std']
+    sure = time.perf_counter() - baslangic
+
+    return [{
+        'bina': bina,
+        'model': HIZLI_MODELLER[model],
+        'tahmin': pd.Series(sonuc['tahmin'][:, i], index=forecast_exog.index, name='predicted_mean'),
+        'guven_araligi': pd.DataFrame({f'lower {bina}': alt[:, i], f'upper {bina}': ust[:, i]},
+                                      index=forecast_exog.index),
+        'aic': aic[i],
+        'bic': bic[i],
+        'mse': mse[i],
+        'sure': sure,
+        'kaynak': 'hizli'
+    } for i, bina in enumerate(train_data.columns)], sure
+
+
+def _hata_olculeri(gercek, tahmin):
+    """Bina başına MAPE (%) ve RMSE."""
+    hata = tahmin - gercek
+    return (np.mean(np.abs(hata) / np.abs(gercek), axis=0) * 100,
+            np.sqrt(np.mean(hata ** 2, axis=0)))
+
+
+def hizli_model_karsilastirmasi(df_binalar, df_exog, eksojen_sutunlari, test_ay=12, egitim_ay=24, maks_isci=None):
+    """
+    Serinin son test_ay ayını ayırıp öncesindeki egitim_ay ayla (panodaki eğitim penceresi) hızlı
+    modelleri ve SARIMAX yolunu karşılaştırır. SARIMAX önbelleksiz eğitilir; süreler duvar saati süreleridir.
+
+    Returns:
+        tuple: (model başına özet tablo, bina ve model başına hata tablosu)
+    """
+    egitim = df_binalar.iloc[-(test_ay + egitim_ay):-test_ay]
+    test = df_binalar.iloc[-test_ay:]
+    egitim_exog = df_exog.loc[egitim.index, eksojen_sutunlari]
+    test_exog = df_exog.loc[test.index, eksojen_sutunlari]
+    gercek = test.to_numpy(dtype=float)
+
+    tahminler = {}
+    for model, ad in HIZLI_MODELLER.items():
+        sonuclar, sure = hizli_tahmin(egitim, egitim_exog, test_exog, model=model)
+        tahminler[ad] = (np.column_stack([r['tahmin'].to_numpy() for r in sonuclar]), sure)
+    sonuclar, sure, _ = paralel_sarimax_fit(egitim, egitim_exog, test_exog, maks_isci=maks_isci)
+    tahminler['SARIMAX'] = (np.column_stack([r['tahmin'].to_numpy() for r in sonuclar]), sure)
+
+    ozet = []
+    detay = []
+    for ad, (tahmin, sure) in tahminler.items():
+        mape, rmse = _hata_olculeri(gercek, tahmin)
+        ozet.append({
+            'Model': ad,
+            'Süre (ms)': sure * 1000,
+            'Ortalama MAPE (%)': mape.mean(),
+            'Ortalama RMSE (kWh)': rmse.mean()
+        })
+        detay.extend({'Model': ad, 'Bina': bina, 'MAPE (%)': mape[i], 'RMSE (kWh)': rmse[i]}
+                     for i, bina in enumerate(df_binalar.columns))
+    ozet = pd.DataFrame(ozet)
+    ozet['SARIMAX\'a Göre Hızlanma'] = ozet.loc[ozet['Model'] == 'SARIMAX', 'Süre (ms)'].iloc[0] / ozet['Süre (ms)']
+    return ozet, pd.DataFrame(detay)
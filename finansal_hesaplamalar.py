@@ -4,6 +4,19 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
+from solar_panel_analysis import hourly_time_index
+
+# Mevsimlerin ay eşlemesi (0: Kış, 1: İlkbahar, 2: Yaz, 3: Sonbahar)
+MEVSIM_INDEKSI = np.array([0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])
+
+# Örnek mevsimsel-saatlik marjinal şebeke emisyon faktörü tablosu (kg CO2/kWh), şekil (4 mevsim, 24 saat).
+# Gece baz yük santralleri, öğle saatlerinde yenilenebilir payı ve akşam puantı dikkate alınarak
+# uydurulmuştur; gerçek senaryoda şebeke işletmecisinin saatlik verileri kullanılmalıdır.
+ORNEK_MARJINAL_EMISYON = (
+    np.array([0.55, 0.47, 0.50, 0.52])[:, None] +
+    np.array([0.03] * 6 + [0.01] * 4 + [-0.06] * 7 + [0.05] * 5 + [0.03] * 2)[None, :]
+)
+
 class FinansalAnalizler:
     def __init__(self):
         # Temel parametreler
@@ -154,6 +167,131 @@ class FinansalAnalizler:
         
         return pd.DataFrame(yillik_analiz), amortisman_yili
 
+    # Duyarlılık analizinde değiştirilen parametreler (görünen ad, tam sayı mı?, üst sınır)
+    TORNADO_PARAMETRELERI = {
+        'yillik_uretim': ('Yıllık Üretim', False, None),
+        'elektrik_birim_fiyat': ('Elektrik Birim Fiyatı', False, None),
+        'kdv_orani': ('KDV Oranı', False, None),
+        'enflasyon_orani': ('Enflasyon Oranı', False, None),
+        'elektrik_zam_orani': ('Elektrik Zam Oranı', False, None),
+        'faiz_orani': ('İskonto (Faiz) Oranı', False, None),
+        'golgelenme_kaybi': ('Gölgelenme Kaybı', False, 1.0),
+        'sicaklik_kaybi': ('Sıcaklık Kaybı', False, 1.0),
+        'kablo_kaybi': ('Kablo Kaybı', False, 1.0),
+        'inverter_verimi': ('İnverter Verimi', False, 1.0),
+        'panel_yaslanma_kaybi': ('Panel Yaşlanma Kaybı', False, 1.0),
+        'bakim_maliyet_orani': ('Bakım Maliyet Oranı', False, None),
+        'sigorta_maliyet_orani': ('Sigorta Maliyet Oranı', False, None),
+        'temizlik_maliyet': ('Temizlik Maliyeti', False, None),
+        'inverter_degisim_yili': ('İnverter Değişim Yılı', True, None),
+        'inverter_maliyet_orani': ('İnverter Maliyet Oranı', False, None),
+    }
+
+    def nakit_akisi_vektorel(self, parametreler, yil_sayisi=25, ihracat_orani=0.85):
+        """
+        detayli_elektrik_analizi ile aynı nakit akışı modelini, her satırı bir senaryo olan
+        parametre dizileri üzerinde tek seferde hesaplar.
+
+        Args:
+            parametreler (dict): Parametre adı -> (n,) dizisi. panel_maliyeti, kurulum_maliyeti,
+                yillik_tuketim ve sistem_kayip ile TORNADO_PARAMETRELERI anahtarlarını içerir.
+            yil_sayisi (int): Analiz süresi (yıl).
+            ihracat_orani (float): Şebekeye satış fiyatının alış fiyatına oranı.
+
+        Returns:
+            dict: Yıllık net kazanç (n, yil_sayisi), NPV (n,) ve amortisman yılı (n,) dizileri.
+        """
+        P = {ad: np.atleast_1d(np.asarray(deger, dtype=float))[:, None] for ad, deger in parametreler.items()}
+        yil = np.arange(1, yil_sayisi + 1)[None, :]
+
+        sistem_maliyeti = P['panel_maliyeti'] * (1 + P['kdv_orani']) + P['kurulum_maliyeti']
+        toplam_kayip = (P['sistem_kayip'] + P['golgelenme_kaybi'] + P['sicaklik_kaybi'] +
+                        P['kablo_kaybi'] + (1 - P['inverter_verimi']))
+
+        net_uretim = P['yillik_uretim'] * (1 - P['panel_yaslanma_kaybi']) ** (yil - 1) * (1 - toplam_kayip)
+        elektrik_fiyati = P['elektrik_birim_fiyat'] * (1 + P['elektrik_zam_orani']) ** (yil - 1)
+        oz_tuketim = np.minimum(net_uretim, P['yillik_tuketim'])
+        sebekeye_satilan = np.maximum(0, net_uretim - P['yillik_tuketim'])
+        toplam_gelir = (oz_tuketim + sebekeye_satilan * ihracat_orani) * elektrik_fiyati
+
+        enflasyon = (1 + P['enflasyon_orani']) ** (yil - 1)
+        inverter_yili = yil == np.round(P['inverter_degisim_yili'])
+        toplam_gider = (sistem_maliyeti * (P['bakim_maliyet_orani'] + P['sigorta_maliyet_orani'] +
+                                           P['inverter_maliyet_orani'] * inverter_yili) +
+                        P['temizlik_maliyet']) * enflasyon
+
+        net_kazanc = toplam_gelir - toplam_gider
+        kumulatif = np.cumsum(net_kazanc, axis=1)
+        geri_odendi = kumulatif >= sistem_maliyeti
+        amortisman_yili = np.where(geri_odendi.any(axis=1), geri_odendi.argmax(axis=1) + 1.0, np.nan)
+        npv = (net_kazanc / (1 + P['faiz_orani']) ** yil).sum(axis=1) - sistem_maliyeti[:, 0]
+
+        return {
+            'sistem_maliyeti': sistem_maliyeti[:, 0],
+            'net_kazanc': net_kazanc,
+            'kumulatif_tasarruf': kumulatif,
+            'npv': npv,
+            'amortisman_yili': amortisman_yili
+        }
+
+    def tornado_analizi(self, yillik_uretim, elektrik_birim_fiyat, panel_maliyeti, kurulum_maliyeti,
+                        yillik_tuketim=None, sistem_kayip=0.10, degisim_orani=0.20, **temel_degerler):
+        """
+        Her parametreyi temel değerinin ±degisim_orani kadar değiştirerek NPV ve geri ödeme
+        süresindeki salınımları hesaplar. Tüm 2N+1 senaryo tek bir toplu girdi matrisiyle
+        nakit_akisi_vektorel çağrısında değerlendirilir.
+
+        Args:
+            temel_degerler: Sınıf niteliklerini geçersiz kılan temel değerler (ör. kdv_orani=0.18).
+
+        Returns:
+            tuple: (salınıma göre sıralı tornado tablosu, temel senaryo sonuçları)
+        """
+        if yillik_tuketim is None:
+            yillik_tuketim = yillik_uretim
+
+        temel = {ad: getattr(self, ad) for ad in self.TORNADO_PARAMETRELERI if hasattr(self, ad)}
+        temel.update(yillik_uretim=yillik_uretim, elektrik_birim_fiyat=elektrik_birim_fiyat)
+        temel.update(temel_degerler)
+        adlar = list(self.TORNADO_PARAMETRELERI)
+        n = len(adlar)
+
+        # Satır 0: temel senaryo, 1..n: düşük, n+1..2n: yüksek değerler
+        matris = np.tile(np.array([temel[ad] for ad in adlar], dtype=float), (2 * n + 1, 1))
+        dusuk, yuksek = [], []
+        for j, ad in enumerate(adlar):
+            _, tam_sayi, ust_sinir = self.TORNADO_PARAMETRELERI[ad]
+            adim = max(1, round(temel[ad] * degisim_orani)) if tam_sayi else temel[ad] * degisim_orani
+            dusuk.append(max(0, temel[ad] - adim))
+            yuksek.append(temel[ad] + adim if ust_sinir is None else min(ust_sinir, temel[ad] + adim))
+        matris[1 + np.arange(n), np.arange(n)] = dusuk
+        matris[1 + n + np.arange(n), np.arange(n)] = yuksek
+
+        parametreler = {ad: matris[:, j] for j, ad in enumerate(adlar)}
+        parametreler.update(panel_maliyeti=panel_maliyeti, kurulum_maliyeti=kurulum_maliyeti,
+                            yillik_tuketim=yillik_tuketim, sistem_kayip=sistem_kayip)
+        sonuc = self.nakit_akisi_vektorel(parametreler)
+
+        npv, amortisman = sonuc['npv'], sonuc['amortisman_yili']
+        tablo = pd.DataFrame({
+            'Parametre': [self.TORNADO_PARAMETRELERI[ad][0] for ad in adlar],
+            'Temel Değer': [temel[ad] for ad in adlar],
+            'Düşük Değer': dusuk,
+            'Yüksek Değer': yuksek,
+            'NPV Düşük (TL)': npv[1:n + 1],
+            'NPV Yüksek (TL)': npv[n + 1:],
+            'NPV Salınımı (TL)': np.abs(npv[n + 1:] - npv[1:n + 1]),
+            'Geri Ödeme Düşük (Yıl)': amortisman[1:n + 1],
+            'Geri Ödeme Yüksek (Yıl)': amortisman[n + 1:],
+        }).sort_values('NPV Salınımı (TL)', ascending=False, ignore_index=True)
+
+        temel_sonuc = {
+            'npv': npv[0],
+            'amortisman_yili': amortisman[0],
+            'sistem_maliyeti': sonuc['sistem_maliyeti'][0]
+        }
+        return tablo, temel_sonuc
+
     def hesapla_performans_metrikleri(self, yillik_analiz_df, sistem_maliyeti):
         """Sistem performans metriklerini hesaplar."""
         toplam_uretim = yillik_analiz_df['Net Üretim (kWh)'].sum()
@@ -186,6 +324,74 @@ class FinansalAnalizler:
             'agac_esdegeri': yillik_tasarruf * agac_esdeger_faktoru
         }
 
+    def emisyon_faktoru_dizisi(self, emisyon_faktoru, zaman=None):
+        """
+        Emisyon faktörü tablosunu 8760 saatlik diziye genişletir. Tablonun biçimi son eksenlerden anlaşılır:
+        (..., 8760) saatlik, (..., 12, 24) ay×saat, (..., 4, 24) mevsim×saat, (..., 24) günün saati,
+        (..., 12) aylık, (..., 4) mevsimlik; skaler değer sabit faktördür. Öndeki eksenler senaryo eksenidir.
+        """
+        if zaman is None:
+            zaman = hourly_time_index()
+        ay = zaman.month.values - 1
+        saat = zaman.hour.values
+        tablo = np.asarray(emisyon_faktoru, dtype=float)
+
+        if tablo.ndim == 0:
+            return np.full(len(zaman), float(tablo))
+        if tablo.shape[-1] == len(zaman):
+            return tablo
+        if tablo.ndim >= 2 and tablo.shape[-2:] == (12, 24):
+            return tablo[..., ay, saat]
+        if tablo.ndim >= 2 and tablo.shape[-2:] == (4, 24):
+            return tablo[..., MEVSIM_INDEKSI[ay], saat]
+        if tablo.shape[-1] == 24:
+            return tablo[..., saat]
+        if tablo.shape[-1] == 12:
+            return tablo[..., ay]
+        if tablo.shape[-1] == 4:
+            return tablo[..., MEVSIM_INDEKSI[ay]]
+        raise ValueError(f"Desteklenmeyen emisyon faktörü tablosu şekli: {tablo.shape}")
+
+    def saatlik_karbon_analizi(self, saatlik_uretim, emisyon_faktoru=0.5, yil_sayisi=25,
+                               sebeke_iyilesme_orani=0.0, agac_esdeger_faktoru=60.5, zaman=None):
+        """
+        Saatlik üretim dizisini saatlik/mevsimsel şebeke emisyon faktörleriyle eşleştirerek karbon
+        tasarrufunu hesaplar. Yıllık projeksiyon panel yaşlanma kaybı ve şebekenin yıllık
+        karbonsuzlaşma oranı ile tüm senaryolar için vektörel olarak oluşturulur.
+
+        Args:
+            saatlik_uretim (array): Saatlik üretim (kWh), şekil (8760,).
+            emisyon_faktoru: Skaler, tablo veya senaryo yığını (bkz. emisyon_faktoru_dizisi).
+            sebeke_iyilesme_orani (float veya array): Emisyon faktörünün yıllık düşüş oranı.
+
+        Returns:
+            dict: Senaryo ekseni (...) korunarak aylık, yıllık ve toplam tasarruflar (ton CO2).
+        """
+        if zaman is None:
+            zaman = hourly_time_index()
+        uretim = np.asarray(saatlik_uretim, dtype=float)
+        faktor = self.emisyon_faktoru_dizisi(emisyon_faktoru, zaman)
+
+        saatlik_tasarruf = uretim * faktor / 1000  # ton CO2
+        ay = zaman.month.values
+        ay_baslangic = np.flatnonzero(np.r_[True, ay[1:] != ay[:-1]])
+        aylik_tasarruf = np.add.reduceat(saatlik_tasarruf, ay_baslangic, axis=-1)
+        ilk_yil = aylik_tasarruf.sum(axis=-1)
+
+        yil = np.arange(yil_sayisi)
+        yaslanma = (1 - self.panel_yaslanma_kaybi) ** yil
+        sebeke = (1 - np.asarray(sebeke_iyilesme_orani, dtype=float)[..., None]) ** yil
+        yillik_tasarruf = ilk_yil[..., None] * yaslanma * sebeke
+
+        return {
+            'aylik_karbon_tasarrufu': aylik_tasarruf,
+            'yillik_karbon_tasarrufu': ilk_yil,
+            'yillik_projeksiyon': yillik_tasarruf,
+            'toplam_tasarruf': yillik_tasarruf.sum(axis=-1),
+            'agac_esdegeri': ilk_yil * agac_esdeger_faktoru,
+            'ortalama_emisyon_faktoru': np.divide(ilk_yil * 1000, uretim.sum())
+        }
+
     def risk_analizi(self, senaryo_sayisi=1000, elektrik_zam_orani=0.35, 
                      enflasyon_orani=0.30, uretim_dalgalanma=0.10):
         """Monte Carlo simülasyonu ile risk analizi yapar."""
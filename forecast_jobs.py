@@ -0,0 +1,200 @@
+# forecast_jobs.py
+
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from backtesting import geriye_donuk_test
+from forecast_models import ModelCache, paralel_sarimax_fit
+from scenario_store import input_hash
+
+# İş durumlarının görünen adları
+IS_DURUMLARI = {
+    'kuyrukta': 'Kuyrukta',
+    'calisiyor': 'Çalışıyor',
+    'tamamlandi': 'Tamamlandı',
+    'hata': 'Hata'
+}
+
+
+def tahmin_isi(train_data, train_exog, forecast_exog, mertebeler, onbellek_kok, yenile):
+    """
+    Arka plan işçisinde tüm binaların SARIMAX modellerini eğitir ve tahmin üretir. İşçi süreç
+    kendisi havuz açmaz; modeller sırayla eğitilir ve model önbelleği (disk) panoyla paylaşılır.
+    yenile=True ise önbellekteki modeller kullanılmadan yeniden eğitilir. Tahmin eksojenleri de
+    sonuçla saklanır; eski bir sonuç gösterilirken kendi tahmin dönemiyle çizilir. Model önbelleğinin
+    bu işteki isabet/ıskalama sayıları da sonuca eklenir (yenile=True iken None).
+    """
+    onbellek = None if yenile else ModelCache(onbellek_kok)
+    sonuclar, duvar_suresi, isci_sayisi = paralel_sarimax_fit(
+        train_data, train_exog, forecast_exog, maks_isci=1, onbellek=onbellek, mertebeler=mertebeler
+    )
+    return {
+        'sonuclar': sonuclar,
+        'duvar_suresi': duvar_suresi,
+        'isci_sayisi': isci_sayisi,
+        'forecast_exog': forecast_exog,
+        'onbellek_durumu': onbellek.stats() if onbellek is not None else None
+    }
+
+
+def geriye_donuk_isi(df_binalar, df_exog, eksojen_sutunlari, ayarlar, onbellek_kok, yenile):
+    """
+    Arka plan işçisinde geriye dönük testi çalıştırır. tahmin_isi gibi işçi süreç kendisi havuz
+    açmaz; kat tahminleri sırayla hesaplanır ve kat önbelleği (disk) panoyla paylaşılır.
+    ayarlar, geriye_donuk_test'in model, adım, pencere ve mertebe argümanlarıdır.
+    """
+    onbellek = None if yenile else ModelCache(onbellek_kok)
+    return geriye_donuk_test(df_binalar, df_exog, eksojen_sutunlari, maks_isci=1, onbellek=onbellek, **ayarlar)
+
+
+class ForecastJobQueue:
+    """
+    Tahmin işleri için yerel iş kuyruğu; iş fonksiyonu tahmin_isi (varsayılan) veya geriye_donuk_isi
+    olabilir. İşler ayrı işçi süreçlerde çalışır, Streamlit yeniden çalıştırmalarını bloklamaz; biten
+    işlerin sonuçları girdi özetiyle diske yazılır. Aynı girdiler için bekleyen bir iş varsa yeni iş
+    açılmaz; son işi hata veren girdiler yalnızca açıkça istendiğinde yeniden gönderilir.
+    """
+
+    def __init__(self, root=".cache/tahmin_isleri", maks_isci=1, onbellek_kok=".cache/modeller",
+                 is_fonksiyonu=tahmin_isi):
+        self.root = root
+        self.maks_isci = maks_isci
+        self.onbellek_kok = onbellek_kok
+        self.is_fonksiyonu = is_fonksiyonu
+        os.makedirs(self.root, exist_ok=True)
+        self._son_yolu = os.path.join(self.root, "son.json")
+        self._havuz = None
+        self._isler = {}       # iş kimliği -> iş kaydı
+        self._bekleyen = {}    # girdi anahtarı -> iş kimliği
+        self._hatalar = {}     # girdi anahtarı -> son işin hata mesajı
+        self._kilit = threading.Lock()
+
+    def _yol(self, anahtar):
+        return os.path.join(self.root, f"{anahtar}.pkl")
+
+    def anahtar(self, *girdiler):
+        """İş fonksiyonunun girdileri (önbellek kökü ve yenile hariç) için içerik özeti."""
+        return input_hash(*girdiler, is_fonksiyonu=self.is_fonksiyonu.__name__)
+
+    def gonder(self, anahtar, *girdiler, yenile=False, tekrar_dene=False):
+        """
+        İşi kuyruğa ekler ve iş kimliğini döndürür. Aynı anahtar için bekleyen iş varsa onun
+        kimliği döner. yenile=False iken sonucu zaten diskte olan girdiler için, yenile ve
+        tekrar_dene verilmedikçe son işi hata veren girdiler için iş açılmaz (None); böylece kalıcı
+        bir hata her yeniden çalıştırmada tekrar denenmez. yenile=True iken iş önbellek kullanmaz.
+        """
+        with self._kilit:
+            if anahtar in self._bekleyen:
+                return self._bekleyen[anahtar]
+            if anahtar in self._hatalar and not (yenile or tekrar_dene):
+                return None
+            if not yenile and anahtar not in self._hatalar and os.path.exists(self._yol(anahtar)):
+                return None
+            self._hatalar.pop(anahtar, None)
+            argumanlar = (*girdiler, self.onbellek_kok, yenile)
+            try:
+                gorev = self._havuz_al().submit(self.is_fonksiyonu, *argumanlar)
+            except BrokenProcessPool:
+                # İşçisi beklenmedik şekilde sonlanan havuz yeniden kurulur
+                self._havuz.shutdown(wait=False, cancel_futures=True)
+                self._havuz = None
+                gorev = self._havuz_al().submit(self.is_fonksiyonu, *argumanlar)
+            kimlik = uuid.uuid4().hex[:8]
+            self._isler[kimlik] = {
+                'kimlik': kimlik,
+                'anahtar': anahtar,
+                'yenile': yenile,
+                'gonderim': time.time(),
+                'bitis': None,
+                'hata': None,
+                '_gorev': gorev
+            }
+            self._bekleyen[anahtar] = kimlik
+        gorev.add_done_callback(lambda g, kimlik=kimlik: self._tamamlandi(kimlik, g))
+        return kimlik
+
+    def _havuz_al(self):
+        if self._havuz is None:
+            self._havuz = ProcessPoolExecutor(
+                max_workers=self.maks_isci, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._havuz
+
+    def _tamamlandi(self, kimlik, gorev):
+        """İş bittiğinde (havuzun geri çağırma iş parçacığında) sonucu diske yazar."""
+        kayit = self._isler[kimlik]
+        gecici = f"{self._yol(kayit['anahtar'])}.tmp-{os.getpid()}-{kimlik}"
+        try:
+            sonuc = gorev.result()
+            sonuc.update({'anahtar': kayit['anahtar'], 'bitis': time.time()})
+            with open(gecici, 'wb') as f:
+                pickle.dump(sonuc, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(gecici, self._yol(kayit['anahtar']))
+            with open(self._son_yolu, 'w', encoding='utf-8') as f:
+                json.dump({'anahtar': kayit['anahtar'], 'bitis': sonuc['bitis']}, f)
+        except Exception as hata:
+            # İş veya sonucun diske yazılması başarısız olursa hata işe ve girdi anahtarına kaydedilir
+            kayit['hata'] = f"{type(hata).__name__}: {hata}"
+            with self._kilit:
+                self._hatalar[kayit['anahtar']] = kayit['hata']
+            if os.path.exists(gecici):
+                os.remove(gecici)
+        finally:
+            # Anahtar her durumda serbest bırakılır; aksi halde aynı girdiler için yeni iş açılamaz
+            with self._kilit:
+                kayit['bitis'] = time.time()
+                self._bekleyen.pop(kayit['anahtar'], None)
+
+    def durum(self, kimlik):
+        """İşin durumu: 'kuyrukta', 'calisiyor', 'tamamlandi' veya 'hata'."""
+        kayit = self._isler[kimlik]
+        if kayit['bitis'] is not None:
+            return 'hata' if kayit['hata'] else 'tamamlandi'
+        return 'calisiyor' if kayit['_gorev'].running() else 'kuyrukta'
+
+    def bekleyen_is(self, anahtar):
+        """Anahtar için kuyrukta veya çalışmakta olan işin kimliği (yoksa None)."""
+        return self._bekleyen.get(anahtar)
+
+    def hata(self, anahtar):
+        """Anahtar için son işin hata mesajı (son iş başarılıysa veya hiç iş yoksa None)."""
+        return self._hatalar.get(anahtar)
+
+    def sonuc(self, anahtar):
+        """Girdi anahtarı için tamamlanmış sonucu diskten okur (yoksa None)."""
+        try:
+            with open(self._yol(anahtar), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def son_tamamlanan(self):
+        """Girdilerden bağımsız olarak en son tamamlanan işin sonucu (yoksa None)."""
+        try:
+            with open(self._son_yolu, encoding='utf-8') as f:
+                return self.sonuc(json.load(f)['anahtar'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def isler(self):
+        """Bu süreçte gönderilen işlerin durum tablosu (en yeni üstte)."""
+        simdi = time.time()
+        return pd.DataFrame([{
+            'İş': kayit['kimlik'],
+            'Durum': IS_DURUMLARI[self.durum(kimlik)],
+            'Yenileme': kayit['yenile'],
+            'Gönderim': pd.Timestamp(kayit['gonderim'], unit='s', tz='UTC').tz_convert('Europe/Istanbul')
+                          .strftime('%H:%M:%S'),
+            'Süre (s)': (kayit['bitis'] or simdi) - kayit['gonderim'],
+            'Hata': kayit['hata']
+        } for kimlik, kayit in sorted(self._isler.items(), key=lambda kv: -kv[1]['gonderim'])],
+            columns=['İş', 'Durum', 'Yenileme', 'Gönderim', 'Süre (s)', 'Hata'])
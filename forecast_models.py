@@ -0,0 +1,620 @@
+# forecast_models.py
+
+import json
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from scenario_store import input_hash
+
+EXOG_SUTUNLARI = ['Sicaklik', 'Nem', 'Guneslenme', 'Donem_Aktivitesi', 'Mesai_Saatleri', 'Hafta_Sonu_Etkisi']
+
+# Varsayılan SARIMAX mertebeleri: (p, d, q) ve (P, D, Q, s)
+VARSAYILAN_ORDER = (1, 0, 1)
+VARSAYILAN_SEASONAL_ORDER = (1, 0, 1, 12)
+
+
+def bina_tuketim_verisi():
+    """
+    ESOGÜ bina tiplerinin 5 yıllık (2020-2024) aylık tüketim verilerini döndürür.
+    """
+    # Bina tüketim verilerini güncelleyelim (günlük değerler x 30 gün)
+    binalar = {
+        'Fakülteler': [  # Min:220x30, Max:580x30, Ort:400x30
+            12000, 12600, 13200, 11400, 9900, 8250,   # 2020 (Ocak-Haziran)
+            6600, 7200, 10500, 12600, 14400, 15600,   # 2020 (Temmuz-Aralık)
+            12300, 12900, 13500, 11700, 10200, 8550,  # 2021
+            6900, 7500, 10800, 12900, 14700, 15900,
+            12600, 13200, 13800, 12000, 10500, 8850,  # 2022
+            7200, 7800, 11100, 13200, 15000, 16200,
+            12900, 13500, 14100, 12300, 10800, 9150,  # 2023
+            7500, 8100, 11400, 13500, 15300, 16500,
+            13200, 13800, 14400, 12600, 11100, 9450,  # 2024
+            7800, 8400, 11700, 13800, 15600, 17400
+        ],
+        'Kültürel ve Sosyal Alanlar': [  # Min:200x30, Max:590x30, Ort:395x30
+            10500, 11100, 11700, 9600, 8100, 6600,    # 2020
+            6000, 6600, 9600, 12000, 13500, 15000,
+            10800, 11400, 12000, 9900, 8400, 6900,    # 2021
+            6300, 6900, 9900, 12300, 13800, 15300,
+            11100, 11700, 12300, 10200, 8700, 7200,   # 2022
+            6600, 7200, 10200, 12600, 14100, 15600,
+            11400, 12000, 12600, 10500, 9000, 7500,   # 2023
+            6900, 7500, 10500, 12900, 14400, 15900,
+            11700, 12300, 12900, 10800, 9300, 7800,   # 2024
+            7200, 7800, 10800, 13200, 14700, 17700
+        ],
+        'Sağlık Tesisleri': [  # Min:200x30, Max:570x30, Ort:385x30
+            10200, 10800, 11400, 9300, 7800, 6300,    # 2020
+            6000, 6600, 9300, 11700, 13200, 14700,
+            10500, 11100, 11700, 9600, 8100, 6600,    # 2021
+            6300, 6900, 9600, 12000, 13500, 15000,
+            10800, 11400, 12000, 9900, 8400, 6900,    # 2022
+            6600, 7200, 9900, 12300, 13800, 15300,
+            11100, 11700, 12300, 10200, 8700, 7200,   # 2023
+            6900, 7500, 10200, 12600, 14100, 15600,
+            11400, 12000, 12600, 10500, 9000, 7500,   # 2024
+            7200, 7800, 10500, 12900, 14400, 17100
+        ],
+        'Araştırma ve Uygulama Merkezleri': [  # Min:180x30, Max:490x30, Ort:335x30
+            9000, 9600, 10200, 8100, 6600, 5700,      # 2020
+            5400, 6000, 8700, 10500, 12000, 13200,
+            9300, 9900, 10500, 8400, 6900, 6000,      # 2021
+            5700, 6300, 9000, 10800, 12300, 13500,
+            9600, 10200, 10800, 8700, 7200, 6300,     # 2022
+            6000, 6600, 9300, 11100, 12600, 13800,
+            9900, 10500, 11100, 9000, 7500, 6600,     # 2023
+            6300, 6900, 9600, 11400, 12900, 14100,
+            10200, 10800, 11400, 9300, 7800, 6900,    # 2024
+            6600, 7200, 9900, 11700, 13200, 14700
+        ],
+        'Spor Alanları': [  # Min:150x30, Max:370x30, Ort:260x30
+            6600, 7200, 7800, 6000, 5400, 4800,       # 2020
+            4500, 5100, 7200, 8700, 9900, 10500,
+            6900, 7500, 8100, 6300, 5700, 5100,       # 2021
+            4800, 5400, 7500, 9000, 10200, 10800,
+            7200, 7800, 8400, 6600, 6000, 5400,       # 2022
+            5100, 5700, 7800, 9300, 10500, 11100,
+            7500, 8100, 8700, 6900, 6300, 5700,       # 2023
+            5400, 6000, 8100, 9600, 10800, 11100,
+            7800, 8400, 9000, 7200, 6600, 6000,       # 2024
+            5700, 6300, 8400, 9900, 11100, 11100
+        ],
+        'Yemek ve Konaklama': [  # Min:80x30, Max:220x30, Ort:150x30
+            3900, 4200, 4800, 3600, 3000, 2700,       # 2020
+            2400, 2700, 3600, 4800, 5700, 6300,
+            4200, 4500, 5100, 3900, 3300, 3000,       # 2021
+            2700, 3000, 3900, 5100, 6000, 6600,
+            4500, 4800, 5400, 4200, 3600, 3300,       # 2022
+            3000, 3300, 4200, 5400, 6300, 6600,
+            4800, 5100, 5700, 4500, 3900, 3600,       # 2023
+            3300, 3600, 4500, 5700, 6600, 6600,
+            5100, 5400, 6000, 4800, 4200, 3900,       # 2024
+            3600, 3900, 4800, 6000, 6600, 6600
+        ],
+        'Park ve Açık Alanlar': [  # Min:15x30, Max:45x30, Ort:30x30
+            750, 840, 960, 600, 540, 480,             # 2020
+            450, 510, 750, 1050, 1200, 1290,
+            780, 870, 990, 630, 570, 510,             # 2021
+            480, 540, 780, 1080, 1230, 1320,
+            810, 900, 1020, 660, 600, 540,            # 2022
+            510, 570, 810, 1110, 1260, 1350,
+            840, 930, 1050, 690, 630, 570,            # 2023
+            540, 600, 840, 1140, 1290, 1350,
+            870, 960, 1080, 720, 660, 600,            # 2024
+            570, 630, 870, 1170, 1320, 1350
+        ],
+        'Helikopter Pisti': [  # Min:5x30, Max:10x30, Ort:7.5x30
+            210, 240, 270, 180, 150, 150,             # 2020
+            150, 180, 210, 240, 270, 300,
+            210, 240, 270, 180, 150, 150,             # 2021
+            150, 180, 210, 240, 270, 300,
+            210, 240, 270, 180, 150, 150,             # 2022
+            150, 180, 210, 240, 270, 300,
+            210, 240, 270, 180, 150, 150,             # 2023
+            150, 180, 210, 240, 270, 300,
+            210, 240, 270, 180, 150, 150,             # 2024
+            150, 180, 210, 240, 270, 300
+        ]
+    }
+
+    df_binalar = pd.DataFrame(binalar)
+    # 5 yıllık veri olduğu için 60 aylık tarih aralığı oluşturuyoruz
+    df_binalar.index = pd.date_range(start="2020-01-01", periods=60, freq='M')
+    df_binalar.index.name = "Tarih"
+    return df_binalar
+
+
+def eksojen_veri():
+    """
+    Hava durumu ve üniversite aktivite faktörlerini içeren 72 aylık (2020-2025) eksojen veri setini döndürür.
+    """
+    # Eskişehir için hava durumu ve diğer faktörleri içeren detaylı veri seti
+    weather_factors = {
+        'Sicaklik': [  # Eskişehir aylık ortalama sıcaklıklar (°C)
+            0.5, 2.1, 6.3, 11.2, 16.1, 20.3, 23.5, 23.1, 18.4, 12.7, 6.8, 2.4,   # 2020
+            0.3, 1.9, 6.1, 11.0, 15.9, 20.1, 23.3, 22.9, 18.2, 12.5, 6.6, 2.2,   # 2021
+            0.4, 2.0, 6.2, 11.1, 16.0, 20.2, 23.4, 23.0, 18.3, 12.6, 6.7, 2.3,   # 2022
+            0.6, 2.2, 6.4, 11.3, 16.2, 20.4, 23.6, 23.2, 18.5, 12.8, 6.9, 2.5,   # 2023
+            0.7, 2.3, 6.5, 11.4, 16.3, 20.5, 23.7, 23.3, 18.6, 12.9, 7.0, 2.6,   # 2024
+            0.5, 2.1, 6.3, 11.2, 16.1, 20.3, 23.5, 23.1, 18.4, 12.7, 6.8, 2.4    # 2025 (tahmin)
+        ],
+        'Nem': [  # Eskişehir aylık ortalama nem oranı (%)
+            76, 73, 68, 63, 59, 55, 50, 50, 55, 65, 72, 77,  # 2020
+            75, 72, 67, 62, 58, 54, 49, 49, 54, 64, 71, 76,  # 2021
+            77, 74, 69, 64, 60, 56, 51, 51, 56, 66, 73, 78,  # 2022
+            76, 73, 68, 63, 59, 55, 50, 50, 55, 65, 72, 77,  # 2023
+            75, 72, 67, 62, 58, 54, 49, 49, 54, 64, 71, 76,  # 2024
+            76, 73, 68, 63, 59, 55, 50, 50, 55, 65, 72, 77   # 2025 (tahmin)
+        ],
+        'Guneslenme': [  # Günlük ortalama güneşlenme süresi (saat)
+            3, 4, 5, 7, 9, 11, 12, 11, 9, 6, 4, 3,  # 2020-2025 için tekrar
+        ] * 6
+    }
+
+    # Üniversite aktivite faktörleri
+    university_factors = {
+        'Donem_Aktivitesi': [  # Akademik dönem aktivite oranı (0-1 arası)
+            0.85, 0.90, 0.95, 0.95, 0.80, 0.40,  # Ocak-Haziran (Final ve yaz başlangıcı)
+            0.20, 0.20, 0.70, 0.95, 0.95, 0.70,  # Temmuz-Aralık (Yaz tatili ve dönem başlangıcı)
+        ] * 6,
+        
+        'Mesai_Saatleri': [  # Mesai saatleri yoğunluğu (0-1 arası)
+            0.80, 0.80, 0.85, 0.85, 0.85, 0.50,  # Ocak-Haziran
+            0.30, 0.30, 0.80, 0.85, 0.85, 0.70,  # Temmuz-Aralık
+        ] * 6,
+        
+        'Hafta_Sonu_Etkisi': [  # Hafta sonu düşüş faktörü (0-1 arası, 1: tam düşüş)
+            0.70, 0.70, 0.70, 0.70, 0.70, 0.90,  # Ocak-Haziran
+            0.95, 0.95, 0.70, 0.70, 0.70, 0.80,  # Temmuz-Aralık
+        ] * 6
+    }
+
+    # Tüm faktörleri tek bir DataFrame'de birleştirelim
+    df_exog = pd.DataFrame({
+        'Sicaklik': weather_factors['Sicaklik'],
+        'Nem': weather_factors['Nem'],
+        'Guneslenme': weather_factors['Guneslenme'],
+        'Donem_Aktivitesi': university_factors['Donem_Aktivitesi'],
+        'Mesai_Saatleri': university_factors['Mesai_Saatleri'],
+        'Hafta_Sonu_Etkisi': university_factors['Hafta_Sonu_Etkisi']
+    }, index=pd.date_range("2020-01-01", periods=72, freq='M'))
+    return df_exog
+
+
+def sarimax_fit(y_train, train_exog, order=VARSAYILAN_ORDER, seasonal_order=VARSAYILAN_SEASONAL_ORDER):
+    """
+    SARIMAX modelini eğitir. Süreç havuzunda çalıştırılabilmesi için modül düzeyindedir;
+    eğitilmiş sonuç nesnesi (SARIMAXResults) ve eğitim süresi döndürülür.
+    """
+    baslangic = time.perf_counter()
+    model = SARIMAX(
+        y_train,
+        order=order,
+        seasonal_order=seasonal_order,
+        exog=train_exog,
+        enforce_stationarity=False,
+        enforce_invertibility=False,
+        initialization='approximate_diffuse'
+    )
+    results = model.fit(disp=False)
+    return {'model': results, 'sure': time.perf_counter() - baslangic}
+
+
+def sarimax_tahmin(bina_adi, fit, forecast_exog, kaynak='egitim'):
+    """Eğitilmiş modelden eksojen veri uzunluğu kadar ileri tahmin ve model istatistiklerini üretir."""
+    results = fit['model']
+    forecast_obj = results.get_forecast(steps=len(forecast_exog), exog=forecast_exog)
+    try:
+        mse = results.mse
+    except Exception:
+        mse = None
+    return {
+        'bina': bina_adi,
+        'model': results,
+        'tahmin': forecast_obj.predicted_mean,
+        'guven_araligi': forecast_obj.conf_int(),
+        'aic': results.aic,
+        'bic': results.bic,
+        'mse': mse,
+        'sure': fit['sure'],
+        'kaynak': kaynak
+    }
+
+
+def sarimax_guncelle(fit, y_yeni, exog_yeni, sapma_esigi=0.10, maxiter=50):
+    """
+    Eğitilmiş modeli yeni gözlemlerle günceller. Önce mevcut parametrelerle yalnızca filtreleme
+    yapılır (append, refit=False). Yeni gözlemlerin tek adımlı tahmin hatası, tahmin edilen değere
+    oranla sapma_esigi'ni aşıyorsa parametreler kaymış kabul edilir ve önceki parametrelerden
+    başlatılan (warm-start) bir yeniden eğitim yapılır.
+
+    Returns:
+        dict: Güncel model, süre, güncelleme yöntemi ('filtre' veya 'isil_baslatma') ve en büyük göreli sapma.
+    """
+    baslangic = time.perf_counter()
+    results = fit['model']
+    n = len(y_yeni)
+
+    filtrelenmis = results.append(y_yeni, exog=exog_yeni, refit=False)
+    tahmin = filtrelenmis.forecasts[0, -n:]
+    hata = filtrelenmis.forecasts_error[0, -n:]
+    sapma = float(np.max(np.abs(hata) / np.maximum(np.abs(tahmin), 1e-9)))
+
+    if sapma > sapma_esigi:
+        # append(refit=True), önceki parametreleri başlangıç değeri olarak kullanır
+        guncel = results.append(y_yeni, exog=exog_yeni, refit=True,
+                                fit_kwargs={'disp': False, 'maxiter': maxiter})
+        yontem = 'isil_baslatma'
+    else:
+        guncel = filtrelenmis
+        yontem = 'filtre'
+
+    return {
+        'model': guncel,
+        'sure': time.perf_counter() - baslangic,
+        'guncelleme': yontem,
+        'sapma': sapma
+    }
+
+
+class ModelCache:
+    """
+    Eğitilmiş SARIMAX sonuçlarını bellekte ve diskte (pickle) saklayan önbellek. Anahtar; eğitim
+    serisinin, eksojen tablonun ve (order, seasonal_order) ayarlarının içerik özetidir.
+    """
+
+    def __init__(self, root=".cache/modeller"):
+        self.root = root
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._bellek = {}
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(self, y_train, train_exog, order, seasonal_order):
+        return input_hash(y_train, train_exog, order=order, seasonal_order=seasonal_order)
+
+    def _yol(self, anahtar):
+        return os.path.join(self.root, f"{anahtar}.pkl")
+
+    def get(self, anahtar):
+        """Önbellekteki eğitim sonucunu döndürür; yoksa None döner."""
+        if anahtar in self._bellek:
+            self.hits += 1
+            return self._bellek[anahtar]
+        try:
+            with open(self._yol(anahtar), 'rb') as f:
+                deger = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            self.misses += 1
+            return None
+        self._bellek[anahtar] = deger
+        self.hits += 1
+        self.disk_hits += 1
+        return deger
+
+    def peek(self, anahtar):
+        """İsabet/ıskalama sayaçlarını değiştirmeden önbellekteki değeri döndürür."""
+        if anahtar in self._bellek:
+            return self._bellek[anahtar]
+        try:
+            with open(self._yol(anahtar), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+
+    def put(self, anahtar, deger):
+        """Eğitim sonucunu belleğe ve (atomik olarak) diske yazar."""
+        self._bellek[anahtar] = deger
+        gecici = f"{self._yol(anahtar)}.tmp-{os.getpid()}"
+        with open(gecici, 'wb') as f:
+            pickle.dump(deger, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(gecici, self._yol(anahtar))
+
+    def stats(self):
+        return {
+            'bellekteki_model': len(self._bellek),
+            'isabet': self.hits,
+            'disk_isabeti': self.disk_hits,
+            'iskalama': self.misses
+        }
+
+
+def varsayilan_isci_sayisi():
+    """İşçi süreç üst sınırı: TAHMIN_ISCI_SAYISI ortam değişkeni veya işlemci sayısı."""
+    return int(os.environ.get("TAHMIN_ISCI_SAYISI", os.cpu_count() or 1))
+
+
+_havuz = None
+_havuz_isci_sayisi = 0
+_havuz_kilidi = threading.Lock()
+
+
+def _havuza_toplu_gonder(fonksiyon, arguman_listesi, isci_sayisi):
+    """
+    Görevleri modül genelindeki tek süreç havuzuna gönderir. Havuz Streamlit yeniden çalıştırmaları
+    arasında yeniden kullanılır; istenen işçi sayısı değişirse eski havuz kapatılır (kuyruktaki
+    görevleri bitince işçileri sonlanır) ve yenisi kurulur. Önceden bozulmuş havuz da yenilenir.
+    Gönderimler kilit altında yapıldığından başka bir oturum havuzu gönderimin ortasında değiştiremez.
+
+    Returns:
+        tuple: (görevlerin gönderildiği havuz, görev listesi)
+    """
+    global _havuz, _havuz_isci_sayisi
+    with _havuz_kilidi:
+        for deneme in range(2):
+            if _havuz is not None and _havuz_isci_sayisi != isci_sayisi:
+                _havuz.shutdown(wait=False)
+                _havuz = None
+            if _havuz is None:
+                _havuz = ProcessPoolExecutor(max_workers=isci_sayisi,
+                                             mp_context=multiprocessing.get_context("spawn"))
+                _havuz_isci_sayisi = isci_sayisi
+            try:
+                return _havuz, [_havuz.submit(fonksiyon, *argumanlar) for argumanlar in arguman_listesi]
+            except BrokenProcessPool:
+                _havuz.shutdown(wait=False, cancel_futures=True)
+                _havuz = None
+                if deneme:
+                    raise
+
+
+def _havuzu_birak(havuz):
+    """Çalışma sırasında bozulan havuzu kapatır; güncel havuzsa bir sonraki gönderimde yenisi kurulur."""
+    global _havuz
+    with _havuz_kilidi:
+        if _havuz is havuz:
+            _havuz = None
+    havuz.shutdown(wait=False, cancel_futures=True)
+
+
+def _paralel_calistir(fonksiyon, arguman_listesi, isci_sayisi):
+    """
+    Fonksiyonu her argüman demeti için süreç havuzunda çalıştırır; tek işçide süreç açılmaz.
+    Sonuçlar tamamlanma sırasına değil, argüman sırasına göre döndürülür.
+    """
+    if isci_sayisi <= 1:
+        return [fonksiyon(*argumanlar) for argumanlar in arguman_listesi]
+    havuz, gorevler = _havuza_toplu_gonder(fonksiyon, arguman_listesi, isci_sayisi)
+    try:
+        return [gorev.result() for gorev in gorevler]
+    except BrokenProcessPool:
+        _havuzu_birak(havuz)
+        raise
+
+
+def paralel_sarimax_fit(train_data, train_exog, forecast_exog, maks_isci=None,
+                        order=VARSAYILAN_ORDER, seasonal_order=VARSAYILAN_SEASONAL_ORDER, onbellek=None,
+                        maks_artim=12, mertebeler=None):
+    """
+    Her bina sütunu için SARIMAX modelini süreç havuzunda paralel eğitir. Önbellek verilirse
+    yalnızca önbellekte bulunmayan modeller eğitilir; önceki aylara ait modeli önbellekte olanlar
+    ise yeni aylarla artımlı olarak güncellenir. mertebeler ({bina: (order, seasonal_order)})
+    verilirse ilgili binalar kendi mertebeleriyle eğitilir.
+
+    Returns:
+        tuple: (sütun sırasıyla sonuç listesi, duvar saati süresi, kullanılan işçi sayısı)
+    """
+    baslangic = time.perf_counter()
+    mertebe = {bina: (mertebeler or {}).get(bina, (order, seasonal_order)) for bina in train_data.columns}
+    fitler = {}
+    anahtarlar = {}
+    if onbellek is not None:
+        for bina in train_data.columns:
+            anahtarlar[bina] = onbellek.key(train_data[bina], train_exog, *mertebe[bina])
+            fit = onbellek.get(anahtarlar[bina])
+            if fit is not None:
+                fitler[bina] = fit
+    # Önbellekte bulunmayan modeller için, serinin son maks_artim aya kadar kısaltılmış hali
+    # önbellekteyse model sıfırdan eğitilmez, yalnızca yeni aylarla güncellenir.
+    guncellenen = {}
+    if onbellek is not None:
+        for bina in train_data.columns:
+            if bina in fitler:
+                continue
+            for k in range(1, min(maks_artim, len(train_data) - 1) + 1):
+                onceki = onbellek.peek(onbellek.key(train_data[bina].iloc[:-k], train_exog.iloc[:-k],
+                                                    *mertebe[bina]))
+                if onceki is not None:
+                    fitler[bina] = sarimax_guncelle(onceki, train_data[bina].iloc[-k:], train_exog.iloc[-k:])
+                    onbellek.put(anahtarlar[bina], fitler[bina])
+                    guncellenen[bina] = fitler[bina]['guncelleme']
+                    break
+    eksikler = [bina for bina in train_data.columns if bina not in fitler]
+
+    isci_sayisi = max(1, min(maks_isci or varsayilan_isci_sayisi(), len(eksikler) or 1))
+    yeni = _paralel_calistir(sarimax_fit, [(train_data[bina], train_exog, *mertebe[bina]) for bina in eksikler],
+                             isci_sayisi)
+
+    for bina, fit in zip(eksikler, yeni):
+        fitler[bina] = fit
+        if onbellek is not None:
+            onbellek.put(anahtarlar[bina], fit)
+
+    sonuclar = []
+    for bina in train_data.columns:
+        if bina in guncellenen:
+            kaynak = guncellenen[bina]
+        elif bina in eksikler:
+            kaynak = 'egitim'
+        else:
+            kaynak = 'onbellek'
+        sonuclar.append(sarimax_tahmin(bina, fitler[bina], forecast_exog, kaynak=kaynak))
+    return sonuclar, time.perf_counter() - baslangic, isci_sayisi
+
+
+# Otomatik mertebe seçimi için varsayılan arama sınırları (her biri dahil üst sınır)
+VARSAYILAN_MERTEBE_SINIRLARI = {'p': 2, 'd': 1, 'q': 2, 'P': 1, 'D': 0, 'Q': 1}
+
+
+def mertebe_dene(y_train, train_exog, order, seasonal_order):
+    """
+    Tek bir mertebe adayını eğitir ve yalnızca AIC ile yakınsama bilgisini döndürür
+    (model nesnesi süreçler arasında taşınmaz).
+    """
+    baslangic = time.perf_counter()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = sarimax_fit(y_train, train_exog, order, seasonal_order)['model']
+        aic = float(results.aic)
+        yakinsadi = bool(results.mle_retvals.get('converged', True)) and np.isfinite(aic)
+    except (ValueError, np.linalg.LinAlgError):
+        aic, yakinsadi = np.inf, False
+    return {
+        'order': tuple(order),
+        'seasonal_order': tuple(seasonal_order),
+        'aic': aic,
+        'yakinsadi': yakinsadi,
+        'sure': time.perf_counter() - baslangic
+    }
+
+
+def _aday_parametre_sayisi(aday):
+    (p, _, q), (P, _, Q, _) = aday
+    return p + q + P + Q
+
+
+def mertebe_izgarasi(sinirlar=None, s=12):
+    """Sınırlar içindeki tüm ((p, d, q), (P, D, Q, s)) adaylarını parametre sayısına göre sıralı döndürür."""
+    sinirlar = {**VARSAYILAN_MERTEBE_SINIRLARI, **(sinirlar or {})}
+    adaylar = [
+        ((p, d, q), (P, D, Q, s))
+        for p in range(sinirlar['p'] + 1) for d in range(sinirlar['d'] + 1) for q in range(sinirlar['q'] + 1)
+        for P in range(sinirlar['P'] + 1) for D in range(sinirlar['D'] + 1) for Q in range(sinirlar['Q'] + 1)
+    ]
+    return sorted(adaylar, key=_aday_parametre_sayisi)
+
+
+def _ebeveynler(aday):
+    """Adaydan tek bir AR/MA parametresi eksiltilerek elde edilen daha basit adaylar."""
+    (p, d, q), (P, D, Q, s) = aday
+    return [((p - (i == 0), d, q - (i == 1)), (P - (i == 2), D, Q - (i == 3), s))
+            for i, deger in enumerate((p, q, P, Q)) if deger > 0]
+
+
+def otomatik_mertebe_secimi(train_data, train_exog, sinirlar=None, aic_esigi=10.0, maks_isci=None):
+    """
+    Her bina için sınırlı bir mertebe ızgarasını paralel olarak arar. Adaylar parametre sayısına
+    göre turlar halinde değerlendirilir: yakınsamayan adaylar ve AIC'si binanın o ana kadarki en
+    iyi AIC'sinden aic_esigi'nden fazla kötü olan adaylar budanır; budanan bir adaydan bir parametre
+    fazlasıyla türeyen adaylar ancak başka bir ebeveyni sağlamsa denenir.
+
+    Returns:
+        tuple: ({bina: en iyi aday sonucu}, tüm denemelerin tablosu)
+    """
+    izgara = mertebe_izgarasi(sinirlar)
+    isci_sayisi = max(1, maks_isci or varsayilan_isci_sayisi())
+    sonuclar = {bina: {} for bina in train_data.columns}   # bina -> aday -> sonuç
+    budanan = {bina: set() for bina in train_data.columns}
+
+    for k in sorted(set(map(_aday_parametre_sayisi, izgara))):
+        tur = []
+        for bina in train_data.columns:
+            en_iyi = min((r['aic'] for r in sonuclar[bina].values() if r['yakinsadi']), default=np.inf)
+            for aday in (a for a in izgara if _aday_parametre_sayisi(a) == k):
+                ebeveynler = [e for e in _ebeveynler(aday) if e in sonuclar[bina] or e in budanan[bina]]
+                saglam = [e for e in ebeveynler if e in sonuclar[bina] and sonuclar[bina][e]['yakinsadi']
+                          and sonuclar[bina][e]['aic'] <= en_iyi + aic_esigi]
+                if ebeveynler and not saglam:
+                    budanan[bina].add(aday)
+                else:
+                    tur.append((bina, aday))
+
+        denemeler = _paralel_calistir(
+            mertebe_dene, [(train_data[bina], train_exog, *aday) for bina, aday in tur], isci_sayisi
+        )
+        for (bina, aday), sonuc in zip(tur, denemeler):
+            sonuclar[bina][aday] = sonuc
+
+    secimler = {}
+    satirlar = []
+    for bina, denenen in sonuclar.items():
+        yakinsayan = [r for r in denenen.values() if r['yakinsadi']]
+        secimler[bina] = min(yakinsayan, key=lambda r: r['aic']) if yakinsayan else {
+            'order': VARSAYILAN_ORDER, 'seasonal_order': VARSAYILAN_SEASONAL_ORDER, 'aic': np.nan}
+        satirlar.extend({
+            'Bina': bina,
+            'Mertebe': f"{r['order']}{r['seasonal_order']}",
+            'AIC': r['aic'],
+            'Yakınsadı': r['yakinsadi'],
+            'Süre (s)': r['sure']
+        } for r in denenen.values())
+        satirlar.extend({'Bina': bina, 'Mertebe': f"{a[0]}{a[1]}", 'AIC': np.nan, 'Yakınsadı': None,
+                         'Süre (s)': 0.0} for a in budanan[bina])
+    return secimler, pd.DataFrame(satirlar)
+
+
+class OrderSelectionStore:
+    """
+    Bina başına seçilen SARIMAX mertebelerini JSON dosyasında saklar. Kayıt, eğitim verisinin ve
+    arama sınırlarının özetiyle birlikte tutulur; bunlar değişmedikçe arama tekrarlanmaz.
+    """
+
+    def __init__(self, yol=".cache/mertebe_secimleri.json"):
+        self.yol = yol
+        os.makedirs(os.path.dirname(self.yol) or ".", exist_ok=True)
+
+    def _oku(self):
+        try:
+            with open(self.yol, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def get(self, bina, veri_ozeti):
+        kayit = self._oku().get(bina)
+        if kayit is None or kayit['veri_ozeti'] != veri_ozeti:
+            return None
+        return tuple(kayit['order']), tuple(kayit['seasonal_order'])
+
+    def put(self, secimler):
+        """secimler: {bina: (veri_ozeti, order, seasonal_order, aic)}"""
+        kayitlar = self._oku()
+        for bina, (veri_ozeti, order, seasonal_order, aic) in secimler.items():
+            kayitlar[bina] = {
+                'veri_ozeti': veri_ozeti,
+                'order': list(order),
+                'seasonal_order': list(seasonal_order),
+                'aic': aic
+            }
+        gecici = f"{self.yol}.tmp-{os.getpid()}"
+        with open(gecici, 'w', encoding='utf-8') as f:
+            json.dump(kayitlar, f, ensure_ascii=False, indent=2)
+        os.replace(gecici, self.yol)
+
+
+def kayitli_mertebe_secimi(train_data, train_exog, depo, sinirlar=None, aic_esigi=10.0, maks_isci=None):
+    """
+    Kayıtlı seçimi geçerli olan binalar için aramayı atlar, diğerleri için otomatik seçimi
+    çalıştırıp sonucu depoya yazar.
+
+    Returns:
+        tuple: ({bina: (order, seasonal_order)}, arama tablosu veya None, aranan bina listesi)
+    """
+    sinirlar = {**VARSAYILAN_MERTEBE_SINIRLARI, **(sinirlar or {})}
+    ozetler = {bina: input_hash(train_data[bina], train_exog, sinirlar=sinirlar, aic_esigi=aic_esigi)
+               for bina in train_data.columns}
+    mertebeler = {}
+    for bina in train_data.columns:
+        kayit = depo.get(bina, ozetler[bina])
+        if kayit is not None:
+            mertebeler[bina] = kayit
+    aranacak = [bina for bina in train_data.columns if bina not in mertebeler]
+
+    tablo = None
+    if aranacak:
+        secimler, tablo = otomatik_mertebe_secimi(train_data[aranacak], train_exog, sinirlar, aic_esigi, maks_isci)
+        depo.put({bina: (ozetler[bina], r['order'], r['seasonal_order'], r['aic']) for bina, r in secimler.items()})
+        mertebeler.update({bina: (r['order'], r['seasonal_order']) for bina, r in secimler.items()})
+    return {bina: mertebeler[bina] for bina in train_data.columns}, tablo, aranacak
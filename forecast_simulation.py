@@ -0,0 +1,107 @@
+# forecast_simulation.py
+
+import numpy as np
+
+
+def artik_korelasyonu(modeller, atla=13):
+    """
+    Bina modellerinin bir adımlı tahmin hatalarından binalar arası korelasyon matrisini kestirir.
+    Yaklaşık yaygın (approximate diffuse) başlangıçtan etkilenen ilk 'atla' gözlem kullanılmaz;
+    matris, pozitif yarı tanımlı olacak şekilde özdeğerleri kırpılarak düzeltilir.
+    """
+    artiklar = np.column_stack([np.asarray(model.resid)[atla:] for model in modeller])
+    if artiklar.shape[0] < 3:
+        return np.eye(artiklar.shape[1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        korelasyon = np.corrcoef(artiklar, rowvar=False)
+    korelasyon = np.nan_to_num(np.atleast_2d(korelasyon))
+    np.fill_diagonal(korelasyon, 1.0)
+    ozdeger, ozvektor = np.linalg.eigh(korelasyon)
+    korelasyon = (ozvektor * np.clip(ozdeger, 1e-8, None)) @ ozvektor.T
+    olcek = np.sqrt(np.diag(korelasyon))
+    return korelasyon / np.outer(olcek, olcek)
+
+
+def korelasyonlu_soklar(korelasyon, ufuk, yol_sayisi, rng):
+    """Binalar arası korelasyonlu standart normal şoklar, şekil (ufuk, yol, bina)."""
+    L = np.linalg.cholesky(korelasyon)
+    return rng.standard_normal((ufuk, yol_sayisi, korelasyon.shape[0])) @ L.T
+
+
+def _zamandan_bagimsiz(matris):
+    """Durum-uzay sistem matrisini 2 boyutlu olarak döndürür (zamana bağlı olmayan modeller için)."""
+    matris = np.asarray(matris)
+    return matris[:, :, 0] if matris.ndim == 3 else matris
+
+
+def sarimax_yollari(model, forecast_exog, standart_soklar, rng):
+    """
+    Eğitilmiş SARIMAX modelinden gelecek yolları durum-uzay denklemleriyle, tüm yollar için aynı
+    anda simüle eder. Yollar ortalama tahmin ile sapma sürecinin toplamıdır:
+    e_{t+1} = T e_t + R η_t,  y_t - E[y_t] = Z e_t; e_n, filtrelenmiş durum kovaryansından çekilir.
+
+    Args:
+        model: SARIMAXResults.
+        standart_soklar (array): Standart normal durum şokları, şekil (ufuk, yol).
+
+    Returns:
+        ndarray: Simüle edilmiş yollar, şekil (ufuk, yol).
+    """
+    ufuk, yol_sayisi = standart_soklar.shape
+    ssm = model.model.ssm
+    T, R, Z, Q, H = (_zamandan_bagimsiz(ssm[ad]) for ad in ('transition', 'selection', 'design', 'state_cov', 'obs_cov'))
+    Q_kok = np.linalg.cholesky(Q)
+    H = float(H[0, 0])
+
+    ortalama = np.asarray(model.get_forecast(steps=ufuk, exog=forecast_exog).predicted_mean)
+
+    # Son gözlemdeki durum belirsizliği: P_{n|n} = V diag(w) Vᵀ
+    P = model.filter_results.filtered_state_cov[:, :, -1]
+    ozdeger, ozvektor = np.linalg.eigh((P + P.T) / 2)
+    sapma = rng.standard_normal((yol_sayisi, P.shape[0])) @ (ozvektor * np.sqrt(np.clip(ozdeger, 0, None))).T
+
+    # SARIMAX'ta tek durum şoku vardır (k_posdef = 1); bina şokları bu kanaldan verilir
+    yollar = np.empty((ufuk, yol_sayisi))
+    for h in range(ufuk):
+        sapma = sapma @ T.T + (standart_soklar[h][:, None] @ Q_kok.T) @ R.T
+        yollar[h] = ortalama[h] + sapma @ Z[0]
+    if H > 0:
+        yollar += np.sqrt(H) * rng.standard_normal(yollar.shape)
+    return yollar
+
+
+def kampus_yol_simulasyonu(modeller, forecast_exog, yol_sayisi=2000, seed=0, alt_sinir=0.0):
+    """
+    Tüm binalar için korelasyonlu gelecek yollarını simüle eder; kampüs toplamı yol yol
+    toplanarak binalar arası bağımlılığı koruyan toplam dağılımı elde edilir.
+
+    Returns:
+        dict: 'yollar' (ufuk, yol, bina), 'toplam' (ufuk, yol) ve kullanılan 'korelasyon' matrisi.
+    """
+    rng = np.random.default_rng(seed)
+    korelasyon = artik_korelasyonu(modeller)
+    soklar = korelasyonlu_soklar(korelasyon, len(forecast_exog), yol_sayisi, rng)
+    yollar = np.stack([sarimax_yollari(model, forecast_exog, soklar[:, :, b], rng)
+                       for b, model in enumerate(modeller)], axis=-1)
+    if alt_sinir is not None:
+        yollar = np.maximum(yollar, alt_sinir)
+    return {
+        'yollar': yollar,
+        'toplam': yollar.sum(axis=-1),
+        'korelasyon': korelasyon
+    }
+
+
+def yol_kantilleri(yollar, kantiller=(0.05, 0.5, 0.95)):
+    """Yol ekseni (1. eksen) üzerinden kantiller; şekil (kantil, ufuk, ...)."""
+    return np.quantile(yollar, kantiller, axis=1)
+
+
+def asim_olasiligi(yollar, esik):
+    """Her ufuk (ve bina) için yolların eşiği aşma olasılığı; esik, son eksenle yayınlanabilir."""
+    return (yollar > np.asarray(esik)).mean(axis=1)
+
+
+def donem_asim_olasiligi(yollar, esik):
+    """Ufuk boyunca en az bir kez eşiğin aşılma olasılığı (yol başına herhangi bir aşım)."""
+    return (yollar > np.asarray(esik)).any(axis=0).mean(axis=0)
@@ -0,0 +1,174 @@
+# hierarchical_forecast.py
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from fast_forecast import hizli_model_calistir
+
+# ESOGÜ bina tiplerinin kampüs hiyerarşisindeki kategorileri
+BINA_KATEGORILERI = {
+    "Fakülteler": "Akademik Birimler",
+    "Araştırma ve Uygulama Merkezleri": "Akademik Birimler",
+    "Sağlık Tesisleri": "Sağlık Tesisleri",
+    "Helikopter Pisti": "Sağlık Tesisleri",
+    "Kültürel ve Sosyal Alanlar": "Sosyal ve Destek Tesisleri",
+    "Spor Alanları": "Sosyal ve Destek Tesisleri",
+    "Yemek ve Konaklama": "Sosyal ve Destek Tesisleri",
+    "Park ve Açık Alanlar": "Sosyal ve Destek Tesisleri"
+}
+
+UZLASTIRMA_YONTEMLERI = {
+    'ols': 'OLS',
+    'wls': 'WLS (Varyans)',
+    'mint': 'MinT (Daraltma)'
+}
+
+
+def hiyerarsi_olustur(yaprak_kategorileri, kampus_adi="Kampüs"):
+    """
+    Bina → kategori → kampüs hiyerarşisinin seyrek toplama matrisini kurar.
+
+    Args:
+        yaprak_kategorileri (dict): {yaprak seri: kategori}
+
+    Returns:
+        dict: Düğüm adları ve seviyeleri, (düğüm × yaprak) toplama matrisi 'S' ve
+        (toplam düğüm × düğüm) tutarlılık kısıt matrisi 'C' = [I, -A]; tutarlı tahminler için C y = 0.
+    """
+    yapraklar = list(yaprak_kategorileri)
+    kategoriler = sorted(set(yaprak_kategorileri.values()))
+    kategori_indeksi = {k: i for i, k in enumerate(kategoriler)}
+    n = len(yapraklar)
+
+    kategori_yaprak = sparse.csr_matrix(
+        (np.ones(n), ([kategori_indeksi[yaprak_kategorileri[y]] for y in yapraklar], np.arange(n))),
+        shape=(len(kategoriler), n)
+    )
+    # Toplam düğümler (kampüs + kategoriler) üstte, yapraklar altta
+    A = sparse.vstack([sparse.csr_matrix(np.ones((1, n))), kategori_yaprak]).tocsr()
+    a = A.shape[0]
+
+    return {
+        'yapraklar': yapraklar,
+        'kategoriler': kategoriler,
+        'dugumler': [kampus_adi] + kategoriler + yapraklar,
+        'seviyeler': ['Kampüs'] + ['Kategori'] * len(kategoriler) + ['Bina'] * n,
+        'S': sparse.vstack([A, sparse.identity(n, format='csr')]).tocsr(),
+        'C': sparse.hstack([sparse.identity(a, format='csr'), -A]).tocsr()
+    }
+
+
+def daraltma_katsayisi(artiklar):
+    """
+    Artık kovaryansı için Schäfer-Strimmer daraltma (shrinkage) katsayısı. Çift başına korelasyon
+    matrisi kurulmaz; gerekli toplamlar (zaman × zaman) Gram matrisinden hesaplanır, bu nedenle
+    maliyet seri sayısıyla doğrusal büyür.
+    """
+    T = artiklar.shape[0]
+    std = artiklar.std(axis=0, ddof=1)
+    Z = (artiklar - artiklar.mean(axis=0)) / np.where(std > 0, std, 1.0)
+
+    kare = Z ** 2
+    # Σ_{i≠j} Σ_t (z_ti z_tj)² ve Σ_{i≠j} w̄_ij², w̄_ij = (1/T) Σ_t z_ti z_tj
+    w_kare_toplami = (kare.sum(axis=1) ** 2).sum() - (kare ** 2).sum()
+    gram = Z @ Z.T
+    w_ort_kare_toplami = ((gram ** 2).sum() - (kare.sum(axis=0) ** 2).sum()) / T ** 2
+
+    varyans = T / (T - 1) ** 3 * (w_kare_toplami - T * w_ort_kare_toplami)
+    korelasyon_karesi = (T / (T - 1)) ** 2 * w_ort_kare_toplami
+    if korelasyon_karesi <= 0:
+        return 1.0
+    return float(np.clip(varyans / korelasyon_karesi, 0.0, 1.0))
+
+
+def uzlastir(taban_tahmin, hiyerarsi, yontem='mint', artiklar=None):
+    """
+    Taban tahminleri hiyerarşiyle tutarlı hale getirir. Tüm yöntemler genelleştirilmiş en küçük
+    kareler izdüşümüdür: ỹ = ŷ - W Cᵀ (C W Cᵀ)⁻¹ C ŷ. Çözülen sistem yalnızca toplam düğüm
+    sayısı boyutundadır; MinT için W = λ D + (1 - λ) EᵀE / T kovaryansı hiç oluşturulmaz,
+    W Cᵀ çarpımı artık matrisi üzerinden düşük ranklı olarak hesaplanır.
+
+    Args:
+        taban_tahmin (array): Düğüm tahminleri, şekil (düğüm, ufuk).
+        yontem (str): 'ols' (W = I), 'wls' (W = artık varyansları) veya 'mint' (daraltılmış kovaryans).
+        artiklar (array): Bir adımlı artıklar, şekil (zaman, düğüm); 'wls' ve 'mint' için gereklidir.
+
+    Returns:
+        tuple: (uzlaştırılmış tahminler (düğüm, ufuk), MinT daraltma katsayısı veya None)
+    """
+    C = hiyerarsi['C']
+    y = np.asarray(taban_tahmin, dtype=float)
+    Ct = C.T.toarray()
+    lam = None
+
+    if yontem == 'ols':
+        WCt = Ct
+    else:
+        if artiklar is None:
+            raise ValueError(f"'{yontem}' uzlaştırması için artıklar gerekir")
+        E = np.asarray(artiklar, dtype=float)
+        d = np.maximum((E ** 2).mean(axis=0), 1e-12)
+        if yontem == 'wls':
+            WCt = d[:, None] * Ct
+        elif yontem == 'mint':
+            lam = daraltma_katsayisi(E)
+            WCt = lam * d[:, None] * Ct + (1 - lam) * (E.T @ (E @ Ct)) / E.shape[0]
+        else:
+            raise ValueError(f"Bilinmeyen uzlaştırma yöntemi: {yontem}")
+
+    duzeltme = WCt @ np.linalg.solve(C @ WCt, C @ y)
+    return y - duzeltme, lam
+
+
+def hiyerarsik_tahmin(df_yapraklar, yaprak_kategorileri=None, ufuk=12, model='holt_winters', yontem='mint',
+                      train_exog=None, forecast_exog=None, zaman=None):
+    """
+    Tüm hiyerarşi düğümleri (yapraklar, kategoriler, kampüs) için taban tahminleri tek bir
+    vektörel hızlı model çağrısıyla üretir ve seçilen yöntemle uzlaştırır.
+
+    Args:
+        df_yapraklar (DataFrame): Yaprak serileri (zaman × yaprak).
+        yaprak_kategorileri (dict): {yaprak: kategori}; verilmezse BINA_KATEGORILERI kullanılır.
+        zaman (Index): Tahmin dönemi indeksi.
+
+    Returns:
+        dict: Taban ve uzlaştırılmış tahmin tabloları (zaman × (seviye, düğüm)), düğüm özeti, taban tahminlerin
+        en büyük tutarsızlığı, MinT daraltma katsayısı ve süre.
+    """
+    baslangic = time.perf_counter()
+    hiyerarsi = hiyerarsi_olustur(yaprak_kategorileri or BINA_KATEGORILERI)
+    Y = df_yapraklar[hiyerarsi['yapraklar']].to_numpy(dtype=float)
+    Y_tum = (hiyerarsi['S'] @ Y.T).T                                    # (zaman, düğüm)
+
+    taban = hizli_model_calistir(model, Y_tum, ufuk, train_exog, forecast_exog)
+    uzlasik, lam = uzlastir(taban['tahmin'].T, hiyerarsi, yontem, taban['artik'])
+    tutarsizlik = np.abs(hiyerarsi['C'] @ taban['tahmin'].T).max()
+
+    if zaman is None:
+        zaman = pd.RangeIndex(ufuk)
+    # Kategori ve bina adları çakışabileceğinden sütunlar (seviye, düğüm) çiftleridir
+    sutunlar = pd.MultiIndex.from_arrays([hiyerarsi['seviyeler'], hiyerarsi['dugumler']], names=['Seviye', 'Düğüm'])
+    taban_tablosu = pd.DataFrame(taban['tahmin'], index=zaman, columns=sutunlar)
+    uzlasik_tablosu = pd.DataFrame(uzlasik.T, index=zaman, columns=sutunlar)
+    taban_toplam = taban_tablosu.sum().to_numpy()
+    uzlasik_toplam = uzlasik_tablosu.sum().to_numpy()
+    ozet = pd.DataFrame({
+        'Seviye': hiyerarsi['seviyeler'],
+        'Düğüm': hiyerarsi['dugumler'],
+        'Taban Tahmin (kWh)': taban_toplam,
+        'Uzlaştırılmış Tahmin (kWh)': uzlasik_toplam,
+        'Düzeltme (%)': np.divide(uzlasik_toplam - taban_toplam, np.abs(taban_toplam),
+                                  out=np.zeros_like(taban_toplam), where=taban_toplam != 0) * 100
+    })
+
+    return {
+        'taban': taban_tablosu,
+        'uzlastirilmis': uzlasik_tablosu,
+        'ozet': ozet,
+        'tutarsizlik': float(tutarsizlik),
+        'daraltma': lam,
+        'sure': time.perf_counter() - baslangic
+    }
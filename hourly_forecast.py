@@ -0,0 +1,221 @@
+# hourly_forecast.py
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from statsmodels.tsa.arima_process import arma2ma
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from forecast_models import _paralel_calistir, varsayilan_isci_sayisi
+from load_profiles import saatlik_sicaklik, yuk_profilleri
+
+# Saatlik serilerdeki mevsimsellik dönemleri (saat) ve her biri için Fourier terimi sayısı
+SAATLIK_DONEMLER = (24.0, 168.0, 8766.0)
+FOURIER_TERIM_SAYILARI = (6, 12, 3)
+
+# Fourier terimlerinin fazı için sabit başlangıç; eğitim ve tahmin dönemleri aynı fazı paylaşır
+REFERANS_ZAMAN = pd.Timestamp("2020-01-01")
+
+# Isıtma/soğutma derece-saat eşikleri (°C)
+ISITMA_ESIGI = 18.0
+SOGUTMA_ESIGI = 24.0
+
+
+def fourier_frekanslari(donemler=SAATLIK_DONEMLER, terim_sayilari=FOURIER_TERIM_SAYILARI):
+    """
+    Dönem başına 1..k harmoniklerinin frekansları (1/saat). Haftalık dönemin 7'nin katı
+    harmonikleri günlük harmoniklerle aynı olduğundan tekrarlar atılır.
+    """
+    return np.unique(np.round(np.concatenate([
+        np.arange(1, k + 1) / donem for donem, k in zip(donemler, terim_sayilari)
+    ]), 12))
+
+
+def fourier_parcalari(zaman, donemler=SAATLIK_DONEMLER, terim_sayilari=FOURIER_TERIM_SAYILARI,
+                      parca_boyutu=8760, dtype=np.float64):
+    """
+    Çoklu mevsimsellik için sin/cos Fourier terimlerini parça parça üretir; bellekte aynı anda
+    yalnızca bir parça (parca_boyutu × terim) tutulur.
+
+    Yields:
+        tuple: (satır dilimi, parça matrisi)
+    """
+    saat = np.asarray((pd.DatetimeIndex(zaman) - REFERANS_ZAMAN) / pd.Timedelta(hours=1), dtype=float)
+    frekanslar = 2 * np.pi * fourier_frekanslari(donemler, terim_sayilari)
+    for baslangic in range(0, len(saat), parca_boyutu):
+        dilim = slice(baslangic, min(baslangic + parca_boyutu, len(saat)))
+        aci = np.multiply.outer(saat[dilim], frekanslar)
+        yield dilim, np.hstack([np.sin(aci), np.cos(aci)]).astype(dtype, copy=False)
+
+
+def fourier_terimleri(zaman, donemler=SAATLIK_DONEMLER, terim_sayilari=FOURIER_TERIM_SAYILARI,
+                      parca_boyutu=8760, cikti=None):
+    """
+    Fourier terim matrisini parçalar halinde önceden ayrılmış diziye (veya np.memmap'e) yazar.
+
+    Returns:
+        ndarray: (zaman, 2 × tekil frekans sayısı)
+    """
+    if cikti is None:
+        cikti = np.empty((len(zaman), 2 * len(fourier_frekanslari(donemler, terim_sayilari))))
+    for dilim, parca in fourier_parcalari(zaman, donemler, terim_sayilari, parca_boyutu, cikti.dtype):
+        cikti[dilim] = parca
+    return cikti
+
+
+def derece_saat_eksojenleri(aylik_sicaklik, zaman):
+    """
+    Aylık ortalama sıcaklık serisinden (ay sonu indeksli) saatlik ısıtma ve soğutma derece-saat
+    sütunlarını üretir; her yıl kendi 12 aylık sıcaklıklarıyla enterpole edilir.
+    """
+    zaman = pd.DatetimeIndex(zaman)
+    sicaklik = np.empty(len(zaman))
+    for yil in np.unique(zaman.year):
+        maske = zaman.year == yil
+        aylik = aylik_sicaklik[aylik_sicaklik.index.year == yil]
+        if len(aylik) != 12:
+            # Sıcaklık verisi olmayan yıllar için son tam yılın değerleri kullanılır
+            aylik = aylik_sicaklik.iloc[-12:]
+        sicaklik[maske] = saatlik_sicaklik(aylik.to_numpy(), zaman[maske])
+    return np.column_stack([np.clip(ISITMA_ESIGI - sicaklik, 0, None), np.clip(sicaklik - SOGUTMA_ESIGI, 0, None)])
+
+
+def _tasarim_parcalari(zaman, ek_eksojen, donemler, terim_sayilari, parca_boyutu):
+    """Sabit terim + Fourier terimleri + ek eksojenlerden oluşan tasarım matrisini parça parça üretir."""
+    for dilim, parca in fourier_parcalari(zaman, donemler, terim_sayilari, parca_boyutu):
+        sutunlar = [np.ones((parca.shape[0], 1)), parca]
+        if ek_eksojen is not None:
+            sutunlar.append(np.asarray(ek_eksojen[dilim], dtype=float).reshape(parca.shape[0], -1))
+        yield dilim, np.hstack(sutunlar)
+
+
+def saatlik_model_fit(y, zaman, ek_eksojen=None, order=(2, 0, 1), donemler=SAATLIK_DONEMLER,
+                      terim_sayilari=FOURIER_TERIM_SAYILARI, dusuk_bellek=True, parca_boyutu=8760, maxiter=50):
+    """
+    Uzun saatlik seriler için iki aşamalı dinamik harmonik regresyon:
+    1) Sabit terim, Fourier terimleri ve ek eksojenler üzerine en küçük kareler; normal denklemler
+       tasarım matrisi parça parça üretilerek biriktirilir, tam matris bellekte tutulmaz.
+    2) Regresyon artıklarına mevsimsel bileşensiz ARMA (SARIMAX) modeli; ölçek parametresi
+       olabilirlikten çıkarılır (concentrate_scale) ve dusuk_bellek ile Kalman filtresi yalnızca
+       tahmin için gereken son durumu saklar.
+
+    Args:
+        y (array): Saatlik tüketim (kWh).
+        zaman (DatetimeIndex): Gözlem zamanları.
+        ek_eksojen (array): İsteğe bağlı ek açıklayıcılar, şekil (zaman, sütun).
+
+    Returns:
+        dict: Regresyon katsayıları, ARMA sonuç nesnesi, model ayarları ve süreler.
+    """
+    baslangic = time.perf_counter()
+    y = np.asarray(y, dtype=float)
+
+    XtX = None
+    Xty = None
+    for dilim, X in _tasarim_parcalari(zaman, ek_eksojen, donemler, terim_sayilari, parca_boyutu):
+        XtX = X.T @ X if XtX is None else XtX + X.T @ X
+        Xty = X.T @ y[dilim] if Xty is None else Xty + X.T @ y[dilim]
+    beta = np.linalg.lstsq(XtX, Xty, rcond=None)[0]
+
+    artik = np.empty_like(y)
+    for dilim, X in _tasarim_parcalari(zaman, ek_eksojen, donemler, terim_sayilari, parca_boyutu):
+        artik[dilim] = y[dilim] - X @ beta
+    regresyon_suresi = time.perf_counter() - baslangic
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        arma = SARIMAX(artik, order=order, concentrate_scale=True).fit(
+            disp=False, low_memory=dusuk_bellek, method='lbfgs', maxiter=maxiter
+        )
+
+    return {
+        'beta': beta,
+        'arma': arma,
+        'order': order,
+        'donemler': donemler,
+        'terim_sayilari': terim_sayilari,
+        'gozlem': len(y),
+        'artik_std': float(artik.std()),
+        'regresyon_suresi': regresyon_suresi,
+        'sure': time.perf_counter() - baslangic
+    }
+
+
+def saatlik_tahmin(fit, gelecek_zaman, ek_eksojen=None, alpha=0.05, parca_boyutu=8760):
+    """
+    Eğitilmiş saatlik modelden tahmin üretir: Fourier/eksojen regresyonu ile ARMA artık tahmininin
+    toplamı. Güven aralığı ARMA tahmin varyansından gelir.
+
+    Returns:
+        DataFrame: 'Tahmin (kWh)', 'Alt (kWh)' ve 'Üst (kWh)' sütunları.
+    """
+    gelecek_zaman = pd.DatetimeIndex(gelecek_zaman)
+    regresyon = np.empty(len(gelecek_zaman))
+    for dilim, X in _tasarim_parcalari(gelecek_zaman, ek_eksojen, fit['donemler'], fit['terim_sayilari'],
+                                       parca_boyutu):
+        regresyon[dilim] = X @ fit['beta']
+
+    arma = fit['arma']
+    ortalama = regresyon + np.asarray(arma.forecast(steps=len(gelecek_zaman)))
+    # Düşük bellek modunda filtre tahmin kovaryanslarını saklamadığından tahmin varyansı
+    # ARMA'nın MA(∞) ağırlıklarından hesaplanır: σ² Σ_{j<h} ψ_j²
+    psi = arma2ma(np.r_[1, -arma.arparams], np.r_[1, arma.maparams], lags=len(gelecek_zaman))
+    std = np.sqrt(arma.scale * np.cumsum(psi ** 2))
+    z = norm.ppf(1 - alpha / 2)
+    return pd.DataFrame({
+        'Tahmin (kWh)': ortalama,
+        'Alt (kWh)': ortalama - z * std,
+        'Üst (kWh)': ortalama + z * std
+    }, index=gelecek_zaman)
+
+
+def saatlik_modeller_fit(df_saatlik, ek_eksojen=None, maks_isci=None, **fit_parametreleri):
+    """
+    Saatlik tüketim tablosundaki (zaman × bina) her bina için saatlik modeli süreç havuzunda eğitir.
+
+    Returns:
+        tuple: (sütun sırasıyla fit listesi, duvar saati süresi)
+    """
+    baslangic = time.perf_counter()
+    isci_sayisi = max(1, min(maks_isci or varsayilan_isci_sayisi(), df_saatlik.shape[1]))
+    fitler = _paralel_calistir(
+        saatlik_fit_calistir,
+        [(df_saatlik[bina].to_numpy(), df_saatlik.index, ek_eksojen, fit_parametreleri) for bina in df_saatlik],
+        isci_sayisi
+    )
+    return fitler, time.perf_counter() - baslangic
+
+
+def saatlik_fit_calistir(y, zaman, ek_eksojen, fit_parametreleri):
+    """saatlik_model_fit için süreç havuzu işçisi."""
+    return saatlik_model_fit(y, zaman, ek_eksojen, **fit_parametreleri)
+
+
+def ornek_saatlik_tuketim(bina_tipi, yillik_enerji, aylik_sicaklik, baslangic_yili=2020, yil_sayisi=5,
+                          yillik_artis=0.02, gurultu=0.08, seed=0):
+    """
+    Sayaç verisi olmayan binalar için yük profili şablonlarından çok yıllık saatlik tüketim
+    serisi üretir: yıllık artış, o yılın sıcaklıkları ve AR(1) çarpımsal gürültü uygulanır.
+    Şablonlar 8760 saatliktir; artık yıllarda eksik kalan son gün bir hafta önceki aynı saatlerle
+    doldurulur, böylece seri takvimde boşluksuz saatlik kalır.
+    """
+    rng = np.random.default_rng(seed)
+    parcalar = []
+    for i, yil in enumerate(range(baslangic_yili, baslangic_yili + yil_sayisi)):
+        aylik = aylik_sicaklik[aylik_sicaklik.index.year == yil]
+        sicakliklar = aylik.to_numpy() if len(aylik) == 12 else None
+        sablon = yuk_profilleri([bina_tipi], [yillik_enerji * (1 + yillik_artis) ** i], sicakliklar, yil)[0]
+        takvim = pd.date_range(f"{yil}-01-01", f"{yil}-12-31 23:00", freq='h')
+        yillik = pd.Series(sablon, index=takvim[:len(sablon)]).reindex(takvim)
+        parcalar.append(yillik.fillna(yillik.shift(7 * 24)))
+
+    profil = pd.concat(parcalar)
+    sok = rng.normal(0, gurultu * np.sqrt(1 - 0.9 ** 2), len(profil))
+    ar = np.empty_like(sok)
+    ar[0] = sok[0]
+    for t in range(1, len(sok)):
+        ar[t] = 0.9 * ar[t - 1] + sok[t]
+    return (profil * (1 + ar)).rename(bina_tipi)
@@ -0,0 +1,9 @@
+# isci_girisi.py
+
+"""
+spawn işçi süreçlerinin giriş modülü. Streamlit panoyu __main__ olarak çalıştırdığından, spawn
+varsayılan olarak her işçide pano betiğini yeniden yürütür. app.py, __spec__ değişkenini bu
+modüle yönlendirir; işçiler böylece panoyu değil bu boş modülü __main__ olarak içe aktarır.
+İşçi fonksiyonları (forecast_models, forecast_jobs, backtesting, ...) kendi modüllerinden
+yüklenir ve __main__'e ihtiyaç duymaz.
+"""
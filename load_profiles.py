@@ -0,0 +1,167 @@
+# load_profiles.py
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from solar_panel_analysis import hourly_time_index
+
+# Şablonlar değiştiğinde artırılmalıdır; önbellek anahtarının parçasıdır.
+SABLON_SURUMU = 1
+
+
+def _gun_sablonu(taban, *bloklar):
+    """Taban yük üzerine [başlangıç, bitiş) saat bloklarında verilen yük oranlarını yerleştirir."""
+    profil = np.full(24, float(taban))
+    for baslangic, bitis, oran in bloklar:
+        saatler = np.arange(baslangic, bitis) % 24
+        profil[saatler] = oran
+    return profil
+
+
+# Akademik takvim çarpanları (Ocak ... Aralık): Şubat ara tatili, Temmuz-Ağustos yaz tatili
+AKADEMIK_DONEM = np.array([0.90, 0.70, 1.00, 1.00, 1.00, 0.85, 0.45, 0.40, 0.85, 1.00, 1.00, 1.00])
+SABIT_DONEM = np.ones(12)
+
+# Her şablon: hafta içi / hafta sonu 24 saatlik göreli yük, aylık dönem çarpanı ve
+# sıcaklık hassasiyeti (18 °C altı ısıtma, 24 °C üstü soğutma; derece başına göreli artış).
+YUK_SABLONLARI = {
+    'akademik': {
+        'hafta_ici': _gun_sablonu(0.25, (7, 8, 0.6), (8, 18, 1.0), (18, 21, 0.5)),
+        'hafta_sonu': _gun_sablonu(0.25, (9, 17, 0.35)),
+        'donem': AKADEMIK_DONEM,
+        'isitma': 0.030,
+        'sogutma': 0.040
+    },
+    'sosyal': {
+        'hafta_ici': _gun_sablonu(0.20, (10, 17, 0.6), (17, 23, 1.0)),
+        'hafta_sonu': _gun_sablonu(0.20, (11, 23, 0.9)),
+        'donem': 0.5 + 0.5 * AKADEMIK_DONEM,
+        'isitma': 0.025,
+        'sogutma': 0.035
+    },
+    'saglik': {
+        'hafta_ici': _gun_sablonu(0.70, (8, 20, 1.0)),
+        'hafta_sonu': _gun_sablonu(0.70, (8, 20, 0.85)),
+        'donem': SABIT_DONEM,
+        'isitma': 0.020,
+        'sogutma': 0.030
+    },
+    'spor': {
+        'hafta_ici': _gun_sablonu(0.15, (9, 16, 0.5), (16, 23, 1.0)),
+        'hafta_sonu': _gun_sablonu(0.15, (9, 22, 0.9)),
+        'donem': 0.3 + 0.7 * AKADEMIK_DONEM,
+        'isitma': 0.020,
+        'sogutma': 0.020
+    },
+    'yemek': {
+        'hafta_ici': _gun_sablonu(0.30, (6, 9, 0.8), (11, 14, 1.0), (17, 20, 0.9)),
+        'hafta_sonu': _gun_sablonu(0.30, (8, 10, 0.6), (12, 14, 0.7), (18, 20, 0.6)),
+        'donem': 0.4 + 0.6 * AKADEMIK_DONEM,
+        'isitma': 0.015,
+        'sogutma': 0.025
+    },
+    'dis_aydinlatma': {
+        'hafta_ici': _gun_sablonu(0.05, (18, 30, 1.0)),
+        'hafta_sonu': _gun_sablonu(0.05, (18, 30, 1.0)),
+        'donem': SABIT_DONEM,
+        'isitma': 0.0,
+        'sogutma': 0.0
+    },
+    'sabit': {
+        'hafta_ici': np.ones(24),
+        'hafta_sonu': np.ones(24),
+        'donem': SABIT_DONEM,
+        'isitma': 0.0,
+        'sogutma': 0.0
+    }
+}
+
+# Bina tiplerinin şablon eşlemesi; listede olmayan tipler için 'sabit' şablonu kullanılır.
+BINA_TIPI_SABLONLARI = {
+    "Fakülteler": 'akademik',
+    "Kültürel ve Sosyal Alanlar": 'sosyal',
+    "Sağlık Tesisleri": 'saglik',
+    "Araştırma ve Uygulama Merkezleri": 'akademik',
+    "Spor Alanları": 'spor',
+    "Yemek ve Konaklama": 'yemek',
+    "Park ve Açık Alanlar": 'dis_aydinlatma',
+    "Helikopter Pisti": 'dis_aydinlatma'
+}
+
+
+def saatlik_sicaklik(aylik_sicakliklar, zaman, gunluk_genlik=5.0):
+    """
+    Aylık ortalama sıcaklıkları ay ortaları arasında doğrusal enterpolasyonla günlere yayar ve
+    15:00'te en yüksek olan günlük sinüs salınımı ekler.
+    """
+    ay_ortasi = pd.DatetimeIndex([f"{zaman[0].year}-{ay:02d}-15" for ay in range(1, 13)]).dayofyear.values
+    gun = zaman.dayofyear.values + zaman.hour.values / 24
+    # Yıl sonu ile başı arasında süreklilik için diziyi her iki uçta bir ay uzat
+    xp = np.r_[ay_ortasi[-1] - 365, ay_ortasi, ay_ortasi[0] + 365]
+    sicaklik = np.asarray(aylik_sicakliklar, dtype=float)
+    fp = np.r_[sicaklik[-1], sicaklik, sicaklik[0]]
+    return np.interp(gun, xp, fp) + gunluk_genlik * np.cos(2 * np.pi * (zaman.hour.values - 15) / 24)
+
+
+@lru_cache(maxsize=32)
+def _birim_profiller(sablon_adlari, aylik_sicakliklar, yil, surum):
+    """
+    Şablon adları için toplamı 1 olan (tip × saat) profil matrisini üretir.
+    surum argümanı yalnızca önbellek anahtarı olarak kullanılır.
+    """
+    zaman = hourly_time_index(yil)
+    saat = zaman.hour.values
+    ay = zaman.month.values - 1
+    hafta_sonu = zaman.dayofweek.values >= 5
+
+    sablonlar = [YUK_SABLONLARI[ad] for ad in sablon_adlari]
+    hafta_ici = np.stack([s['hafta_ici'] for s in sablonlar])
+    hafta_sonu_yuk = np.stack([s['hafta_sonu'] for s in sablonlar])
+    donem = np.stack([s['donem'] for s in sablonlar])
+    isitma = np.array([s['isitma'] for s in sablonlar])[:, None]
+    sogutma = np.array([s['sogutma'] for s in sablonlar])[:, None]
+
+    profil = np.where(hafta_sonu, hafta_sonu_yuk[:, saat], hafta_ici[:, saat]) * donem[:, ay]
+    if aylik_sicakliklar is not None:
+        sicaklik = saatlik_sicaklik(aylik_sicakliklar, zaman)
+        profil *= 1 + isitma * np.clip(18 - sicaklik, 0, None) + sogutma * np.clip(sicaklik - 24, 0, None)
+
+    profil /= profil.sum(axis=1, keepdims=True)
+    profil.setflags(write=False)
+    return profil
+
+
+def yuk_profilleri(bina_tipleri, yillik_enerjiler, aylik_sicakliklar=None, yil=2025):
+    """
+    Her bina tipinin yıllık enerjisini hafta içi/hafta sonu, dönem ve sıcaklık etkili
+    8760 saatlik yük profiline (kWh) dağıtır.
+
+    Args:
+        bina_tipleri (list): Bina tipi adları.
+        yillik_enerjiler (array): Tip başına toplam yıllık enerji (kWh).
+        aylik_sicakliklar (list): 12 aylık ortalama sıcaklık (°C); verilmezse sıcaklık etkisi uygulanmaz.
+
+    Returns:
+        ndarray: (tip sayısı, 8760) saatlik enerji matrisi; her satırın toplamı yıllık enerjiye eşittir.
+    """
+    sablon_adlari = tuple(BINA_TIPI_SABLONLARI.get(tip, 'sabit') for tip in bina_tipleri)
+    sicakliklar = None if aylik_sicakliklar is None else tuple(float(t) for t in aylik_sicakliklar)
+    birim = _birim_profiller(sablon_adlari, sicakliklar, yil, SABLON_SURUMU)
+    return birim * np.asarray(yillik_enerjiler, dtype=float)[:, None]
+
+
+def yuk_profili_ozeti(bina_tipleri, profiller, yil=2025):
+    """Profil matrisinden tip başına ortalama/tepe yük ve yük faktörü tablosunu oluşturur."""
+    zaman = hourly_time_index(yil)
+    ortalama = profiller.mean(axis=1)
+    tepe = profiller.max(axis=1)
+    return pd.DataFrame({
+        'Bina Tipi': list(bina_tipleri),
+        'Yıllık Enerji (kWh)': profiller.sum(axis=1),
+        'Ortalama Yük (kW)': ortalama,
+        'Tepe Yük (kW)': tepe,
+        'Tepe Zamanı': zaman[profiller.argmax(axis=1)],
+        'Yük Faktörü': np.divide(ortalama, tepe, out=np.zeros_like(tepe), where=tepe > 0)
+    })
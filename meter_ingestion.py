@@ -0,0 +1,330 @@
+# meter_ingestion.py
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Girdi dosyasındaki sütunların iç adları
+SAYAC_SUTUNLARI = {
+    'sayac': 'sayac_id',
+    'bina': 'bina',
+    'zaman': 'zaman',
+    'enerji': 'tuketim_kwh'
+}
+
+# Bir okuma için kabul edilen en yüksek enerji (kWh / 15 dk); üstü hatalı kabul edilir
+MAKS_OKUMA_KWH = 10_000
+
+# Aylık toplamın model verisine aktarılması için ayın saatlerinin en az bu oranında okuma olmalıdır
+MIN_AY_KAPSAMASI = 0.95
+
+
+def _dosya_ozeti(kaynak, blok=1 << 20):
+    """Dosya içeriğinin SHA-256 özetini bloklar halinde okuyarak hesaplar."""
+    ozet = hashlib.sha256()
+    if hasattr(kaynak, 'read'):
+        kaynak.seek(0)
+        for parca in iter(lambda: kaynak.read(blok), b''):
+            ozet.update(parca)
+        kaynak.seek(0)
+    else:
+        with open(kaynak, 'rb') as f:
+            for parca in iter(lambda: f.read(blok), b''):
+                ozet.update(parca)
+    return ozet.hexdigest()
+
+
+def _parquet_mi(kaynak):
+    ad = getattr(kaynak, 'name', kaynak)
+    return str(ad).lower().endswith(('.parquet', '.pq'))
+
+
+def sayac_parcalari(kaynak, parca_boyutu=500_000, sutunlar=None):
+    """
+    CSV veya Parquet sayaç dosyasını sabit boyutlu parçalar halinde okur.
+    Bellekte aynı anda yalnızca bir parça tutulur.
+    """
+    sutunlar = {**SAYAC_SUTUNLARI, **(sutunlar or {})}
+    kaynak_adlari = list(sutunlar.values())
+    yeniden_adlandir = {v: k for k, v in sutunlar.items()}
+
+    # Başlık okunmadan önce doğrulanır; eksik sütun tüm dosya okunmadan açık bir hatayla bildirilir
+    if _parquet_mi(kaynak):
+        baslik = pq.ParquetFile(kaynak).schema_arrow.names
+    else:
+        baslik = pd.read_csv(kaynak, nrows=0).columns
+    if hasattr(kaynak, 'seek'):
+        kaynak.seek(0)
+    eksik = [ad for ad in kaynak_adlari if ad not in baslik]
+    if eksik:
+        raise ValueError(f"{getattr(kaynak, 'name', kaynak)} dosyasında eksik sütunlar: {', '.join(eksik)}")
+
+    if _parquet_mi(kaynak):
+        dosya = pq.ParquetFile(kaynak)
+        for batch in dosya.iter_batches(batch_size=parca_boyutu, columns=kaynak_adlari):
+            yield batch.to_pandas().rename(columns=yeniden_adlandir)
+    else:
+        for parca in pd.read_csv(kaynak, chunksize=parca_boyutu, usecols=kaynak_adlari,
+                                 dtype={sutunlar['sayac']: str, sutunlar['bina']: str}):
+            yield parca.rename(columns=yeniden_adlandir)
+
+
+def parca_dogrula(parca):
+    """
+    Parçadaki okumaları doğrular: zaman/enerji dönüştürülemeyenler, eksik bina, negatif veya
+    aşırı büyük değerler ve parça içindeki yinelenen (sayaç, zaman) kayıtları ayıklanır.
+
+    Returns:
+        tuple: (geçerli okumalar, reddedilme nedenine göre satır sayıları)
+    """
+    zaman = pd.to_datetime(parca['zaman'], errors='coerce', format='ISO8601')
+    enerji = pd.to_numeric(parca['enerji'], errors='coerce')
+
+    nedenler = {
+        'gecersiz_zaman': zaman.isna().values,
+        'gecersiz_enerji': enerji.isna().values,
+        'eksik_bina': parca['bina'].isna().values,
+        'negatif': (enerji < 0).values,
+        'asiri_deger': (enerji > MAKS_OKUMA_KWH).values,
+    }
+    gecersiz = np.zeros(len(parca), dtype=bool)
+    sayimlar = {}
+    for neden, maske in nedenler.items():
+        yeni = maske & ~gecersiz
+        sayimlar[neden] = int(yeni.sum())
+        gecersiz |= maske
+
+    gecerli = pd.DataFrame({
+        'sayac': parca['sayac'].values[~gecersiz],
+        'bina': parca['bina'].values[~gecersiz],
+        'zaman': zaman.values[~gecersiz],
+        'enerji': enerji.values[~gecersiz]
+    })
+    tekrar = gecerli.duplicated(['sayac', 'zaman'])
+    sayimlar['yinelenen'] = int(tekrar.sum())
+    return gecerli[~tekrar.values], sayimlar
+
+
+def okuma_anahtarlari(okumalar):
+    """(sayaç, zaman) çiftlerinin 64 bitlik özetleri; depo genelinde yinelenen okumaları ayıklamak için."""
+    return pd.util.hash_pandas_object(okumalar[['sayac', 'zaman']], index=False).to_numpy()
+
+
+def _saatlik_topla(okumalar):
+    """Okumaları bina ve saat bazında toplar (enerji toplamı ve okuma sayısı)."""
+    return (okumalar.assign(saat=okumalar['zaman'].dt.floor('h'))
+            .groupby(['bina', 'saat'], observed=True)['enerji']
+            .agg(enerji='sum', okuma='count'))
+
+
+class SayacDeposu:
+    """
+    Sayaç okumalarını bina bazında saatlik, günlük ve aylık toplamlar halinde Parquet dosyalarında
+    tutan sütunlu depo. Her dosya parça parça işlenir ve ham okumalar saklanmaz; bellek kullanımı
+    dosya boyutundan bağımsızdır, yalnızca toplanmış (bina × saat) satır sayısıyla büyür.
+    Aynı içerikli dosya ikinci kez işlenmez; farklı dosyalarda veya parçalarda tekrar gönderilen
+    (sayaç, zaman) okumaları, kabul edilen okumaların 64 bitlik anahtarlarıyla ayıklanır. Anahtarlar
+    diskte (bina, ay) bölümlerinde tutulur ve her parça için yalnızca dokunduğu bölümler okunur.
+    """
+
+    def __init__(self, root=".cache/sayac_deposu"):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+        self._manifest_yolu = os.path.join(self.root, "manifest.json")
+        self._anahtar_kok = os.path.join(self.root, "okuma_anahtarlari")
+        os.makedirs(self._anahtar_kok, exist_ok=True)
+
+    def _yol(self, seviye):
+        return os.path.join(self.root, f"{seviye}.parquet")
+
+    def _manifest(self):
+        if not os.path.exists(self._manifest_yolu):
+            return {}
+        with open(self._manifest_yolu, encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _bolum_adi(bina, ay):
+        return f"{ay}-{hashlib.sha256(str(bina).encode('utf-8')).hexdigest()[:16]}.npy"
+
+    def _bolum_anahtarlari(self, ad, gecici_kok):
+        """
+        Bir (bina, ay) bölümünde kabul edilmiş okumaların sıralı anahtarları; bu dosyanın işlenmesi
+        sırasında güncellenmiş hali (geçici kökte) varsa o okunur.
+        """
+        for kok in (gecici_kok, self._anahtar_kok):
+            yol = os.path.join(kok, ad)
+            if os.path.exists(yol):
+                return np.load(yol)
+        return np.empty(0, dtype=np.uint64)
+
+    def _yinelenenleri_ayikla(self, gecerli, gecici_kok):
+        """
+        Daha önce (önceki parçalarda veya dosyalarda) kabul edilmiş okumaları işaretler. Yeni anahtarlar
+        bölüm dosyalarının geçici kökteki kopyalarına eklenir; kopyalar toplamlar yazıldıktan sonra
+        depoya taşınır. Bellekte aynı anda yalnızca bir bölüm tutulur.
+        """
+        anahtarlar = okuma_anahtarlari(gecerli)
+        onceden = np.zeros(len(gecerli), dtype=bool)
+        gruplar = gecerli.groupby([gecerli['bina'], gecerli['zaman'].dt.to_period('M')], sort=False).indices
+        for (bina, ay), indeks in gruplar.items():
+            ad = self._bolum_adi(bina, ay)
+            gorulen = self._bolum_anahtarlari(ad, gecici_kok)
+            onceden[indeks] = np.isin(anahtarlar[indeks], gorulen, assume_unique=True)
+            np.save(os.path.join(gecici_kok, ad), np.union1d(gorulen, anahtarlar[indeks][~onceden[indeks]]))
+        return onceden
+
+    def tablo(self, seviye='saatlik'):
+        """'saatlik', 'gunluk' veya 'aylik' toplam tablosunu döndürür (yoksa boş tablo)."""
+        yol = self._yol(seviye)
+        if not os.path.exists(yol):
+            return pd.DataFrame(columns=['bina', 'zaman', 'Tüketim (kWh)', 'Okuma Sayısı'])
+        return pd.read_parquet(yol)
+
+    def ingest(self, kaynak, parca_boyutu=500_000, sutunlar=None):
+        """
+        Sayaç dosyasını parçalar halinde doğrular ve saatlik toplamlara ekler; ardından
+        günlük ve aylık toplamları yeniden üretir.
+
+        Returns:
+            dict: Okunan/geçerli satır sayıları, reddedilme nedenleri, süre ve satır/saniye hızı.
+        """
+        baslangic = time.perf_counter()
+        ozet = _dosya_ozeti(kaynak)
+        manifest = self._manifest()
+        if ozet in manifest:
+            return {**manifest[ozet], 'atlandi': True}
+
+        saatlik = None
+        okunan = 0
+        gecerli_sayisi = 0
+        reddedilen = {}
+        gecici_kok = f"{self._anahtar_kok}.tmp-{os.getpid()}"
+        shutil.rmtree(gecici_kok, ignore_errors=True)
+        os.makedirs(gecici_kok)
+        try:
+            for parca in sayac_parcalari(kaynak, parca_boyutu, sutunlar):
+                okunan += len(parca)
+                gecerli, sayimlar = parca_dogrula(parca)
+
+                # Önceki parçalarda veya önceki dosyalarda kabul edilmiş okumalar atılır
+                onceden = self._yinelenenleri_ayikla(gecerli, gecici_kok)
+                sayimlar['yinelenen'] += int(onceden.sum())
+                gecerli = gecerli[~onceden]
+                gecerli_sayisi += len(gecerli)
+                for neden, adet in sayimlar.items():
+                    reddedilen[neden] = reddedilen.get(neden, 0) + adet
+
+                # Parça toplamları birikimli saatlik tabloya eklenir; parçalar arasında bölünen
+                # saatler toplama sırasında birleşir.
+                kismi = _saatlik_topla(gecerli)
+                saatlik = kismi if saatlik is None else saatlik.add(kismi, fill_value=0)
+
+            if saatlik is not None:
+                self._saatlik_birlestir(saatlik)
+                for ad in os.listdir(gecici_kok):
+                    os.replace(os.path.join(gecici_kok, ad), os.path.join(self._anahtar_kok, ad))
+        finally:
+            # Yarıda kalan içe aktarmanın anahtarları depoya taşınmaz
+            shutil.rmtree(gecici_kok, ignore_errors=True)
+
+        sure = time.perf_counter() - baslangic
+        rapor = {
+            'dosya': str(getattr(kaynak, 'name', kaynak)),
+            'okunan_satir': okunan,
+            'gecerli_satir': gecerli_sayisi,
+            'reddedilen': reddedilen,
+            'sure': sure,
+            'satir_per_saniye': okunan / sure if sure > 0 else float('inf'),
+            'atlandi': False
+        }
+        manifest[ozet] = rapor
+        with open(self._manifest_yolu, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return rapor
+
+    def _saatlik_birlestir(self, yeni):
+        """Yeni saatlik toplamları mevcut depo ile birleştirir ve üst seviye toplamları yazar."""
+        yeni = yeni.rename_axis(['bina', 'zaman'])
+        mevcut = self.tablo('saatlik')
+        if len(mevcut):
+            eski = (mevcut.set_index(['bina', 'zaman'])
+                    .rename(columns={'Tüketim (kWh)': 'enerji', 'Okuma Sayısı': 'okuma'}))
+            yeni = eski.add(yeni, fill_value=0)
+
+        saatlik = (yeni.rename(columns={'enerji': 'Tüketim (kWh)', 'okuma': 'Okuma Sayısı'})
+                   .astype({'Okuma Sayısı': 'int64'})
+                   .sort_index()
+                   .reset_index())
+        self._yaz('saatlik', saatlik)
+        for seviye, frekans in (('gunluk', 'D'), ('aylik', 'M')):
+            self._yaz(seviye, (saatlik
+                               .groupby(['bina', pd.Grouper(key='zaman', freq=frekans)])
+                               [['Tüketim (kWh)', 'Okuma Sayısı']].sum()
+                               .reset_index()))
+
+    def _yaz(self, seviye, tablo):
+        gecici = self._yol(seviye) + ".tmp"
+        tablo.to_parquet(gecici, index=False)
+        os.replace(gecici, self._yol(seviye))
+
+    def aylik_kapsama(self):
+        """Bina ve ay başına okuma bulunan saatlerin ayın saatlerine oranı (ay sonu indeksli geniş tablo)."""
+        saatlik = self.tablo('saatlik')
+        if saatlik.empty:
+            return pd.DataFrame()
+        tablo = (saatlik.groupby(['bina', pd.Grouper(key='zaman', freq='M')]).size()
+                 .unstack('bina'))
+        tablo.index = tablo.index + pd.offsets.MonthEnd(0)
+        tablo = tablo.div(tablo.index.days_in_month * 24, axis=0)
+        tablo.index.name = "Tarih"
+        tablo.columns.name = None
+        return tablo
+
+    def aylik_tuketim_tablosu(self, min_kapsama=MIN_AY_KAPSAMASI):
+        """
+        Aylık toplamları (ay sonu indeksli, bina sütunlu) geniş tablo olarak döndürür. Saatlerinin
+        min_kapsama oranından azında okuma bulunan (kısmi) aylar NaN olur.
+        """
+        aylik = self.tablo('aylik')
+        if aylik.empty:
+            return pd.DataFrame()
+        tablo = aylik.pivot(index='zaman', columns='bina', values='Tüketim (kWh)')
+        tablo.index = tablo.index + pd.offsets.MonthEnd(0)
+        tablo.index.name = "Tarih"
+        tablo.columns.name = None
+        kapsama = self.aylik_kapsama().reindex(index=tablo.index, columns=tablo.columns)
+        return tablo.where(kapsama >= min_kapsama)
+
+
+def ornek_sayac_dosyasi_olustur(yol, bina_sayaclari, baslangic="2024-01-01", gun_sayisi=30,
+                                ortalama_kwh=5.0, seed=0):
+    """
+    Performans ölçümü için 15 dakikalık sentetik sayaç dosyası (CSV veya Parquet) oluşturur.
+    bina_sayaclari: {bina adı: sayaç sayısı}
+    """
+    rng = np.random.default_rng(seed)
+    zaman = pd.date_range(baslangic, periods=gun_sayisi * 96, freq='15min')
+    sayaclar = [(bina, f"{bina[:3].upper()}-{i:04d}") for bina, adet in bina_sayaclari.items() for i in range(adet)]
+    bina = np.repeat([b for b, _ in sayaclar], len(zaman))
+    sayac = np.repeat([s for _, s in sayaclar], len(zaman))
+    gunluk_sekil = 0.6 + 0.4 * np.sin(np.pi * zaman.hour.values / 24)
+    enerji = np.tile(gunluk_sekil, len(sayaclar)) * rng.gamma(4.0, ortalama_kwh / 4.0, len(bina))
+
+    tablo = pd.DataFrame({
+        SAYAC_SUTUNLARI['sayac']: sayac,
+        SAYAC_SUTUNLARI['bina']: bina,
+        SAYAC_SUTUNLARI['zaman']: np.tile(zaman.values, len(sayaclar)),
+        SAYAC_SUTUNLARI['enerji']: enerji.round(3)
+    })
+    if _parquet_mi(yol):
+        tablo.to_parquet(yol, index=False)
+    else:
+        tablo.to_csv(yol, index=False)
+    return len(tablo)
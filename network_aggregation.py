@@ -0,0 +1,105 @@
+# network_aggregation.py
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Simulink modelindeki 120 kV / 25 kV güç transformatörü
+TRAFO_KAPASITESI_KVA = 47_000
+# 25 kV fider başına varsayılan termik sınır
+FIDER_KAPASITESI_KVA = 8_000
+
+
+def sebeke_topolojisi(bina_fiderleri, fider_trafolari=None):
+    """
+    Bina → fider → trafo ağacını seyrek (sparse) bağlantı matrisleriyle kurar.
+
+    Args:
+        bina_fiderleri (dict): {bina: fider}
+        fider_trafolari (dict): {fider: trafo}; verilmezse tüm fiderler tek trafoya ("TR-1") bağlanır.
+
+    Returns:
+        dict: Bina/fider/trafo adları ve binalardan tüm düğümlere (fider + trafo) tek seferde
+        toplama yapan (düğüm × bina) CSR matrisi.
+    """
+    binalar = list(bina_fiderleri)
+    fiderler = sorted(set(bina_fiderleri.values()))
+    if fider_trafolari is None:
+        fider_trafolari = {f: "TR-1" for f in fiderler}
+    trafolar = sorted(set(fider_trafolari[f] for f in fiderler))
+
+    fider_indeksi = {f: i for i, f in enumerate(fiderler)}
+    trafo_indeksi = {t: i for i, t in enumerate(trafolar)}
+
+    # (fider × bina) ve (trafo × fider) bağlantı matrisleri
+    bina_fider = sparse.csr_matrix(
+        (np.ones(len(binalar)), ([fider_indeksi[bina_fiderleri[b]] for b in binalar], np.arange(len(binalar)))),
+        shape=(len(fiderler), len(binalar))
+    )
+    fider_trafo = sparse.csr_matrix(
+        (np.ones(len(fiderler)), ([trafo_indeksi[fider_trafolari[f]] for f in fiderler], np.arange(len(fiderler)))),
+        shape=(len(trafolar), len(fiderler))
+    )
+
+    return {
+        'binalar': binalar,
+        'fiderler': fiderler,
+        'trafolar': trafolar,
+        'toplama': sparse.vstack([bina_fider, fider_trafo @ bina_fider]).tocsr()
+    }
+
+
+def agac_yuklenmesi(topoloji, saatlik_yuk, saatlik_pv=None, fider_kapasitesi=FIDER_KAPASITESI_KVA,
+                    trafo_kapasitesi=TRAFO_KAPASITESI_KVA, guc_faktoru=0.9, blok_boyutu=744,
+                    zaman=None):
+    """
+    Bina yük ve PV dizilerini fider ve trafo düğümlerine toplar; her zaman bloğu için tek bir
+    seyrek matris çarpımı yapılır. Görünür güç, net aktif gücün mutlak değerinin güç faktörüne
+    bölümüyle hesaplanır; ters akış (PV fazlası) da yüklenmeye dahildir.
+
+    Args:
+        saatlik_yuk (array): Bina yükleri (kW), şekil (bina, saat).
+        saatlik_pv (array): Bina PV üretimleri (kW), şekil (bina, saat).
+        fider_kapasitesi, trafo_kapasitesi: Skaler veya düğüm başına dizi (kVA).
+
+    Returns:
+        dict: Düğüm net güç dizisi (düğüm × saat), aşırı yük maskesi ve özet tablo.
+    """
+    yuk = np.asarray(saatlik_yuk, dtype=float)
+    net = yuk if saatlik_pv is None else yuk - np.asarray(saatlik_pv, dtype=float)
+    toplama = topoloji['toplama']
+    n_fider = len(topoloji['fiderler'])
+
+    kapasite = np.r_[
+        np.broadcast_to(np.asarray(fider_kapasitesi, dtype=float), (n_fider,)),
+        np.broadcast_to(np.asarray(trafo_kapasitesi, dtype=float), (len(topoloji['trafolar']),))
+    ]
+
+    dugum_net = np.empty((toplama.shape[0], net.shape[1]))
+    asiri_yuk = np.empty(dugum_net.shape, dtype=bool)
+    for baslangic in range(0, net.shape[1], blok_boyutu):
+        blok = slice(baslangic, baslangic + blok_boyutu)
+        dugum_net[:, blok] = toplama @ net[:, blok]
+        asiri_yuk[:, blok] = np.abs(dugum_net[:, blok]) / guc_faktoru > kapasite[:, None]
+
+    gorunur = np.abs(dugum_net) / guc_faktoru
+    tepe_indeksi = gorunur.argmax(axis=1)
+    if zaman is None:
+        zaman = pd.RangeIndex(net.shape[1])
+    ozet = pd.DataFrame({
+        'Düğüm': topoloji['fiderler'] + topoloji['trafolar'],
+        'Seviye': ['Fider'] * n_fider + ['Trafo'] * len(topoloji['trafolar']),
+        'Bağlı Bina Sayısı': np.asarray((toplama != 0).sum(axis=1)).ravel(),
+        'Kapasite (kVA)': kapasite,
+        'Tepe Yük (kVA)': gorunur.max(axis=1),
+        'Tepe Zamanı': np.asarray(zaman)[tepe_indeksi],
+        'Maks. Yüklenme (%)': gorunur.max(axis=1) / kapasite * 100,
+        'Aşırı Yük Saati': asiri_yuk.sum(axis=1),
+        'Ters Akış Saati': (dugum_net < 0).sum(axis=1)
+    })
+
+    return {
+        'dugum_net': dugum_net,
+        'asiri_yuk': asiri_yuk,
+        'ozet': ozet
+    }
@@ -0,0 +1,114 @@
+# peak_demand.py
+
+import numpy as np
+import pandas as pd
+
+
+def kayan_talep(enerji, pencere_aralik, aralik_dk=15):
+    """
+    Aralık enerjilerinden (kWh) kayan pencere ortalama talebini (kW) kümülatif toplam farkıyla hesaplar.
+
+    Args:
+        enerji (array): Aralık enerjileri, şekil (..., aralık sayısı).
+        pencere_aralik (int): Penceredeki aralık sayısı.
+        aralik_dk (int): Bir aralığın süresi (dakika).
+
+    Returns:
+        ndarray: Pencere sonundaki talep, şekil (..., aralık sayısı - pencere_aralik + 1).
+    """
+    enerji = np.asarray(enerji, dtype=float)
+    kumulatif = np.cumsum(enerji, axis=-1)
+    kumulatif = np.concatenate([np.zeros(enerji.shape[:-1] + (1,)), kumulatif], axis=-1)
+    return (kumulatif[..., pencere_aralik:] - kumulatif[..., :-pencere_aralik]) / (pencere_aralik * aralik_dk / 60)
+
+
+def _pencere_araliklari(pencereler, aralik_dk):
+    araliklar = {}
+    for pencere in pencereler:
+        if pencere % aralik_dk:
+            raise ValueError(f"{pencere} dakikalık pencere {aralik_dk} dakikalık aralığın katı değil")
+        araliklar[pencere] = pencere // aralik_dk
+    return araliklar
+
+
+def tepe_talep_analizi(enerji, zaman, sayac_adlari=None, aralik_dk=15, pencereler=(15, 30, 60),
+                       ilk_n=10, blok_boyutu=64):
+    """
+    Sayaç başına ve toplam yük için kayan pencere tepe taleplerini hesaplar.
+
+    Sayaçlar blok_boyutu'luk gruplar halinde işlendiğinden bellek kullanımı sayaç sayısıyla değil
+    blok boyutuyla sınırlıdır. Eşzamanlı (coincident) tepe, tüm sayaçların toplam yükünün tepesidir;
+    eşzamansız tepe, sayaç tepelerinin toplamıdır. İkisinin oranı çeşitlilik (diversity) faktörüdür.
+
+    Args:
+        enerji (array): Aralık enerjileri (kWh), şekil (sayaç, aralık).
+        zaman (DatetimeIndex): Aralık başlangıç zamanları.
+
+    Returns:
+        dict: 'sayac_tepeleri', 'ozet' ve 'ilk_tepeler' tabloları.
+    """
+    enerji = np.atleast_2d(np.asarray(enerji, dtype=float))
+    zaman = pd.DatetimeIndex(zaman)
+    if sayac_adlari is None:
+        sayac_adlari = [f"Sayaç {i + 1}" for i in range(enerji.shape[0])]
+    araliklar = _pencere_araliklari(pencereler, aralik_dk)
+
+    sayac_satirlari = []
+    ozet_satirlari = []
+    ilk_tepeler = []
+    toplam_yuk = enerji.sum(axis=0)
+
+    for pencere, w in araliklar.items():
+        # Pencere bitişine göre etiketlenmiş zaman (talep, pencerenin son aralığının sonunda ölçülür)
+        pencere_zamani = zaman[w - 1:] + pd.Timedelta(minutes=aralik_dk)
+
+        tepe = np.empty(enerji.shape[0])
+        tepe_indeksi = np.empty(enerji.shape[0], dtype=int)
+        for baslangic in range(0, enerji.shape[0], blok_boyutu):
+            talep = kayan_talep(enerji[baslangic:baslangic + blok_boyutu], w, aralik_dk)
+            tepe_indeksi[baslangic:baslangic + blok_boyutu] = talep.argmax(axis=-1)
+            tepe[baslangic:baslangic + blok_boyutu] = talep.max(axis=-1)
+
+        toplam_talep = kayan_talep(toplam_yuk, w, aralik_dk)
+        es_zamanli_indeks = int(toplam_talep.argmax())
+        es_zamanli = toplam_talep[es_zamanli_indeks]
+        # Sayaçların eşzamanlı tepe anındaki katkısı
+        katki = enerji[:, es_zamanli_indeks:es_zamanli_indeks + w].sum(axis=-1) / (w * aralik_dk / 60)
+
+        for i, ad in enumerate(sayac_adlari):
+            sayac_satirlari.append({
+                'Sayaç': ad,
+                'Pencere (dk)': pencere,
+                'Tepe Talep (kW)': tepe[i],
+                'Tepe Zamanı': pencere_zamani[tepe_indeksi[i]],
+                'Eşzamanlı Tepedeki Talep (kW)': katki[i]
+            })
+
+        ozet_satirlari.append({
+            'Pencere (dk)': pencere,
+            'Eşzamanlı Tepe (kW)': es_zamanli,
+            'Eşzamanlı Tepe Zamanı': pencere_zamani[es_zamanli_indeks],
+            'Eşzamansız Tepe (kW)': tepe.sum(),
+            'Çeşitlilik Faktörü': tepe.sum() / es_zamanli if es_zamanli > 0 else np.nan
+        })
+
+        # Farklı günlerdeki en yüksek N toplam talep (aynı tepenin komşu pencereleri tekrar sayılmaz)
+        gun = pencere_zamani.normalize().values
+        gun_baslangic = np.flatnonzero(np.r_[True, gun[1:] != gun[:-1]])
+        gunluk_tepe = np.maximum.reduceat(toplam_talep, gun_baslangic)
+        secilen_gunler = np.argsort(gunluk_tepe)[::-1][:ilk_n]
+        for sira, g in enumerate(secilen_gunler, start=1):
+            bitis = gun_baslangic[g + 1] if g + 1 < len(gun_baslangic) else len(toplam_talep)
+            indeks = gun_baslangic[g] + int(toplam_talep[gun_baslangic[g]:bitis].argmax())
+            ilk_tepeler.append({
+                'Pencere (dk)': pencere,
+                'Sıra': sira,
+                'Zaman': pencere_zamani[indeks],
+                'Toplam Talep (kW)': toplam_talep[indeks]
+            })
+
+    return {
+        'sayac_tepeleri': pd.DataFrame(sayac_satirlari),
+        'ozet': pd.DataFrame(ozet_satirlari),
+        'ilk_tepeler': pd.DataFrame(ilk_tepeler)
+    }
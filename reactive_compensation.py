@@ -0,0 +1,157 @@
+# reactive_compensation.py
+
+import numpy as np
+import pandas as pd
+
+# Kademe kataloğu (kVAr) ve maliyet varsayımları
+KADEME_BOYUTLARI = np.array([0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 25.0, 50.0])
+# Küçük yüklü binalar için bina başına eklenen kademeler: en yüksek saatlik ihtiyaca oranla
+KADEME_ORANLARI = np.array([1 / 12, 1 / 8, 1 / 6, 1 / 4, 1 / 3, 1 / 2, 1.0])
+MAKS_KADEME_SAYISI = 12
+KVAR_BIRIM_MALIYETI = 400      # TL/kVAr (kondansatör)
+KADEME_SABIT_MALIYETI = 1500   # TL/kademe (kontaktör, sigorta)
+PANO_MALIYETI = 10000          # TL (reaktif güç rölesi ve pano)
+
+# Aylık reaktif enerji sınırları (aktif enerjiye oran)
+ENDUKTIF_SINIR = 0.20
+KAPASITIF_SINIR = 0.15
+
+
+def saatlik_guc_faktoru(aktif_guc, nominal_guc_faktoru=0.9, dusuk_yuk_guc_faktoru=0.7):
+    """
+    Saatlik aktif güç serisinden yük oranına bağlı güç faktörü serisi üretir: düşük yükte
+    (boşta çalışan motorlar, trafolar) güç faktörü düşer, tepe yükte nominal değere ulaşır.
+    """
+    aktif_guc = np.asarray(aktif_guc, dtype=float)
+    tepe = aktif_guc.max(axis=-1, keepdims=True)
+    yuk_orani = np.divide(aktif_guc, tepe, out=np.zeros_like(aktif_guc), where=tepe > 0)
+    return dusuk_yuk_guc_faktoru + (nominal_guc_faktoru - dusuk_yuk_guc_faktoru) * np.sqrt(yuk_orani)
+
+
+def kademe_konfigurasyonlari(kademe_boyutlari=KADEME_BOYUTLARI, maks_kademe=MAKS_KADEME_SAYISI):
+    """Tüm (kademe boyutu, kademe sayısı) kombinasyonlarını dizi olarak döndürür."""
+    boyut, adet = np.meshgrid(np.asarray(kademe_boyutlari, dtype=float), np.arange(1, maks_kademe + 1))
+    return boyut.ravel(), adet.ravel()
+
+
+def _ay_baslangiclari(zaman, saat_sayisi):
+    """Saatlik seride her ayın ilk saatinin indeksi (np.add.reduceat için)."""
+    if zaman is None:
+        zaman = pd.date_range("2025-01-01", periods=saat_sayisi, freq='h')
+    ay = pd.DatetimeIndex(zaman).to_period('M').asi8
+    return np.flatnonzero(np.r_[True, ay[1:] != ay[:-1]])
+
+
+def _aylik_oranlar(reaktif, aylik_aktif, ay_baslangiclari):
+    """Aylık reaktif enerjinin aylık aktif enerjiye oranı; şekil (..., ay)."""
+    aylik = np.add.reduceat(reaktif, ay_baslangiclari, axis=-1)
+    return np.divide(aylik, aylik_aktif, out=np.zeros_like(aylik), where=aylik_aktif > 0)
+
+
+def _bina_konfigurasyonlari(P, Q, gerekli, hedef_guc_faktoru, kademe_boyutlari, kademe_oranlari, maks_kademe,
+                            ay_baslangiclari):
+    """
+    Tek bir binanın tüm kademe konfigürasyonlarını (konfigürasyon × saat) dizisiyle değerlendirir.
+    Katalog, standart kademelere ek olarak binanın en yüksek kompanzasyon ihtiyacının
+    kademe_oranlari katlarını içerir; ilk satır kompanzasyonsuz (banka yok) durumdur.
+    """
+    tepe_ihtiyac = gerekli.max()
+    boyutlar = np.unique(np.r_[kademe_boyutlari, np.asarray(kademe_oranlari) * tepe_ihtiyac])
+    boyut, adet = kademe_konfigurasyonlari(boyutlar[boyutlar > 0], maks_kademe)
+    boyut = np.r_[0.0, boyut]
+    adet = np.r_[0, adet]
+    boyut_ = boyut[:, None]
+    yuklu = P > 0
+
+    # Hedef için gereken kademe sayısı; aşırı kompanzasyonu önlemek için Q'yu aşan kademeler açılmaz
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kademe = np.minimum(np.ceil(gerekli / boyut_), adet[:, None])
+        kademe = np.where(kademe * boyut_ > Q, np.floor(Q / boyut_), kademe)
+    kademe = np.where(boyut_ > 0, kademe, 0)
+    Q_net = Q - kademe * boyut_
+    pf_sonra = np.divide(P, np.hypot(P, Q_net), out=np.ones_like(Q_net), where=yuklu)
+
+    aylik_aktif = np.add.reduceat(P, ay_baslangiclari)
+    enduktif = _aylik_oranlar(np.clip(Q_net, 0, None), aylik_aktif, ay_baslangiclari)
+    kapasitif = _aylik_oranlar(np.clip(-Q_net, 0, None), aylik_aktif, ay_baslangiclari)
+    return {
+        'boyut': boyut,
+        'adet': adet,
+        'maliyet': np.where(adet > 0, PANO_MALIYETI + adet * (KADEME_SABIT_MALIYETI + boyut * KVAR_BIRIM_MALIYETI), 0),
+        'Q_net': Q_net,
+        'uyum': ((pf_sonra >= hedef_guc_faktoru - 1e-9) & yuklu).sum(axis=-1) / yuklu.sum() if yuklu.any()
+                else np.ones(len(boyut)),
+        'enduktif': enduktif.max(axis=-1),
+        'kapasitif': kapasitif.max(axis=-1),
+        'ihlal': ((enduktif > ENDUKTIF_SINIR) | (kapasitif > KAPASITIF_SINIR)).sum(axis=-1)
+    }
+
+
+def kompanzasyon_boyutlandir(aktif_guc, guc_faktoru, hedef_guc_faktoru=0.95, hedef_uyum_orani=0.95,
+                             kademe_boyutlari=KADEME_BOYUTLARI, kademe_oranlari=KADEME_ORANLARI,
+                             maks_kademe=MAKS_KADEME_SAYISI, bina_adlari=None, zaman=None):
+    """
+    Kademeli kondansatör bankalarını saatlik seriler üzerinde boyutlandırır. Her saat için röle,
+    hedef güç faktörüne ve aylık endüktif sınırın gerektirdiği güç faktörüne (tanφ ≤ ENDUKTIF_SINIR,
+    yaklaşık 0,98) birlikte ulaşan en az kademeyi devreye alır ve kapasitif bölgeye geçmez. Yükü
+    olmayan binalar hedefi sağlamış sayılır.
+    Binalar tek tek değerlendirilir (bellekte en fazla bir binanın konfigürasyon × saat dizisi
+    tutulur). Hedefi saatlerin en az hedef_uyum_orani kadarında sağlayan konfigürasyonlar arasından
+    aylık endüktif/kapasitif sınırları aşmayan en ucuzu, böylesi yoksa en ucuzu seçilir. Hiçbir
+    konfigürasyon hedefi sağlamıyorsa banka önerilmez.
+
+    Args:
+        aktif_guc (array): Saatlik aktif güç (kW), şekil (bina, saat).
+        guc_faktoru (array): Saatlik güç faktörü, skaler veya aktif_guc ile aynı şekilde.
+        zaman (DatetimeIndex): Saatlerin zamanı; aylık sınırlar için ay ayrımında kullanılır.
+
+    Returns:
+        DataFrame: Bina başına durum, seçilen konfigürasyon, maliyet ve kompanzasyon öncesi/sonrası göstergeler.
+    """
+    P = np.atleast_2d(np.asarray(aktif_guc, dtype=float))
+    pf = np.broadcast_to(np.asarray(guc_faktoru, dtype=float), P.shape)
+    if bina_adlari is None:
+        bina_adlari = [f"Bina {i + 1}" for i in range(P.shape[0])]
+    ay_baslangiclari = _ay_baslangiclari(zaman, P.shape[1])
+    role_guc_faktoru = max(hedef_guc_faktoru, np.cos(np.arctan(ENDUKTIF_SINIR)))
+
+    satirlar = []
+    for b in range(P.shape[0]):
+        Q = P[b] * np.tan(np.arccos(pf[b]))                        # Endüktif reaktif güç (kVAr)
+        gerekli = np.clip(Q - P[b] * np.tan(np.arccos(role_guc_faktoru)), 0, None)
+        k = _bina_konfigurasyonlari(P[b], Q, gerekli, hedef_guc_faktoru, kademe_boyutlari, kademe_oranlari,
+                                    maks_kademe, ay_baslangiclari)
+
+        uygun = k['uyum'] >= hedef_uyum_orani
+        if uygun.any():
+            # Öncelik: uyum şartı, aylık sınırlar, maliyet
+            secim = np.lexsort((k['maliyet'], k['ihlal'] > 0, ~uygun))[0]
+            if k['adet'][secim] == 0:
+                durum = 'Kompanzasyon gerekmiyor'
+            elif k['ihlal'][secim]:
+                durum = 'Banka seçildi (aylık sınır aşımı var)'
+            else:
+                durum = 'Banka seçildi'
+        else:
+            secim = 0
+            durum = 'Hedefe ulaşılamıyor (banka önerilmez)'
+
+        aktif_enerji = P[b].sum()
+        Q_secili = k['Q_net'][secim]
+        satirlar.append({
+            'Bina Tipi': bina_adlari[b],
+            'Durum': durum,
+            'Kademe Boyutu (kVAr)': k['boyut'][secim] if k['adet'][secim] else np.nan,
+            'Kademe Sayısı': int(k['adet'][secim]),
+            'Toplam Kapasite (kVAr)': k['boyut'][secim] * k['adet'][secim],
+            'Yatırım Maliyeti (TL)': k['maliyet'][secim],
+            'Hedef Sağlandı': bool(uygun[secim]),
+            'Uyum Oranı (%)': k['uyum'][secim] * 100,
+            'Ortalama GF (Öncesi)': aktif_enerji / np.hypot(P[b], Q).sum() if aktif_enerji > 0 else 1.0,
+            'Ortalama GF (Sonrası)': aktif_enerji / np.hypot(P[b], Q_secili).sum() if aktif_enerji > 0 else 1.0,
+            'Maks. Aylık Endüktif Oran Öncesi (%)': k['enduktif'][0] * 100,
+            'Maks. Aylık Endüktif Oran Sonrası (%)': k['enduktif'][secim] * 100,
+            'Maks. Aylık Kapasitif Oran Sonrası (%)': k['kapasitif'][secim] * 100,
+            'Sınırı Aşan Ay Sayısı': int(k['ihlal'][secim])
+        })
+    return pd.DataFrame(satirlar)
@@ -0,0 +1,196 @@
+# scenario_store.py
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def _normalize(value):
+    """
+    Girdi değerlerini kararlı (sıralı, JSON uyumlu) bir yapıya dönüştürür.
+    """
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_normalize(v) for v in value)
+    if isinstance(value, pd.DataFrame):
+        return {
+            'columns': [str(c) for c in value.columns],
+            'index': _normalize(value.index.astype(str).tolist()),
+            'digest': hashlib.sha256(pd.util.hash_pandas_object(value, index=True).values.tobytes()).hexdigest()
+        }
+    if isinstance(value, pd.Series):
+        return _normalize(value.to_frame())
+    if isinstance(value, np.ndarray):
+        return {
+            'dtype': str(value.dtype),
+            'shape': list(value.shape),
+            'digest': hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        }
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def input_hash(*parts, **named):
+    """
+    Girdi parametre kümesinin içerik tabanlı (SHA-256) özetini döndürür.
+    """
+    yuk = json.dumps(_normalize({'parts': list(parts), 'named': named}), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(yuk.encode('utf-8')).hexdigest()
+
+
+class ScenarioStore:
+    """
+    Senaryo sonuçlarını içerik özetine göre diskte saklayan kalıcı depo.
+    Tablolar Parquet dosyaları olarak, dizin bilgisi ise SQLite veritabanında tutulur.
+    Toplam boyut disk bütçesini aştığında en uzun süredir erişilmeyen (LRU) senaryolar silinir.
+    """
+
+    def __init__(self, root=".cache/senaryolar", max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("SENARYO_DEPOSU_MB", 500)) * 1024 ** 2)
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.root, exist_ok=True)
+        self._db_path = os.path.join(self.root, "index.sqlite")
+        with self._connect() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS senaryolar (
+                    anahtar TEXT PRIMARY KEY,
+                    girdiler TEXT,
+                    tablolar TEXT,
+                    degerler TEXT,
+                    boyut INTEGER,
+                    olusturma REAL,
+                    son_erisim REAL,
+                    erisim_sayisi INTEGER
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self._db_path, timeout=30)
+
+    def _dizin(self, anahtar):
+        return os.path.join(self.root, anahtar)
+
+    def key(self, **inputs):
+        """Girdi parametrelerinden senaryo anahtarını üretir."""
+        return input_hash(**inputs)
+
+    def get(self, anahtar):
+        """Senaryo sonuçlarını döndürür; depoda yoksa None döner."""
+        with self._connect() as db:
+            satir = db.execute(
+                "SELECT tablolar, degerler FROM senaryolar WHERE anahtar = ?", (anahtar,)
+            ).fetchone()
+            if satir is None:
+                self.misses += 1
+                return None
+            db.execute(
+                "UPDATE senaryolar SET son_erisim = ?, erisim_sayisi = erisim_sayisi + 1 WHERE anahtar = ?",
+                (time.time(), anahtar)
+            )
+
+        try:
+            sonuc = {ad: pd.read_parquet(os.path.join(self._dizin(anahtar), f"{ad}.parquet"))
+                     for ad in json.loads(satir[0])}
+        except (OSError, ValueError):
+            # Dosyalar elle silinmiş veya bozulmuşsa kaydı düşür
+            self.delete(anahtar)
+            self.misses += 1
+            return None
+        sonuc.update(json.loads(satir[1]))
+        self.hits += 1
+        return sonuc
+
+    def put(self, anahtar, sonuclar, girdiler=None):
+        """
+        Senaryo sonuçlarını kaydeder. DataFrame değerleri Parquet olarak,
+        diğer (JSON uyumlu) değerler SQLite dizininde saklanır.
+        """
+        tablolar = {ad: v for ad, v in sonuclar.items() if isinstance(v, pd.DataFrame)}
+        degerler = {ad: _normalize(v) for ad, v in sonuclar.items() if ad not in tablolar}
+
+        hedef = self._dizin(anahtar)
+        gecici = f"{hedef}.tmp-{os.getpid()}"
+        os.makedirs(gecici, exist_ok=True)
+        for ad, tablo in tablolar.items():
+            tablo.to_parquet(os.path.join(gecici, f"{ad}.parquet"))
+        boyut = sum(os.path.getsize(os.path.join(gecici, f)) for f in os.listdir(gecici))
+
+        shutil.rmtree(hedef, ignore_errors=True)
+        os.replace(gecici, hedef)
+
+        simdi = time.time()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO senaryolar VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (anahtar, json.dumps(_normalize(girdiler), ensure_ascii=False),
+                 json.dumps(list(tablolar)), json.dumps(degerler, ensure_ascii=False),
+                 boyut, simdi, simdi)
+            )
+        self.evict()
+
+    def get_or_compute(self, girdiler, hesapla):
+        """
+        Aynı girdilerle daha önce hesaplanmış bir senaryo varsa onu döndürür,
+        yoksa hesapla() fonksiyonunu çalıştırıp sonucu depoya yazar.
+        """
+        anahtar = self.key(**girdiler)
+        sonuc = self.get(anahtar)
+        if sonuc is None:
+            sonuc = hesapla()
+            self.put(anahtar, sonuc, girdiler)
+        return sonuc
+
+    def delete(self, anahtar):
+        """Senaryoyu depodan siler."""
+        shutil.rmtree(self._dizin(anahtar), ignore_errors=True)
+        with self._connect() as db:
+            db.execute("DELETE FROM senaryolar WHERE anahtar = ?", (anahtar,))
+
+    def total_bytes(self):
+        """Depodaki senaryoların toplam disk boyutunu döndürür."""
+        with self._connect() as db:
+            return db.execute("SELECT COALESCE(SUM(boyut), 0) FROM senaryolar").fetchone()[0]
+
+    def evict(self):
+        """Disk bütçesi aşılmışsa en uzun süredir erişilmeyen senaryoları siler."""
+        toplam = self.total_bytes()
+        if toplam <= self.max_bytes:
+            return []
+        silinenler = []
+        with self._connect() as db:
+            satirlar = db.execute(
+                "SELECT anahtar, boyut FROM senaryolar ORDER BY son_erisim ASC"
+            ).fetchall()
+        for anahtar, boyut in satirlar:
+            if toplam <= self.max_bytes:
+                break
+            self.delete(anahtar)
+            toplam -= boyut
+            silinenler.append(anahtar)
+        return silinenler
+
+    def stats(self):
+        """Depo kullanım istatistiklerini döndürür."""
+        with self._connect() as db:
+            adet = db.execute("SELECT COUNT(*) FROM senaryolar").fetchone()[0]
+        return {
+            'senaryo_sayisi': adet,
+            'toplam_boyut': self.total_bytes(),
+            'butce': self.max_bytes,
+            'isabet': self.hits,
+            'iskalama': self.misses
+        }
@@ -4,6 +4,123 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 from time_series_analysis import show_time_series_analysis
+from waveform_import import (
+    SEYRELTME_YONTEMLERI,
+    WaveformStore,
+    ice_aktarma_dosyalari,
+    ice_aktarma_yolu,
+    ortalama_guc,
+    seyreltilmis_sinyal,
+    sinyal_ozeti
+)
+
+@st.cache_resource
+def dalga_deposunu_ac():
+    """İçe aktarılan Simulink dalga formlarının deposunu açar."""
+    return WaveformStore()
+
+def dalga_formu_karsilastirma(panel_data):
+    """
+    Simulink'te kaydedilen DC/AC dalga formlarını (CSV / MAT) parça parça içe aktarır ve seçilen zaman
+    aralığını LTTB veya min-max ile seyrelterek çizer; izin tamamı belleğe yüklenmez.
+    """
+    depo = dalga_deposunu_ac()
+    with st.expander("📈 Simulink Dalga Formu İçe Aktarma (CSV / MAT)"):
+        st.markdown(
+            "İlk satırı sinyal adları olan CSV veya MAT dosyaları desteklenir; `time`/`t`/`tout` sütunu "
+            "zaman (s) olarak kullanılır. Büyük dosyalar, yöneticinin `DALGA_ICE_AKTARMA_DIZINI` ile "
+            "tanımladığı sunucu dizinine konup buradan seçilebilir."
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            dalga_dosyasi = st.file_uploader("Dalga formu dosyası", type=["csv", "mat"])
+        with col2:
+            sunucu_dosyalari = ice_aktarma_dosyalari()
+            sunucu_dosyasi = st.selectbox("veya içe aktarma dizininden", [None] + sunucu_dosyalari,
+                                          format_func=lambda ad: "-" if ad is None else ad,
+                                          disabled=not sunucu_dosyalari)
+        with col3:
+            ornekleme_khz = st.number_input("Örnekleme Frekansı (kHz, zaman sütunu yoksa)",
+                                            min_value=0.1, value=10.0, step=1.0)
+        kaynak = dalga_dosyasi or sunucu_dosyasi
+        if kaynak is not None and st.button("Dalga Formunu İçe Aktar"):
+            try:
+                if isinstance(kaynak, str):
+                    kaynak = ice_aktarma_yolu(kaynak)
+                with st.spinner("Dosya parça parça okunuyor..."):
+                    rapor = depo.ingest(kaynak, ornekleme_frekansi=ornekleme_khz * 1000)
+            except (OSError, ValueError, ImportError) as hata:
+                st.error(f"Dalga formu içe aktarılamadı: {hata}")
+            else:
+                if rapor['atlandi']:
+                    st.info(f"{rapor['dosya']} daha önce içe aktarılmış.")
+                else:
+                    st.success(f"{rapor['dosya']}: {rapor['satir']:,} örnek, {len(rapor['sutunlar'])} sütun, "
+                               f"{rapor['boyut_mb']:,.1f} MB ({rapor['satir_per_saniye']:,.0f} satır/s)")
+
+        kayitlar = depo.listele()
+        if kayitlar.empty:
+            return
+        st.dataframe(kayitlar.style.format({
+            'Örnek Sayısı': '{:,}',
+            'Örnekleme (kHz)': '{:.1f}',
+            'Süre (s)': '{:,.2f}',
+            'Boyut (MB)': '{:,.1f}'
+        }))
+        anahtar = st.selectbox(
+            "Dalga Formu", kayitlar['Anahtar'],
+            format_func=lambda a: kayitlar.set_index('Anahtar').loc[a, 'Dosya'] + f" ({a[:8]})"
+        )
+        meta = depo.meta(anahtar)
+        sinyaller = [s for s in meta['sutunlar'] if s != meta['zaman_sutunu']]
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            secilen_sinyaller = st.multiselect("Sinyaller", sinyaller, default=sinyaller[:2])
+        with col2:
+            yontem = st.selectbox("Seyreltme Yöntemi", list(SEYRELTME_YONTEMLERI),
+                                  format_func=SEYRELTME_YONTEMLERI.get)
+        with col3:
+            nokta_sayisi = st.slider("Çizilen Nokta Sayısı", min_value=500, max_value=10000, value=4000, step=500)
+        baslangic_zamani = float(depo.zaman(anahtar, [0])[0])
+        bitis_zamani = float(depo.zaman(anahtar, [meta['satir'] - 1])[0])
+        zaman_araligi = st.slider("Zaman Aralığı (s)", min_value=baslangic_zamani, max_value=bitis_zamani,
+                                  value=(baslangic_zamani, bitis_zamani), format="%.4f")
+
+        fig_dalga = go.Figure()
+        for sinyal in secilen_sinyaller:
+            x, y = seyreltilmis_sinyal(depo, anahtar, sinyal, hedef=nokta_sayisi, baslangic_s=zaman_araligi[0],
+                                       bitis_s=zaman_araligi[1], yontem=yontem)
+            fig_dalga.add_trace(go.Scattergl(x=x, y=y, name=sinyal, mode='lines'))
+        fig_dalga.update_layout(
+            title=f"{meta['dosya']} - {SEYRELTME_YONTEMLERI[yontem]} ({nokta_sayisi:,} nokta / sinyal)",
+            xaxis_title="Zaman (s)",
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_dalga, use_container_width=True)
+
+        st.dataframe(sinyal_ozeti(depo, anahtar).style.format({
+            'Ortalama': '{:,.3f}', 'RMS': '{:,.3f}', 'En Küçük': '{:,.3f}', 'En Büyük': '{:,.3f}'
+        }))
+
+        # DC tarafı: ölçülen ortalama güç, Python modelinin aylık maksimum güç ortalamasıyla karşılaştırılır
+        col1, col2 = st.columns(2)
+        with col1:
+            gerilim_sutunu = st.selectbox("DC Gerilim Sinyali", sinyaller,
+                                          index=next((i for i, s in enumerate(sinyaller) if 'v' in s.lower()), 0))
+        with col2:
+            akim_sutunu = st.selectbox("DC Akım Sinyali", sinyaller,
+                                       index=next((i for i, s in enumerate(sinyaller) if 'i' in s.lower()), 0))
+        ort_guc, tepe_guc = ortalama_guc(depo, anahtar, gerilim_sutunu, akim_sutunu)
+        python_guc = float(np.mean(panel_data['Maksimum Güç (W)']))
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Simulink Ortalama Güç", f"{ort_guc:,.0f} W")
+        with col2:
+            st.metric("Simulink Tepe Güç", f"{tepe_guc:,.0f} W")
+        with col3:
+            st.metric("Python Ortalama Maksimum Güç", f"{python_guc:,.0f} W",
+                      delta=f"{(ort_guc - python_guc) / python_guc * 100:+.1f}% (Simulink farkı)")
 
 def simulink_karsilastirma(panel_data, solar_data, panel_parameters, results_with_counts_df):
     """
@@ -249,6 +366,9 @@ def simulink_karsilastirma(panel_data, solar_data, panel_parameters, results_wit
 
         submitted = st.form_submit_button("Karşılaştırmayı Güncelle")
 
+    # Aylık V/I değerleri yerine Simulink'te kaydedilen dalga formlarının doğrudan karşılaştırılması
+    dalga_formu_karsilastirma(panel_data)
+
     if 'yearly_energy' not in st.session_state:
         # Başlangıç değerlerini hesapla
         initial_power = [v * i for v, i in zip(simulink_data['Simulink_V'], simulink_data['Simulink_I'])]
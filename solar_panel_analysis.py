@@ -152,3 +152,38 @@ def calculate_panel_performance():
         'python_voltage': python_voltage,
         'python_current': python_current
     }
+
+def hourly_time_index(year=2025):
+    """
+    Bir yıllık (8760 saat) saatlik zaman indeksini oluşturur.
+    """
+    return pd.date_range(start=f"{year}-01-01", periods=8760, freq="h")
+
+def generate_hourly_production_profile(yearly_energy, daylight_hours, global_radiation, year=2025):
+    """
+    Aylık gün ışığı süresi ve global ışınım değerlerinden 8760 saatlik üretim profili (kWh) oluşturur.
+    Her gün, gün ışığı penceresi boyunca sinüs biçimli bir eğri ile dağıtılır ve yıllık toplam
+    yearly_energy değerine ölçeklenir.
+    """
+    zaman = hourly_time_index(year)
+    ay = zaman.month.values - 1
+    saat = zaman.hour.values + 0.5
+    gun_isigi = np.asarray(daylight_hours, dtype=float)[ay]
+    isinim = np.asarray(global_radiation, dtype=float)[ay]
+
+    # Güneş öğlesi 12:30 kabul edilir
+    dogus = 12.5 - gun_isigi / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        faz = np.where(gun_isigi > 0, (saat - dogus) / gun_isigi, -1.0)
+    sekil = np.where((faz > 0) & (faz < 1), np.sin(np.pi * faz), 0.0)
+
+    # Her günün eğrisini o ayın günlük ışınımına göre ölçekle
+    gun = zaman.dayofyear.values - 1
+    gunluk_toplam = np.bincount(gun, weights=sekil)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profil = np.where(gunluk_toplam[gun] > 0, sekil / gunluk_toplam[gun], 0.0) * isinim
+
+    toplam = profil.sum()
+    if toplam == 0:
+        return np.zeros(len(zaman))
+    return profil * (yearly_energy / toplam)
@@ -0,0 +1,197 @@
+# tarife_hesaplamalari.py
+
+import numpy as np
+import pandas as pd
+
+from solar_panel_analysis import hourly_time_index
+
+# ==========================================
+# Hazır Tarife Tanımları
+# ==========================================
+# Fiyatlar, kullanıcının girdiği elektrik birim fiyatına göre çarpan olarak tanımlanır.
+# Saat aralıkları [başlangıç, bitiş) biçimindedir; (22, 6) gibi aralıklar gece yarısını aşar.
+TEK_ZAMANLI_TARIFE = {
+    'ad': 'Tek Zamanlı',
+    'zaman_bantlari': [
+        {'ad': 'Tüm Gün', 'saatler': (0, 24), 'carpan': 1.00},
+    ],
+    'hafta_sonu_carpani': None,
+    'ihracat_orani': 0.85,      # Şebekeye satış fiyatı / alış fiyatı
+    'talep_ucreti': 0.0,        # TL/kW-ay
+    'sabit_ucret': 0.0,         # TL/ay
+    'mahsuplasma': 'saatlik',   # 'saatlik' veya 'aylik'
+    'ihracat_limiti': None,     # Yıllık ücretlendirilen satış limiti (kWh)
+}
+
+UC_ZAMANLI_TARIFE = {
+    'ad': 'Üç Zamanlı',
+    'zaman_bantlari': [
+        {'ad': 'Gündüz', 'saatler': (6, 17), 'carpan': 1.00},
+        {'ad': 'Puant', 'saatler': (17, 22), 'carpan': 1.55},
+        {'ad': 'Gece', 'saatler': (22, 6), 'carpan': 0.55},
+    ],
+    'hafta_sonu_carpani': None,
+    'ihracat_orani': 0.85,
+    'talep_ucreti': 0.0,
+    'sabit_ucret': 0.0,
+    'mahsuplasma': 'saatlik',
+    'ihracat_limiti': None,
+}
+
+HAZIR_TARIFELER = [TEK_ZAMANLI_TARIFE, UC_ZAMANLI_TARIFE]
+
+
+def saatlik_sebeke_akisi(saatlik_uretim, saatlik_tuketim):
+    """Saatlik üretim ve tüketimden öz tüketim, şebekeden alınan ve şebekeye verilen enerjiyi hesaplar."""
+    uretim = np.asarray(saatlik_uretim, dtype=float)
+    tuketim = np.asarray(saatlik_tuketim, dtype=float)
+    oz_tuketim = np.minimum(uretim, tuketim)
+    return {
+        'oz_tuketim': oz_tuketim,
+        'sebekeden_alinan': tuketim - oz_tuketim,
+        'sebekeye_verilen': uretim - oz_tuketim
+    }
+
+
+def _saat_carpanlari(tarife):
+    """Tarife bantlarından 24 saatlik fiyat çarpanı tablosunu oluşturur."""
+    carpanlar = np.full(24, np.nan)
+    saatler = np.arange(24)
+    for bant in tarife['zaman_bantlari']:
+        baslangic, bitis = bant['saatler']
+        if baslangic < bitis:
+            maske = (saatler >= baslangic) & (saatler < bitis)
+        else:
+            maske = (saatler >= baslangic) | (saatler < bitis)
+        carpanlar[maske] = bant['carpan']
+    if np.isnan(carpanlar).any():
+        raise ValueError(f"'{tarife['ad']}' tarifesinin zaman bantları günün tüm saatlerini kapsamıyor")
+    return carpanlar
+
+
+def saatlik_fiyat_dizisi(tarife, elektrik_birim_fiyat, zaman=None):
+    """Tarifeye göre yıl boyunca her saatin alış fiyatını (TL/kWh) döndürür."""
+    if zaman is None:
+        zaman = hourly_time_index()
+    fiyat = _saat_carpanlari(tarife)[zaman.hour.values] * elektrik_birim_fiyat
+    if tarife.get('hafta_sonu_carpani') is not None:
+        fiyat = np.where(zaman.dayofweek.values >= 5, fiyat * tarife['hafta_sonu_carpani'], fiyat)
+    return fiyat
+
+
+def _limit_uygula(miktar, limit):
+    """Kümülatif toplamı limiti aşan kısmı son eksende sıfırlar."""
+    if limit is None:
+        return miktar
+    onceki = np.cumsum(miktar, axis=-1) - miktar
+    return np.clip(limit - onceki, 0, None).clip(max=miktar)
+
+
+def tarife_fiyatlandir(sebekeden_alinan, sebekeye_verilen, tarife, elektrik_birim_fiyat, zaman=None):
+    """
+    Saatlik şebeke alış/satış dizilerini tek bir vektörel geçişte tarifeye göre fiyatlandırır.
+
+    Args:
+        sebekeden_alinan (array): Saatlik şebekeden alınan enerji (kWh), şekil (..., 8760).
+        sebekeye_verilen (array): Saatlik şebekeye verilen enerji (kWh), şekil (..., 8760).
+        tarife (dict): Tarife tanımı (bkz. TEK_ZAMANLI_TARIFE).
+        elektrik_birim_fiyat (float): Referans elektrik birim fiyatı (TL/kWh).
+        zaman (DatetimeIndex): Saatlik zaman indeksi; verilmezse 2025 yılı kullanılır.
+
+    Returns:
+        dict: Aylık (..., 12) dağılımlar ve yıllık net fatura (...).
+    """
+    if zaman is None:
+        zaman = hourly_time_index()
+    alinan = np.asarray(sebekeden_alinan, dtype=float)
+    verilen = np.asarray(sebekeye_verilen, dtype=float)
+
+    fiyat = saatlik_fiyat_dizisi(tarife, elektrik_birim_fiyat, zaman)
+    ihracat_fiyati = fiyat * tarife['ihracat_orani']
+
+    # Ay başlangıç indeksleri (zaman sıralı ve bitişik kabul edilir)
+    ay = zaman.month.values
+    ay_baslangic = np.flatnonzero(np.r_[True, ay[1:] != ay[:-1]])
+
+    def aylik(x):
+        return np.add.reduceat(x, ay_baslangic, axis=-1)
+
+    aylik_alinan = aylik(alinan)
+    aylik_verilen = aylik(verilen)
+    enerji_bedeli = aylik(alinan * fiyat)
+
+    if tarife['mahsuplasma'] == 'saatlik':
+        mahsup = np.zeros_like(aylik_alinan)
+        odenen_ihracat = _limit_uygula(verilen, tarife.get('ihracat_limiti'))
+        ihracat_geliri = aylik(odenen_ihracat * ihracat_fiyati)
+    elif tarife['mahsuplasma'] == 'aylik':
+        # Ay içindeki satış, aynı ayın alışından düşülür; mahsup edilen enerji
+        # ayın ortalama alış fiyatından, kalan fazla ise satış fiyatından değerlenir.
+        mahsup = np.minimum(aylik_alinan, aylik_verilen)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ort_alis_fiyati = np.where(aylik_alinan > 0, enerji_bedeli / aylik_alinan, 0.0)
+            ort_satis_fiyati = np.where(aylik_verilen > 0, aylik(verilen * ihracat_fiyati) / aylik_verilen, 0.0)
+        enerji_bedeli = enerji_bedeli - mahsup * ort_alis_fiyati
+        odenen_ihracat = _limit_uygula(aylik_verilen - mahsup, tarife.get('ihracat_limiti'))
+        ihracat_geliri = odenen_ihracat * ort_satis_fiyati
+    else:
+        raise ValueError(f"Bilinmeyen mahsuplaşma kuralı: {tarife['mahsuplasma']}")
+
+    talep_bedeli = np.maximum.reduceat(alinan, ay_baslangic, axis=-1) * tarife['talep_ucreti']
+    sabit_bedel = np.full_like(enerji_bedeli, tarife['sabit_ucret'])
+    net_fatura = enerji_bedeli + talep_bedeli + sabit_bedel - ihracat_geliri
+
+    return {
+        'alinan_kwh': aylik_alinan,
+        'verilen_kwh': aylik_verilen,
+        'mahsup_kwh': mahsup,
+        'enerji_bedeli': enerji_bedeli,
+        'talep_bedeli': talep_bedeli,
+        'sabit_bedel': sabit_bedel,
+        'ihracat_geliri': ihracat_geliri,
+        'net_fatura': net_fatura,
+        'yillik_fatura': net_fatura.sum(axis=-1)
+    }
+
+
+def tarife_tablosu(fiyatlandirma):
+    """Tek senaryoluk fiyatlandırma sonucunu aylık tabloya dönüştürür."""
+    aylar = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
+             'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']
+    return pd.DataFrame({
+        'Ay': aylar,
+        'Şebekeden Alınan (kWh)': fiyatlandirma['alinan_kwh'],
+        'Şebekeye Verilen (kWh)': fiyatlandirma['verilen_kwh'],
+        'Mahsup Edilen (kWh)': fiyatlandirma['mahsup_kwh'],
+        'Enerji Bedeli (TL)': fiyatlandirma['enerji_bedeli'],
+        'Talep Bedeli (TL)': fiyatlandirma['talep_bedeli'],
+        'Sabit Bedel (TL)': fiyatlandirma['sabit_bedel'],
+        'Satış Geliri (TL)': fiyatlandirma['ihracat_geliri'],
+        'Net Fatura (TL)': fiyatlandirma['net_fatura']
+    })
+
+
+def tarifeleri_karsilastir(saatlik_uretim, saatlik_tuketim, tarifeler, elektrik_birim_fiyat, zaman=None):
+    """
+    Aynı saatlik üretim/tüketim dizileri üzerinde birden çok tarifeyi karşılaştırır.
+    Üretim simülasyonu tekrar çalıştırılmaz; yalnızca şebeke akışları yeniden fiyatlandırılır.
+    """
+    akis = saatlik_sebeke_akisi(saatlik_uretim, saatlik_tuketim)
+    tuketim = np.asarray(saatlik_tuketim, dtype=float)
+
+    satirlar = []
+    for tarife in tarifeler:
+        pv_siz = tarife_fiyatlandir(tuketim, np.zeros_like(tuketim), tarife, elektrik_birim_fiyat, zaman)
+        pv_li = tarife_fiyatlandir(akis['sebekeden_alinan'], akis['sebekeye_verilen'],
+                                   tarife, elektrik_birim_fiyat, zaman)
+        satirlar.append({
+            'Tarife': tarife['ad'],
+            'Mahsuplaşma': tarife['mahsuplasma'],
+            'PV Olmadan Fatura (TL)': pv_siz['yillik_fatura'],
+            'PV ile Fatura (TL)': pv_li['yillik_fatura'],
+            'Satış Geliri (TL)': pv_li['ihracat_geliri'].sum(),
+            'Talep Bedeli (TL)': pv_li['talep_bedeli'].sum(),
+            'Yıllık Tasarruf (TL)': pv_siz['yillik_fatura'] - pv_li['yillik_fatura']
+        })
+
+    return pd.DataFrame(satirlar).sort_values('Yıllık Tasarruf (TL)', ascending=False, ignore_index=True)
@@ -73,12 +73,79 @@ C) BIC (Bayesian Information Criterion):
 - Model performans metrikleri
 """
 
+import os
+import time
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
 import plotly.graph_objects as go
 
+from backtesting import TEST_MODELLERI
+from exog_features import GENISLETILMIS_SUTUNLAR, iklim_ile_uzat, onbellekli_ozellik_matrisi
+from fast_forecast import HIZLI_MODELLER, hizli_model_karsilastirmasi, hizli_tahmin
+from forecast_jobs import ForecastJobQueue, geriye_donuk_isi
+from forecast_models import (
+    EXOG_SUTUNLARI,
+    ModelCache,
+    OrderSelectionStore,
+    bina_tuketim_verisi,
+    eksojen_veri,
+    kayitli_mertebe_secimi,
+    paralel_sarimax_fit,
+    varsayilan_isci_sayisi
+)
+from forecast_simulation import asim_olasiligi, donem_asim_olasiligi, kampus_yol_simulasyonu, yol_kantilleri
+from hierarchical_forecast import BINA_KATEGORILERI, UZLASTIRMA_YONTEMLERI, hiyerarsik_tahmin
+from hourly_forecast import derece_saat_eksojenleri, ornek_saatlik_tuketim, saatlik_model_fit, saatlik_tahmin
+from meter_ingestion import MIN_AY_KAPSAMASI, SayacDeposu
+
+MODEL_KAYNAKLARI = {
+    'onbellek': 'Önbellek',
+    'egitim': 'Eğitildi',
+    'filtre': 'Güncellendi (filtre)',
+    'isil_baslatma': 'Güncellendi (ön değerli yeniden eğitim)'
+}
+
+@st.cache_resource
+def model_onbellegini_ac():
+    """Eğitilmiş model önbelleğini oturumlar arasında paylaşılacak şekilde açar."""
+    return ModelCache()
+
+@st.cache_resource
+def mertebe_deposunu_ac():
+    """Bina başına seçilen SARIMAX mertebelerinin kayıt dosyasını açar."""
+    return OrderSelectionStore()
+
+@st.cache_resource
+def ozellik_onbellegini_ac():
+    """Eksojen özellik matrislerinin önbelleğini açar."""
+    return ModelCache(root=".cache/ozellikler")
+
+@st.cache_resource
+def tahmin_kuyrugunu_ac():
+    """Arka plan tahmin işleri kuyruğunu açar; işçi süreçler oturumlar arasında paylaşılır."""
+    return ForecastJobQueue()
+
+@st.cache_resource
+def geriye_donuk_kuyrugunu_ac():
+    """Geriye dönük test işleri kuyruğunu açar; kat tahminleri .cache/geriye_donuk önbelleğinde tutulur."""
+    return ForecastJobQueue(root=".cache/geriye_donuk_isleri", onbellek_kok=".cache/geriye_donuk",
+                            is_fonksiyonu=geriye_donuk_isi)
+
+@st.fragment(run_every=2)
+def tahmin_isi_durumu(kuyruk, anahtar, dugme="Tahmini Yenile"):
+    """
+    Bekleyen arka plan işinin durumunu yoklar; iş başarıyla bittiğinde sayfa yeni sonuçla yeniden
+    çalışır, hata verdiğinde hata gösterilir ve sayfa yenilenmez.
+    """
+    st.dataframe(kuyruk.isler().style.format({'Süre (s)': '{:.1f}'}))
+    if kuyruk.bekleyen_is(anahtar) is None:
+        if kuyruk.hata(anahtar) is None:
+            st.rerun()
+        st.error(f"İş başarısız oldu: {kuyruk.hata(anahtar)}. "
+                 f"Yeniden denemek için '{dugme}' düğmesini kullanın.")
+
 def show_time_series_analysis():
     st.markdown("""
     <div style='background: linear-gradient(90deg, #3498db, #2980b9); padding: 20px; border-radius: 10px; margin-bottom: 25px; text-align: center;'>
@@ -303,164 +370,59 @@ def show_time_series_analysis():
     # Bu açıklamadan sonra veri tablolarını gösterelim
     st.subheader("5 Yıllık Aylık Tüketim Verileri (2020-2024)")
 
-    # Bina tüketim verilerini güncelleyelim (günlük değerler x 30 gün)
-    binalar = {
-        'Fakülteler': [  # Min:220x30, Max:580x30, Ort:400x30
-            12000, 12600, 13200, 11400, 9900, 8250,   # 2020 (Ocak-Haziran)
-            6600, 7200, 10500, 12600, 14400, 15600,   # 2020 (Temmuz-Aralık)
-            12300, 12900, 13500, 11700, 10200, 8550,  # 2021
-            6900, 7500, 10800, 12900, 14700, 15900,
-            12600, 13200, 13800, 12000, 10500, 8850,  # 2022
-            7200, 7800, 11100, 13200, 15000, 16200,
-            12900, 13500, 14100, 12300, 10800, 9150,  # 2023
-            7500, 8100, 11400, 13500, 15300, 16500,
-            13200, 13800, 14400, 12600, 11100, 9450,  # 2024
-            7800, 8400, 11700, 13800, 15600, 17400
-        ],
-        'Kültürel ve Sosyal Alanlar': [  # Min:200x30, Max:590x30, Ort:395x30
-            10500, 11100, 11700, 9600, 8100, 6600,    # 2020
-            6000, 6600, 9600, 12000, 13500, 15000,
-            10800, 11400, 12000, 9900, 8400, 6900,    # 2021
-            6300, 6900, 9900, 12300, 13800, 15300,
-            11100, 11700, 12300, 10200, 8700, 7200,   # 2022
-            6600, 7200, 10200, 12600, 14100, 15600,
-            11400, 12000, 12600, 10500, 9000, 7500,   # 2023
-            6900, 7500, 10500, 12900, 14400, 15900,
-            11700, 12300, 12900, 10800, 9300, 7800,   # 2024
-            7200, 7800, 10800, 13200, 14700, 17700
-        ],
-        'Sağlık Tesisleri': [  # Min:200x30, Max:570x30, Ort:385x30
-            10200, 10800, 11400, 9300, 7800, 6300,    # 2020
-            6000, 6600, 9300, 11700, 13200, 14700,
-            10500, 11100, 11700, 9600, 8100, 6600,    # 2021
-            6300, 6900, 9600, 12000, 13500, 15000,
-            10800, 11400, 12000, 9900, 8400, 6900,    # 2022
-            6600, 7200, 9900, 12300, 13800, 15300,
-            11100, 11700, 12300, 10200, 8700, 7200,   # 2023
-            6900, 7500, 10200, 12600, 14100, 15600,
-            11400, 12000, 12600, 10500, 9000, 7500,   # 2024
-            7200, 7800, 10500, 12900, 14400, 17100
-        ],
-        'Araştırma ve Uygulama Merkezleri': [  # Min:180x30, Max:490x30, Ort:335x30
-            9000, 9600, 10200, 8100, 6600, 5700,      # 2020
-            5400, 6000, 8700, 10500, 12000, 13200,
-            9300, 9900, 10500, 8400, 6900, 6000,      # 2021
-            5700, 6300, 9000, 10800, 12300, 13500,
-            9600, 10200, 10800, 8700, 7200, 6300,     # 2022
-            6000, 6600, 9300, 11100, 12600, 13800,
-            9900, 10500, 11100, 9000, 7500, 6600,     # 2023
-            6300, 6900, 9600, 11400, 12900, 14100,
-            10200, 10800, 11400, 9300, 7800, 6900,    # 2024
-            6600, 7200, 9900, 11700, 13200, 14700
-        ],
-        'Spor Alanları': [  # Min:150x30, Max:370x30, Ort:260x30
-            6600, 7200, 7800, 6000, 5400, 4800,       # 2020
-            4500, 5100, 7200, 8700, 9900, 10500,
-            6900, 7500, 8100, 6300, 5700, 5100,       # 2021
-            4800, 5400, 7500, 9000, 10200, 10800,
-            7200, 7800, 8400, 6600, 6000, 5400,       # 2022
-            5100, 5700, 7800, 9300, 10500, 11100,
-            7500, 8100, 8700, 6900, 6300, 5700,       # 2023
-            5400, 6000, 8100, 9600, 10800, 11100,
-            7800, 8400, 9000, 7200, 6600, 6000,       # 2024
-            5700, 6300, 8400, 9900, 11100, 11100
-        ],
-        'Yemek ve Konaklama': [  # Min:80x30, Max:220x30, Ort:150x30
-            3900, 4200, 4800, 3600, 3000, 2700,       # 2020
-            2400, 2700, 3600, 4800, 5700, 6300,
-            4200, 4500, 5100, 3900, 3300, 3000,       # 2021
-            2700, 3000, 3900, 5100, 6000, 6600,
-            4500, 4800, 5400, 4200, 3600, 3300,       # 2022
-            3000, 3300, 4200, 5400, 6300, 6600,
-            4800, 5100, 5700, 4500, 3900, 3600,       # 2023
-            3300, 3600, 4500, 5700, 6600, 6600,
-            5100, 5400, 6000, 4800, 4200, 3900,       # 2024
-            3600, 3900, 4800, 6000, 6600, 6600
-        ],
-        'Park ve Açık Alanlar': [  # Min:15x30, Max:45x30, Ort:30x30
-            750, 840, 960, 600, 540, 480,             # 2020
-            450, 510, 750, 1050, 1200, 1290,
-            780, 870, 990, 630, 570, 510,             # 2021
-            480, 540, 780, 1080, 1230, 1320,
-            810, 900, 1020, 660, 600, 540,            # 2022
-            510, 570, 810, 1110, 1260, 1350,
-            840, 930, 1050, 690, 630, 570,            # 2023
-            540, 600, 840, 1140, 1290, 1350,
-            870, 960, 1080, 720, 660, 600,            # 2024
-            570, 630, 870, 1170, 1320, 1350
-        ],
-        'Helikopter Pisti': [  # Min:5x30, Max:10x30, Ort:7.5x30
-            210, 240, 270, 180, 150, 150,             # 2020
-            150, 180, 210, 240, 270, 300,
-            210, 240, 270, 180, 150, 150,             # 2021
-            150, 180, 210, 240, 270, 300,
-            210, 240, 270, 180, 150, 150,             # 2022
-            150, 180, 210, 240, 270, 300,
-            210, 240, 270, 180, 150, 150,             # 2023
-            150, 180, 210, 240, 270, 300,
-            210, 240, 270, 180, 150, 150,             # 2024
-            150, 180, 210, 240, 270, 300
-        ]
-    }
-
-    # Bu verileri tablo halinde gösterelim
-    df_binalar = pd.DataFrame(binalar)
-    # 5 yıllık veri olduğu için 60 aylık tarih aralığı oluşturuyoruz
-    df_binalar.index = pd.date_range(start="2020-01-01", periods=60, freq='M')
-    df_binalar.index.name = "Tarih"
+    df_binalar = bina_tuketim_verisi()
+
+    # Sayaç verisi içe aktarma: ölçülen aylık toplamlar, aynı bina ve aydaki tablo değerlerinin yerine geçer
+    sayac_deposu = SayacDeposu()
+    with st.expander("📥 Sayaç Verisi İçe Aktar (15 dakikalık CSV / Parquet)"):
+        st.markdown(
+            "Dosyalarda `sayac_id`, `bina`, `zaman` ve `tuketim_kwh` sütunları bulunmalıdır. "
+            "Dosyalar parça parça okunur, doğrulanır ve saatlik/günlük/aylık toplamlar olarak saklanır."
+        )
+        sayac_dosyalari = st.file_uploader(
+            "Sayaç dosyaları", type=["csv", "parquet"], accept_multiple_files=True
+        )
+        if sayac_dosyalari and st.button("İçe Aktar"):
+            raporlar = []
+            for dosya in sayac_dosyalari:
+                try:
+                    raporlar.append(sayac_deposu.ingest(dosya))
+                except (ValueError, OSError) as hata:
+                    st.error(f"{dosya.name} içe aktarılamadı: {hata}")
+            if raporlar:
+                st.dataframe(pd.DataFrame([
+                    {
+                        'Dosya': r['dosya'],
+                        'Okunan Satır': r['okunan_satir'],
+                        'Geçerli Satır': r['gecerli_satir'],
+                        'Reddedilen Satır': sum(r['reddedilen'].values()),
+                        'Hız (satır/s)': r['satir_per_saniye'],
+                        'Durum': 'Daha önce aktarıldı' if r['atlandi'] else 'Aktarıldı'
+                    }
+                    for r in raporlar
+                ]))
+
+    sayac_aylik = sayac_deposu.aylik_tuketim_tablosu()
+    ortak_binalar = sayac_aylik.columns.intersection(df_binalar.columns)
+    if len(ortak_binalar):
+        # Tablodaki ayların değerleri güncellenir; tablodan sonraki aylar, tüm binalar için ölçüm
+        # varsa seriye eklenir (modeller bu aylarla artımlı olarak güncellenir)
+        df_binalar.update(sayac_aylik[ortak_binalar])
+        if len(ortak_binalar) == len(df_binalar.columns):
+            yeni_aylar = sayac_aylik.loc[sayac_aylik.index > df_binalar.index[-1], df_binalar.columns].dropna()
+            beklenen = pd.date_range(df_binalar.index[-1] + pd.offsets.MonthEnd(1), periods=len(yeni_aylar), freq='M')
+            ardisik = (yeni_aylar.index == beklenen).cumprod().astype(bool)
+            df_binalar = pd.concat([df_binalar, yeni_aylar[ardisik]])
+            df_binalar.index = pd.DatetimeIndex(df_binalar.index, freq='M', name="Tarih")
+        st.info(f"Sayaç verisi kullanılan binalar: {', '.join(ortak_binalar)}")
+        kismi_aylar = int((sayac_deposu.aylik_kapsama()[ortak_binalar] < MIN_AY_KAPSAMASI).sum().sum())
+        if kismi_aylar:
+            st.caption(f"Saatlerinin %{MIN_AY_KAPSAMASI * 100:.0f}'inden azında okuma bulunan {kismi_aylar} "
+                       f"bina-ay kısmi kabul edildi; bu aylarda tablo değerleri korunur.")
     st.subheader("ESOGÜ - 5 Yıllık (Aylık) Tüketim Verileri (2020-2024)")
     st.dataframe(df_binalar)
 
-    # Eskişehir için hava durumu ve diğer faktörleri içeren detaylı veri seti
-    weather_factors = {
-        'Sicaklik': [  # Eskişehir aylık ortalama sıcaklıklar (°C)
-            0.5, 2.1, 6.3, 11.2, 16.1, 20.3, 23.5, 23.1, 18.4, 12.7, 6.8, 2.4,   # 2020
-            0.3, 1.9, 6.1, 11.0, 15.9, 20.1, 23.3, 22.9, 18.2, 12.5, 6.6, 2.2,   # 2021
-            0.4, 2.0, 6.2, 11.1, 16.0, 20.2, 23.4, 23.0, 18.3, 12.6, 6.7, 2.3,   # 2022
-            0.6, 2.2, 6.4, 11.3, 16.2, 20.4, 23.6, 23.2, 18.5, 12.8, 6.9, 2.5,   # 2023
-            0.7, 2.3, 6.5, 11.4, 16.3, 20.5, 23.7, 23.3, 18.6, 12.9, 7.0, 2.6,   # 2024
-            0.5, 2.1, 6.3, 11.2, 16.1, 20.3, 23.5, 23.1, 18.4, 12.7, 6.8, 2.4    # 2025 (tahmin)
-        ],
-        'Nem': [  # Eskişehir aylık ortalama nem oranı (%)
-            76, 73, 68, 63, 59, 55, 50, 50, 55, 65, 72, 77,  # 2020
-            75, 72, 67, 62, 58, 54, 49, 49, 54, 64, 71, 76,  # 2021
-            77, 74, 69, 64, 60, 56, 51, 51, 56, 66, 73, 78,  # 2022
-            76, 73, 68, 63, 59, 55, 50, 50, 55, 65, 72, 77,  # 2023
-            75, 72, 67, 62, 58, 54, 49, 49, 54, 64, 71, 76,  # 2024
-            76, 73, 68, 63, 59, 55, 50, 50, 55, 65, 72, 77   # 2025 (tahmin)
-        ],
-        'Guneslenme': [  # Günlük ortalama güneşlenme süresi (saat)
-            3, 4, 5, 7, 9, 11, 12, 11, 9, 6, 4, 3,  # 2020-2025 için tekrar
-        ] * 6
-    }
-
-    # Üniversite aktivite faktörleri
-    university_factors = {
-        'Donem_Aktivitesi': [  # Akademik dönem aktivite oranı (0-1 arası)
-            0.85, 0.90, 0.95, 0.95, 0.80, 0.40,  # Ocak-Haziran (Final ve yaz başlangıcı)
-            0.20, 0.20, 0.70, 0.95, 0.95, 0.70,  # Temmuz-Aralık (Yaz tatili ve dönem başlangıcı)
-        ] * 6,
-        
-        'Mesai_Saatleri': [  # Mesai saatleri yoğunluğu (0-1 arası)
-            0.80, 0.80, 0.85, 0.85, 0.85, 0.50,  # Ocak-Haziran
-            0.30, 0.30, 0.80, 0.85, 0.85, 0.70,  # Temmuz-Aralık
-        ] * 6,
-        
-        'Hafta_Sonu_Etkisi': [  # Hafta sonu düşüş faktörü (0-1 arası, 1: tam düşüş)
-            0.70, 0.70, 0.70, 0.70, 0.70, 0.90,  # Ocak-Haziran
-            0.95, 0.95, 0.70, 0.70, 0.70, 0.80,  # Temmuz-Aralık
-        ] * 6
-    }
-
-    # Tüm faktörleri tek bir DataFrame'de birleştirelim
-    df_exog = pd.DataFrame({
-        'Sicaklik': weather_factors['Sicaklik'],
-        'Nem': weather_factors['Nem'],
-        'Guneslenme': weather_factors['Guneslenme'],
-        'Donem_Aktivitesi': university_factors['Donem_Aktivitesi'],
-        'Mesai_Saatleri': university_factors['Mesai_Saatleri'],
-        'Hafta_Sonu_Etkisi': university_factors['Hafta_Sonu_Etkisi']
-    }, index=pd.date_range("2020-01-01", periods=72, freq='M'))
+    df_exog = eksojen_veri()
 
     # Sıcaklık verileri (aylık ortalama) - 2 yıllık + 2025 için tahmini
     # 36 ay (2023-01'den 2025-12'ye kadar)
@@ -497,6 +459,30 @@ def show_time_series_analysis():
     st.dataframe(df_exog.head(24))  # İlk 24 ay
     st.write("... (2025 yılı için de tahmini veriler eklenmiştir, toplam 72 satır)")
 
+    # Model eksojenleri: özgün 6 sütun veya gecikmeler, derece-günler ve takvim terimleriyle
+    # genişletilmiş özellik matrisi. Matris kaynak veri özetiyle önbelleğe alınır ve tüm bina
+    # modelleri tarafından paylaşılır. Eksojen tablo, son gözlenen aydan (sayaç verisiyle 2024'ün
+    # ötesine uzayabilir) sonraki 12 ayı kapsayacak kadar iklim normalleriyle uzatılır.
+    egitim_bitis = df_binalar.index[-1]
+    ek_ay = max(0, ((egitim_bitis + pd.offsets.MonthEnd(12)).to_period('M') - df_exog.index[-1].to_period('M')).n)
+    ozellik_seti = st.selectbox(
+        "Eksojen Özellik Seti",
+        ["Temel (6 sütun)", "Genişletilmiş (gecikmeler, derece-gün, takvim)"],
+        help="Genişletilmiş set: " + ", ".join(GENISLETILMIS_SUTUNLAR)
+    )
+    if ozellik_seti.startswith("Genişletilmiş"):
+        df_model_exog, ozellik_onbellekten, ozellik_suresi = onbellekli_ozellik_matrisi(
+            df_exog, onbellek=ozellik_onbellegini_ac(), ufuk=ek_ay
+        )
+        eksojen_sutunlari = GENISLETILMIS_SUTUNLAR
+        st.caption(f"Özellik matrisi: {df_model_exog.shape[0]} ay × {df_model_exog.shape[1]} sütun, "
+                   f"{'önbellekten okundu' if ozellik_onbellekten else 'üretildi'} ({ozellik_suresi * 1000:.1f} ms)")
+        with st.expander("Özellik Matrisi"):
+            st.dataframe(df_model_exog.style.format('{:.2f}'))
+    else:
+        df_model_exog = iklim_ile_uzat(df_exog, ileri=ek_ay)
+        eksojen_sutunlari = EXOG_SUTUNLARI
+
     # --------------------------------------------------------------------
     # 3) TAHMİNLER (SARIMAX) - 2025 Yılı (12 Ay)
     # --------------------------------------------------------------------
@@ -517,57 +503,440 @@ def show_time_series_analysis():
     # => Forecast için exog'un 2025-01 ~ 2025-12 verilerini kullanacağız.
 
     # Eğitim verisi için son 2 yılı alalım (2023-2024)
-    train_data = df_binalar.loc["2023-01-31":"2024-12-31"]  # 24 ay
-    train_exog = df_exog.loc["2023-01-31":"2024-12-31"]
+    # Yeni aylar geldikçe eğitim penceresi serinin sonuna kadar uzar
+    train_data = df_binalar.loc["2023-01-31":egitim_bitis]  # 24 ay (+ yeni aylar)
+    train_exog = df_model_exog.loc["2023-01-31":egitim_bitis]
 
-    forecast_exog = df_exog.loc["2025-01-31":"2025-12-31"]  # 12 ay (2025)
+    forecast_exog = df_model_exog.loc[egitim_bitis + pd.offsets.MonthEnd(1):].iloc[:12]  # son aydan sonraki 12 ay
     
-    # Model parametreleri
-    p, d, q = 1, 0, 1
-    P, D, Q, s = 1, 0, 1, 12
+    # Paralel eğitim ayarı: paylaşımlı sunucularda işçi süreç sayısı sınırlandırılabilir
+    maks_isci = st.slider(
+        "Maksimum İşçi Süreç Sayısı",
+        min_value=1,
+        max_value=max(os.cpu_count() or 1, 2),
+        value=min(varsayilan_isci_sayisi(), os.cpu_count() or 1),
+        help="Bina modelleri bu sayıda süreçte paralel eğitilir (TAHMIN_ISCI_SAYISI ortam değişkeniyle de sınırlanabilir)"
+    )
+
+    # Tahmin modu: bina başına SARIMAX veya tüm binaları tek matris işlemiyle tahmin eden hızlı modeller
+    tahmin_modu = st.selectbox(
+        "Tahmin Modu",
+        ["SARIMAX"] + [f"Hızlı: {ad}" for ad in HIZLI_MODELLER.values()],
+        help="Hızlı modeller tüm bina sütunlarını aynı anda, milisaniyeler içinde tahmin eder"
+    )
+    model_adi = "SARIMAX"
+    mertebeler = None
+    # Tahminlerin ait olduğu dönemin eksojenleri; arka plandaki eski bir sonuç kendi dönemiyle gösterilir
+    tahmin_exog = forecast_exog[eksojen_sutunlari]
+
+    if tahmin_modu == "SARIMAX":
+        # Mertebe seçimi: sabit (1,0,1)(1,0,1,12) veya bina başına sınırlı ızgara araması.
+        # Aramanın sonucu diske yazılır; eğitim verisi değişmedikçe sonraki çalıştırmalar aramayı atlar.
+        mertebe_modu = st.selectbox(
+            "SARIMAX Mertebe Seçimi",
+            ["Sabit (1,0,1)(1,0,1,12)", "Otomatik Seçim (AIC)"],
+            help="Otomatik seçim, (p,d,q) ≤ (2,1,2) ve (P,D,Q) ≤ (1,0,1) ızgarasını paralel olarak tarar; "
+                 "yakınsamayan veya AIC'si açıkça kötü olan adayların türevleri budanır"
+        )
+        if mertebe_modu.startswith("Otomatik"):
+            baslangic = time.perf_counter()
+            with st.spinner("Mertebe araması yapılıyor..."):
+                mertebeler, arama_tablosu, aranan_binalar = kayitli_mertebe_secimi(
+                    train_data, train_exog[eksojen_sutunlari], mertebe_deposunu_ac(), maks_isci=maks_isci
+                )
+            arama_suresi = time.perf_counter() - baslangic
+            if aranan_binalar:
+                denenen = arama_tablosu['Yakınsadı'].notna()
+                st.info(f"{len(aranan_binalar)} bina için {int(denenen.sum())} aday eğitildi, "
+                        f"{int((~denenen).sum())} aday budandı, "
+                        f"{int((arama_tablosu['Yakınsadı'] == False).sum())} aday yakınsamadı ({arama_suresi:.2f} s).")
+            else:
+                st.info(f"Tüm binalar için kayıtlı mertebe seçimi kullanıldı ({arama_suresi:.2f} s).")
+            st.dataframe(pd.DataFrame({
+                'Bina': list(mertebeler),
+                '(p, d, q)': [str(order) for order, _ in mertebeler.values()],
+                '(P, D, Q, s)': [str(seasonal_order) for _, seasonal_order in mertebeler.values()]
+            }))
+
+        calistirma_modu = st.radio(
+            "Model Eğitimi",
+            ["Arka Planda (İş Kuyruğu)", "Sayfa İçinde"],
+            horizontal=True,
+            help="Arka planda eğitimde sayfa beklemez: son tamamlanan tahmin hemen gösterilir, "
+                 "güncel girdiler için iş kuyruğa eklenir ve bitince sayfa yenilenir"
+        )
+        if calistirma_modu.startswith("Arka"):
+            # Eğitim ve tahmin işçi süreçte yapılır; sonuç girdi özetiyle diske yazılır.
+            # Aynı girdiler için bekleyen iş varsa yenisi açılmaz.
+            kuyruk = tahmin_kuyrugunu_ac()
+            is_girdileri = (train_data, train_exog[eksojen_sutunlari], forecast_exog[eksojen_sutunlari], mertebeler)
+            is_anahtari = kuyruk.anahtar(*is_girdileri)
+            if st.button("🔄 Tahmini Yenile", help="Modelleri önbellek kullanmadan yeniden eğitecek işi kuyruğa ekler"):
+                kuyruk.gonder(is_anahtari, *is_girdileri, yenile=True)
+            is_sonucu = kuyruk.sonuc(is_anahtari)
+            if is_sonucu is None:
+                kuyruk.gonder(is_anahtari, *is_girdileri)
+                is_sonucu = kuyruk.son_tamamlanan()
+                # Eski sonuç yalnızca aynı binalar ve aynı ufuk uzunluğu için gösterilebilir
+                if is_sonucu is not None and (
+                        [sonuc['bina'] for sonuc in is_sonucu['sonuclar']] != list(train_data.columns)
+                        or len(is_sonucu['forecast_exog']) != len(forecast_exog)):
+                    is_sonucu = None
+                if is_sonucu is not None:
+                    bitis = pd.Timestamp(is_sonucu['bitis'], unit='s', tz='UTC').tz_convert('Europe/Istanbul')
+                    durum = ("arka planda hazırlanıyor" if kuyruk.bekleyen_is(is_anahtari) is not None
+                             else "üretilemedi")
+                    st.warning(f"Güncel girdiler için tahmin {durum}; "
+                               f"{bitis:%d.%m.%Y %H:%M} tarihinde tamamlanan son tahmin gösteriliyor.")
+            if kuyruk.bekleyen_is(is_anahtari) is not None:
+                tahmin_isi_durumu(kuyruk, is_anahtari)
+            else:
+                if kuyruk.hata(is_anahtari) is not None:
+                    st.error(f"Bu girdiler için tahmin işi başarısız oldu: {kuyruk.hata(is_anahtari)}. "
+                             f"İş otomatik olarak yeniden gönderilmez; yeniden denemek için "
+                             f"'Tahmini Yenile' düğmesini kullanın.")
+                if not kuyruk.isler().empty:
+                    st.dataframe(kuyruk.isler().style.format({'Süre (s)': '{:.1f}'}))
+
+            if is_sonucu is None:
+                fit_sonuclari = None
+                if kuyruk.hata(is_anahtari) is None:
+                    st.info("İlk tahmin arka planda hazırlanıyor; tamamlandığında sayfa kendiliğinden yenilenecek.")
+            else:
+                fit_sonuclari = is_sonucu['sonuclar']
+                duvar_suresi = is_sonucu['duvar_suresi']
+                isci_sayisi = is_sonucu['isci_sayisi']
+                tahmin_exog = is_sonucu['forecast_exog']
+                onbellek_durumu = is_sonucu.get('onbellek_durumu')
+                arka_plan = True
+        else:
+            # Tüm bina modelleri süreç havuzunda eğitilir, sonuçlar bina sırasına göre işlenir.
+            # Eğitim verisi ve ayarlar değişmedikçe modeller önbellekten (bellek veya disk) okunur.
+            model_onbellegi = model_onbellegini_ac()
+            fit_sonuclari, duvar_suresi, isci_sayisi = paralel_sarimax_fit(
+                train_data, train_exog[eksojen_sutunlari], forecast_exog[eksojen_sutunlari],
+                maks_isci=maks_isci, onbellek=model_onbellegi, mertebeler=mertebeler
+            )
+            onbellek_durumu = model_onbellegi.stats()
+            arka_plan = False
+
+    if tahmin_modu == "SARIMAX" and fit_sonuclari is not None:
+        yeni_egitilen = [sonuc for sonuc in fit_sonuclari if sonuc['kaynak'] != 'onbellek']
+        toplam_fit_suresi = sum(sonuc['sure'] for sonuc in yeni_egitilen)
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("İşçi Süreç Sayısı", isci_sayisi)
+        with col2:
+            st.metric("Toplam Süre", f"{duvar_suresi:.2f} s", help="Tüm modellerin eğitimi için geçen duvar saati süresi")
+        with col3:
+            st.metric("Hızlanma", f"{toplam_fit_suresi / duvar_suresi:.2f}x" if yeni_egitilen else "-",
+                      help="Bu çalıştırmada eğitilen modellerin eğitim sürelerinin toplamı / duvar saati süresi")
+        with col4:
+            if onbellek_durumu is None:
+                st.metric("Model Önbelleği", "-",
+                          help="Bu sonuçta önbellek kullanılmadı: modeller yeniden eğitildi (Tahmini Yenile)")
+            else:
+                st.metric("Model Önbelleği (İsabet / Iskalama)",
+                          f"{onbellek_durumu['isabet']} / {onbellek_durumu['iskalama']}",
+                          help=f"Diskten okunan: {onbellek_durumu['disk_isabeti']}"
+                               + ("; modeller iş kuyruğunun işçi sürecinde eğitildi" if arka_plan else ""))
+        st.dataframe(pd.DataFrame({
+            'Bina': [sonuc['bina'] for sonuc in fit_sonuclari],
+            'Eğitim Süresi (s)': [sonuc['sure'] for sonuc in fit_sonuclari],
+            'Kaynak': [MODEL_KAYNAKLARI[sonuc['kaynak']] for sonuc in fit_sonuclari]
+        }).style.format({'Eğitim Süresi (s)': '{:.3f}'}))
+    elif tahmin_modu != "SARIMAX":
+        model_adi = tahmin_modu.split(": ", 1)[1]
+        hizli_model = next(anahtar for anahtar, ad in HIZLI_MODELLER.items() if ad == model_adi)
+        fit_sonuclari, hizli_sure = hizli_tahmin(
+            train_data, train_exog[eksojen_sutunlari], forecast_exog[eksojen_sutunlari], model=hizli_model
+        )
+        st.metric("Toplam Süre", f"{hizli_sure * 1000:.2f} ms",
+                  help=f"{len(fit_sonuclari)} binanın tamamı için eğitim ve tahmin süresi")
+
+    # Hızlı modellerin SARIMAX ile karşılaştırması: serinin son 12 ayı ayrılarak doğruluk ve süre ölçülür
+    with st.expander("⚡ Hızlı Modeller ve SARIMAX Karşılaştırması"):
+        if st.button("Karşılaştırmayı Çalıştır"):
+            with st.spinner("Modeller eğitiliyor..."):
+                karsilastirma, bina_hatalari = hizli_model_karsilastirmasi(
+                    df_binalar, df_model_exog, eksojen_sutunlari, maks_isci=maks_isci
+                )
+            st.dataframe(karsilastirma.style.format({
+                'Süre (ms)': '{:,.2f}',
+                'Ortalama MAPE (%)': '{:.2f}',
+                'Ortalama RMSE (kWh)': '{:,.0f}',
+                "SARIMAX'a Göre Hızlanma": '{:,.0f}x'
+            }))
+            st.dataframe(bina_hatalari.pivot(index='Bina', columns='Model', values='MAPE (%)')
+                         .style.format('{:.2f}'))
+
+    # Geriye dönük test: her kat için modeller yeniden eğitilir, ufuk başına MAPE/RMSE raporlanır.
+    # Kat tahminleri önbelleğe yazıldığından yalnızca yeni veya değişen katlar hesaplanır.
+    with st.expander("🔁 Geriye Dönük Test (Backtesting)"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            pencere_yontemi = st.radio("Eğitim Penceresi", ["Kayan (24 ay)", "Genişleyen"])
+        with col2:
+            kat_adimi = st.slider("Katlar Arası Adım (ay)", min_value=1, max_value=12, value=6)
+        with col3:
+            test_modelleri = st.multiselect("Modeller", list(TEST_MODELLERI.values()),
+                                            default=list(TEST_MODELLERI.values()))
+        # Test arka plan iş kuyruğunda çalışır; sayfa beklemez, iş bitince fragment sayfayı yeniler
+        test_kuyrugu = geriye_donuk_kuyrugunu_ac()
+        if st.button("Geriye Dönük Testi Çalıştır") and test_modelleri:
+            test_girdileri = (df_binalar, df_model_exog.loc[df_binalar.index, eksojen_sutunlari], eksojen_sutunlari, {
+                'modeller': [anahtar for anahtar, ad in TEST_MODELLERI.items() if ad in test_modelleri],
+                'adim': kat_adimi,
+                'yontem': 'kayan' if pencere_yontemi.startswith("Kayan") else 'genisleyen',
+                'mertebeler': mertebeler
+            })
+            st.session_state.geriye_donuk_anahtari = test_kuyrugu.anahtar(*test_girdileri)
+            test_kuyrugu.gonder(st.session_state.geriye_donuk_anahtari, *test_girdileri, tekrar_dene=True)
+
+        test_anahtari = st.session_state.get('geriye_donuk_anahtari')
+        test_sonucu = test_kuyrugu.sonuc(test_anahtari) if test_anahtari is not None else None
+        if test_anahtari is not None and test_kuyrugu.bekleyen_is(test_anahtari) is not None:
+            st.info("Geriye dönük test arka planda çalışıyor; tamamlandığında sonuçlar burada gösterilecek.")
+            tahmin_isi_durumu(test_kuyrugu, test_anahtari, dugme="Geriye Dönük Testi Çalıştır")
+        elif test_anahtari is not None and test_kuyrugu.hata(test_anahtari) is not None:
+            st.error(f"Geriye dönük test başarısız oldu: {test_kuyrugu.hata(test_anahtari)}")
+
+        if test_sonucu is not None:
+            st.caption(f"{test_sonucu['kat_sayisi']} kat, {test_sonucu['hesaplanan']} yeni tahmin, "
+                       f"{test_sonucu['onbellekten']} önbellekten, {test_sonucu['sure']:.2f} s")
+            fig_test = go.Figure()
+            for ad, grup in test_sonucu['ufuk'].groupby('Model', sort=False):
+                fig_test.add_trace(go.Scatter(x=grup['Ufuk (ay)'], y=grup['MAPE (%)'], name=ad,
+                                              mode='lines+markers'))
+            fig_test.update_layout(
+                title="Tahmin Ufkuna Göre MAPE",
+                xaxis_title="Ufuk (ay)",
+                yaxis_title="MAPE (%)",
+                hovermode='x unified'
+            )
+            st.plotly_chart(fig_test, use_container_width=True)
+            st.dataframe(test_sonucu['ozet'].style.format({'MAPE (%)': '{:.2f}', 'RMSE (kWh)': '{:,.0f}'}))
+            st.info(f"Geriye dönük teste göre en düşük ortalama MAPE: **{test_sonucu['ozet']['Model'].iloc[0]}**")
+
+    # Hiyerarşik tahmin: bina, kategori ve kampüs serileri ayrı ayrı tahmin edilip
+    # toplamların tutarlı olması için uzlaştırılır (bina → kategori → kampüs)
+    with st.expander("🏛️ Hiyerarşik Kampüs Tahmini"):
+        col1, col2 = st.columns(2)
+        with col1:
+            hiyerarsi_modeli = st.selectbox("Taban Model", list(HIZLI_MODELLER.values()), index=1)
+        with col2:
+            uzlastirma_yontemi = st.selectbox("Uzlaştırma Yöntemi", list(UZLASTIRMA_YONTEMLERI.values()), index=2)
+        hiyerarsi_sonucu = hiyerarsik_tahmin(
+            train_data, BINA_KATEGORILERI, ufuk=len(forecast_exog),
+            model=next(anahtar for anahtar, ad in HIZLI_MODELLER.items() if ad == hiyerarsi_modeli),
+            yontem=next(anahtar for anahtar, ad in UZLASTIRMA_YONTEMLERI.items() if ad == uzlastirma_yontemi),
+            train_exog=train_exog[eksojen_sutunlari], forecast_exog=forecast_exog[eksojen_sutunlari],
+            zaman=forecast_exog.index
+        )
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Taban Tahmin Tutarsızlığı", f"{hiyerarsi_sonucu['tutarsizlik']:,.0f} kWh",
+                      help="Uzlaştırma öncesinde toplam düğümler ile alt düğümlerinin toplamı arasındaki en büyük aylık fark")
+        with col2:
+            st.metric("MinT Daraltma Katsayısı",
+                      f"{hiyerarsi_sonucu['daraltma']:.2f}" if hiyerarsi_sonucu['daraltma'] is not None else "-")
+        with col3:
+            st.metric("Süre", f"{hiyerarsi_sonucu['sure'] * 1000:.1f} ms")
+
+        kategori_tahmini = hiyerarsi_sonucu['uzlastirilmis']['Kategori']
+        fig_hiyerarsi = go.Figure()
+        for kategori in kategori_tahmini.columns:
+            fig_hiyerarsi.add_trace(go.Bar(x=kategori_tahmini.index, y=kategori_tahmini[kategori], name=kategori))
+        fig_hiyerarsi.add_trace(go.Scatter(
+            x=kategori_tahmini.index, y=hiyerarsi_sonucu['taban']['Kampüs'].iloc[:, 0],
+            name='Kampüs (Taban Tahmin)', line=dict(color='black', dash='dash'), mode='lines+markers'
+        ))
+        fig_hiyerarsi.update_layout(
+            title="Uzlaştırılmış Kategori Tahminleri ve Kampüs Taban Tahmini (2025)",
+            xaxis_title="Tarih",
+            yaxis_title="Tüketim (kWh)",
+            barmode='stack',
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_hiyerarsi, use_container_width=True)
+        st.dataframe(hiyerarsi_sonucu['ozet'].style.format({
+            'Taban Tahmin (kWh)': '{:,.0f}',
+            'Uzlaştırılmış Tahmin (kWh)': '{:,.0f}',
+            'Düzeltme (%)': '{:+.2f}'
+        }))
+
+    # Saatlik tahmin: uzun saatlik seriler (5 yılda 43.800 nokta) için Fourier terimli iki aşamalı model.
+    # Sayaç deposunda en az 4 haftalık saatlik veri bulunan binalar için gerçek veri, diğerleri için
+    # yük profili şablonlarından üretilen 5 yıllık örnek seri kullanılır.
+    with st.expander("⏱️ Saatlik Tahmin (Uzun Seriler)"):
+        col1, col2 = st.columns(2)
+        with col1:
+            saatlik_bina = st.selectbox("Bina", list(df_binalar.columns), key="saatlik_bina")
+        with col2:
+            saatlik_ufuk = st.slider("Tahmin Ufku (saat)", min_value=24, max_value=336, value=168, step=24)
+
+        if st.button("Saatlik Modeli Eğit"):
+            sayac_saatlik = sayac_deposu.tablo('saatlik')
+            sayac_saatlik = sayac_saatlik[sayac_saatlik['bina'] == saatlik_bina]
+            if len(sayac_saatlik) >= 4 * 168:
+                y_saatlik = (sayac_saatlik.set_index('zaman')['Tüketim (kWh)']
+                             .asfreq('h').interpolate(limit_direction='both'))
+                veri_kaynagi = "Sayaç verisi"
+            else:
+                y_saatlik = ornek_saatlik_tuketim(saatlik_bina, df_binalar[saatlik_bina].iloc[-12:].sum(),
+                                                  df_exog['Sicaklik'])
+                veri_kaynagi = "Yük profili şablonundan örnek seri"
+
+            gelecek_zaman = pd.date_range(y_saatlik.index[-1] + pd.Timedelta(hours=1), periods=saatlik_ufuk, freq='h')
+            derece_saat = derece_saat_eksojenleri(df_exog['Sicaklik'], y_saatlik.index.append(gelecek_zaman))
+            with st.spinner("Saatlik model eğitiliyor..."):
+                saatlik_fit = saatlik_model_fit(y_saatlik.to_numpy(), y_saatlik.index, derece_saat[:len(y_saatlik)])
+            st.session_state.saatlik_tahmin_sonucu = {
+                'bina': saatlik_bina,
+                'kaynak': veri_kaynagi,
+                'gecmis': y_saatlik.iloc[-2 * 168:],
+                'tahmin': saatlik_tahmin(saatlik_fit, gelecek_zaman, derece_saat[len(y_saatlik):]),
+                'gozlem': saatlik_fit['gozlem'],
+                'sure': saatlik_fit['sure'],
+                'terim': len(saatlik_fit['beta'])
+            }
+
+        if 'saatlik_tahmin_sonucu' in st.session_state:
+            saatlik_sonuc = st.session_state.saatlik_tahmin_sonucu
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Gözlem Sayısı", f"{saatlik_sonuc['gozlem']:,}", saatlik_sonuc['kaynak'], delta_color="off")
+            with col2:
+                st.metric("Eğitim Süresi", f"{saatlik_sonuc['sure']:.2f} s")
+            with col3:
+                st.metric("Regresyon Terimi", saatlik_sonuc['terim'],
+                          help="Sabit terim, günlük/haftalık/yıllık Fourier terimleri ve ısıtma/soğutma derece-saatleri")
+
+            saatlik_tahmin_tablosu = saatlik_sonuc['tahmin']
+            fig_saatlik = go.Figure()
+            fig_saatlik.add_trace(go.Scatter(
+                x=saatlik_sonuc['gecmis'].index, y=saatlik_sonuc['gecmis'].values,
+                name='Geçmiş Tüketim', line=dict(color='blue')
+            ))
+            fig_saatlik.add_trace(go.Scatter(
+                x=saatlik_tahmin_tablosu.index, y=saatlik_tahmin_tablosu['Tahmin (kWh)'],
+                name='Tahmin', line=dict(color='red', dash='dash')
+            ))
+            fig_saatlik.add_trace(go.Scatter(
+                x=list(saatlik_tahmin_tablosu.index) + list(saatlik_tahmin_tablosu.index[::-1]),
+                y=list(saatlik_tahmin_tablosu['Alt (kWh)']) + list(saatlik_tahmin_tablosu['Üst (kWh)'][::-1]),
+                fill='toself',
+                fillcolor='rgba(255, 0, 0, 0.2)',
+                line=dict(color='rgba(255,255,255,0)'),
+                name='95% Güven Aralığı'
+            ))
+            fig_saatlik.update_layout(
+                title=f"{saatlik_sonuc['bina']} - Saatlik Tahmin",
+                xaxis_title="Zaman",
+                yaxis_title="Tüketim (kWh)",
+                hovermode='x unified'
+            )
+            st.plotly_chart(fig_saatlik, use_container_width=True)
+
+    # Olasılıksal simülasyon: eğitilmiş SARIMAX modellerinden binalar arası korelasyonlu binlerce
+    # gelecek yolu çekilir; kantiller, kapasite aşım olasılıkları ve kampüs toplamı dağılımı yollardan hesaplanır
+    with st.expander("🎲 Olasılıksal Senaryo Simülasyonu"):
+        if tahmin_modu != "SARIMAX":
+            st.info("Yol simülasyonu eğitilmiş SARIMAX modellerini kullanır; Tahmin Modu olarak SARIMAX seçin.")
+        elif fit_sonuclari is None:
+            st.info("SARIMAX tahmini henüz hazır değil; simülasyon arka plan işi başarıyla tamamlandığında kullanılabilir.")
+        else:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                yol_sayisi = st.slider("Simülasyon Yolu Sayısı", min_value=500, max_value=10000, value=2000, step=500)
+            with col2:
+                kantil_metni = st.text_input("Kantiller (%)", "5, 50, 95")
+            with col3:
+                esik_orani = st.slider("Kapasite Eşiği (% tarihsel aylık maksimum)", min_value=80, max_value=150,
+                                       value=100)
+            try:
+                kantiller = sorted({float(k) / 100 for k in kantil_metni.split(",") if k.strip()})
+            except ValueError:
+                st.warning("Kantiller virgülle ayrılmış sayılar olmalıdır; varsayılan 5, 50, 95 kullanıldı.")
+                kantiller = [0.05, 0.5, 0.95]
+            kantiller = [k for k in kantiller if 0 < k < 1] or [0.05, 0.5, 0.95]
+
+            simulasyon = kampus_yol_simulasyonu([sonuc['model'] for sonuc in fit_sonuclari],
+                                                tahmin_exog, yol_sayisi=yol_sayisi)
+            bina_esikleri = train_data.max().to_numpy() * esik_orani / 100
+            kampus_esigi = train_data.sum(axis=1).max() * esik_orani / 100
+            toplam_kantilleri = yol_kantilleri(simulasyon['toplam'], kantiller)
+
+            fig_simulasyon = go.Figure()
+            for i in range(len(kantiller) // 2):
+                alt, ust = toplam_kantilleri[i], toplam_kantilleri[-1 - i]
+                fig_simulasyon.add_trace(go.Scatter(
+                    x=list(tahmin_exog.index) + list(tahmin_exog.index[::-1]),
+                    y=list(alt) + list(ust[::-1]),
+                    fill='toself',
+                    fillcolor=f'rgba(255, 0, 0, {0.15 + 0.1 * i:.2f})',
+                    line=dict(color='rgba(255,255,255,0)'),
+                    name=f"%{kantiller[i] * 100:g} - %{kantiller[-1 - i] * 100:g}"
+                ))
+            if len(kantiller) % 2:
+                fig_simulasyon.add_trace(go.Scatter(
+                    x=tahmin_exog.index, y=toplam_kantilleri[len(kantiller) // 2],
+                    name=f"%{kantiller[len(kantiller) // 2] * 100:g} Kantil", line=dict(color='red')
+                ))
+            fig_simulasyon.add_hline(y=kampus_esigi, line_dash='dot', line_color='black',
+                                     annotation_text="Kapasite Eşiği")
+            fig_simulasyon.update_layout(
+                title=f"Kampüs Toplam Tüketimi - {yol_sayisi:,} Simülasyon Yolu",
+                xaxis_title="Tarih",
+                yaxis_title="Tüketim (kWh)",
+                hovermode='x unified'
+            )
+            st.plotly_chart(fig_simulasyon, use_container_width=True)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**Aylık Kampüs Eşik Aşım Olasılığı**")
+                st.dataframe(pd.DataFrame({
+                    'Tarih': tahmin_exog.index.strftime('%B %Y'),
+                    'Aşım Olasılığı (%)': asim_olasiligi(simulasyon['toplam'], kampus_esigi) * 100
+                }).style.format({'Aşım Olasılığı (%)': '{:.1f}'}))
+            with col2:
+                st.markdown("**Bina Bazında Yıl İçinde En Az Bir Aşım Olasılığı**")
+                st.dataframe(pd.DataFrame({
+                    'Bina': train_data.columns,
+                    'Eşik (kWh)': bina_esikleri,
+                    'Aşım Olasılığı (%)': donem_asim_olasiligi(simulasyon['yollar'], bina_esikleri) * 100
+                }).style.format({'Eşik (kWh)': '{:,.0f}', 'Aşım Olasılığı (%)': '{:.1f}'}))
+
+            yillik_toplam = simulasyon['toplam'].sum(axis=0)
+            bagimsiz_std = np.sqrt((simulasyon['yollar'].sum(axis=0).var(axis=0)).sum())
+            st.caption(f"Yıllık kampüs toplamı: ortalama {yillik_toplam.mean():,.0f} kWh, "
+                       f"standart sapma {yillik_toplam.std():,.0f} kWh "
+                       f"(binalar bağımsız kabul edilseydi {bagimsiz_std:,.0f} kWh)")
+
+    if fit_sonuclari is None:
+        return
 
     # İleride birleştirmek için tüm bina tahminlerini tutacağız
     forecast_results_all = []
 
-    # Her bina için ayrı SARIMAX kuralım
-    for bina_adi in train_data.columns:
+    # Her bina için sonuçları gösterelim
+    for bina_adi, sonuc in zip(train_data.columns, fit_sonuclari):
         st.subheader(f"🏢 {bina_adi} Binası Analizi")
 
         # Eğitim (train) tüketim verisi
         y_train = train_data[bina_adi]
 
-        # Modeli kuralım: exog = [HaftaSonuTatil, YazTatilFlag, Sıcaklık, ÖğrenciOranı ...]
-        model = SARIMAX(
-            y_train,
-            order=(p, d, q),
-            seasonal_order=(P, D, Q, s),
-            exog=train_exog[['Sicaklik', 'Nem', 'Guneslenme', 
-                             'Donem_Aktivitesi', 'Mesai_Saatleri', 'Hafta_Sonu_Etkisi']],
-            enforce_stationarity=False,
-            enforce_invertibility=False,
-            initialization='approximate_diffuse'
-        )
-        results = model.fit()
-
-        # 12 aylık ileri tahmin (2025)
-        forecast_steps = 12
-        forecast_obj = results.get_forecast(
-            steps=forecast_steps,
-            exog=forecast_exog[['Sicaklik', 'Nem', 'Guneslenme', 
-                               'Donem_Aktivitesi', 'Mesai_Saatleri', 'Hafta_Sonu_Etkisi']]
-        )
-        forecast_mean = forecast_obj.predicted_mean
-        conf_int = forecast_obj.conf_int()
+        forecast_mean = sonuc['tahmin']
+        conf_int = sonuc['guven_araligi']
 
         # Negatif tahminleri minimum değerle değiştirelim
-        min_value = y_train.min()
-        forecast_mean = pd.Series(
-            [max(x, min_value) for x in forecast_mean], 
-            index=forecast_mean.index
-        )
+        forecast_mean = forecast_mean.clip(lower=y_train.min())
 
         # Grafik için tarih index
-        future_dates = forecast_exog.index
+        future_dates = tahmin_exog.index
 
         # Mevcut veri (2023-2024) + Tahmin (2025) grafiği
         fig = go.Figure()
@@ -599,7 +968,7 @@ def show_time_series_analysis():
         ))
 
         fig.update_layout(
-            title=f"{bina_adi} - SARIMAX Tahmini (2025)",
+            title=f"{bina_adi} - {model_adi} Tahmini (2025)",
             xaxis_title="Tarih",
             yaxis_title="Tüketim (kWh)",
             hovermode='x unified'
@@ -610,14 +979,13 @@ def show_time_series_analysis():
         st.markdown("**Model İstatistikleri:**")
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("AIC", f"{results.aic:.2f}")
+            st.metric("AIC", f"{sonuc['aic']:.2f}")
         with col2:
-            st.metric("BIC", f"{results.bic:.2f}")
+            st.metric("BIC", f"{sonuc['bic']:.2f}")
         with col3:
-            try:
-                rmse_in_sample = np.sqrt(results.mse)
-                st.metric("RMSE (in-sample)", f"{rmse_in_sample:.2f}")
-            except:
+            if sonuc['mse'] is not None:
+                st.metric("RMSE (in-sample)", f"{np.sqrt(sonuc['mse']):.2f}")
+            else:
                 st.metric("RMSE (in-sample)", "N/A")
 
         # Tahmin sonuçlarını saklamak
@@ -658,7 +1026,7 @@ def show_time_series_analysis():
 
     # Bina bazında yıllık toplam ve günlük ortalama
     summary_data = []
-    for bina_adi in binalar.keys():
+    for bina_adi in df_binalar.columns:
         bina_df = all_forecasts_df[all_forecasts_df['Bina'] == bina_adi]
         total_yearly = bina_df['Tahmin'].sum()
         daily_avg = total_yearly / 365.0  # kaba yaklaşım
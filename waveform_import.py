@@ -0,0 +1,415 @@
+# waveform_import.py
+
+import json
+import os
+import shutil
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from meter_ingestion import _dosya_ozeti
+
+try:
+    import h5py
+except ImportError:  # MAT v7.3 (HDF5) dosyaları için isteğe bağlı
+    h5py = None
+
+# Zaman sütunu olarak tanınan adlar (küçük harf)
+ZAMAN_SUTUN_ADLARI = ('t', 'time', 'tout', 'zaman', 'time (s)', 'zaman (s)')
+
+SEYRELTME_YONTEMLERI = {
+    'lttb': 'LTTB (Min-Max ön seçimli)',
+    'minmaks': 'Min-Max'
+}
+
+# Sunucu tarafında okunabilecek dalga formlarının bulunduğu dizin (tanımlı değilse yalnızca yükleme)
+ICE_AKTARMA_DIZINI_DEGISKENI = "DALGA_ICE_AKTARMA_DIZINI"
+DALGA_UZANTILARI = ('.csv', '.mat')
+
+# HDF5 imzası; MAT v7.3 dosyalarında 512 baytlık kullanıcı bloğundan sonra gelir
+_HDF5_IMZASI = b'\x89HDF\r\n\x1a\n'
+
+
+def _ad(kaynak):
+    return os.path.basename(str(getattr(kaynak, 'name', kaynak)))
+
+
+def ice_aktarma_dizini():
+    """Yapılandırılmış içe aktarma dizini (ortam değişkeninden, gerçek yol); yoksa None."""
+    dizin = os.environ.get(ICE_AKTARMA_DIZINI_DEGISKENI)
+    return os.path.realpath(dizin) if dizin and os.path.isdir(dizin) else None
+
+
+def ice_aktarma_dosyalari(dizin=None):
+    """İçe aktarma dizinindeki CSV / MAT dosyalarının adları (alt dizinler taranmaz)."""
+    dizin = dizin or ice_aktarma_dizini()
+    if dizin is None:
+        return []
+    return sorted(ad for ad in os.listdir(dizin)
+                  if ad.lower().endswith(DALGA_UZANTILARI) and os.path.isfile(os.path.join(dizin, ad)))
+
+
+def ice_aktarma_yolu(ad, dizin=None):
+    """
+    İçe aktarma dizinindeki bir dosyanın doğrulanmış tam yolu. Yol normalleştirilir (sembolik
+    bağlar dahil); dizin dışına çıkan, desteklenmeyen uzantılı veya olmayan dosyalar reddedilir.
+    """
+    dizin = dizin or ice_aktarma_dizini()
+    if dizin is None:
+        raise ValueError("Sunucu tarafı içe aktarma dizini yapılandırılmamış")
+    yol = os.path.realpath(os.path.join(dizin, ad))
+    if os.path.commonpath([dizin, yol]) != dizin or os.path.dirname(yol) != dizin:
+        raise ValueError(f"{ad} içe aktarma dizininin dışında")
+    if not yol.lower().endswith(DALGA_UZANTILARI) or not os.path.isfile(yol):
+        raise ValueError(f"{ad} içe aktarma dizininde desteklenen bir dalga formu dosyası değil")
+    return yol
+
+
+def _hdf5_mi(kaynak):
+    if hasattr(kaynak, 'read'):
+        kaynak.seek(0)
+        baslik = kaynak.read(520)
+        kaynak.seek(0)
+    else:
+        with open(kaynak, 'rb') as f:
+            baslik = f.read(520)
+    return baslik[:8] == _HDF5_IMZASI or baslik[512:520] == _HDF5_IMZASI
+
+
+def _csv_parcalari(kaynak, parca_boyutu):
+    """CSV dosyasını sabit satırlık sayısal parçalar halinde okur."""
+    for parca in pd.read_csv(kaynak, chunksize=parca_boyutu):
+        yield [str(s).strip() for s in parca.columns], parca.to_numpy(dtype=np.float64)
+
+
+def _mat_parcalari(kaynak, parca_boyutu):
+    """
+    MAT dosyasındaki eşit uzunluklu sayısal değişkenleri sütun olarak parça parça okur. v7.3 (HDF5)
+    dosyaları h5py ile diskten dilim dilim okunur; eski sürümler (v5) scipy ile bir kerede yüklenir.
+    """
+    if _hdf5_mi(kaynak):
+        if h5py is None:
+            raise ImportError("MAT v7.3 dosyalarını okumak için h5py paketi gerekir")
+        with h5py.File(kaynak, 'r') as f:
+            veri_kumeleri = {}
+            f.visititems(lambda ad, nesne: veri_kumeleri.setdefault(ad, nesne)
+                         if isinstance(nesne, h5py.Dataset) and nesne.dtype.kind in 'fiu' else None)
+            yield from _degisken_parcalari(veri_kumeleri, parca_boyutu)
+    else:
+        from scipy.io import loadmat
+        degiskenler = {ad: deger for ad, deger in loadmat(kaynak).items()
+                       if not ad.startswith('__') and isinstance(deger, np.ndarray) and deger.dtype.kind in 'fiu'}
+        yield from _degisken_parcalari(degiskenler, parca_boyutu)
+
+
+def _degisken_parcalari(degiskenler, parca_boyutu):
+    """
+    Değişkenlerin uzun eksenini satır olarak kabul eder; en sık görülen uzunluktaki değişkenlerin
+    her satırı (ör. 3 fazlı akım) ayrı sütun olur.
+    """
+    uzunluklar = {ad: max(d.shape) for ad, d in degiskenler.items() if d.ndim in (1, 2) and min(d.shape) <= 16}
+    if not uzunluklar:
+        raise ValueError("Dosyada dalga formu olarak okunabilecek sayısal değişken yok")
+    n = Counter(uzunluklar.values()).most_common(1)[0][0]
+    secilen = [ad for ad, uzunluk in uzunluklar.items() if uzunluk == n]
+    sutunlar = []
+    for ad in secilen:
+        genislik = 1 if degiskenler[ad].ndim == 1 else min(degiskenler[ad].shape)
+        sutunlar += [ad] if genislik == 1 else [f"{ad}[{i}]" for i in range(genislik)]
+
+    for baslangic in range(0, n, parca_boyutu):
+        dilim = slice(baslangic, min(baslangic + parca_boyutu, n))
+        parcalar = []
+        for ad in secilen:
+            d = degiskenler[ad]
+            if d.ndim == 1:
+                parcalar.append(np.asarray(d[dilim], dtype=np.float64)[:, None])
+            elif d.shape[0] == n:
+                parcalar.append(np.asarray(d[dilim, :], dtype=np.float64))
+            else:
+                parcalar.append(np.asarray(d[:, dilim], dtype=np.float64).T)
+        yield sutunlar, np.hstack(parcalar)
+
+
+def dalga_parcalari(kaynak, parca_boyutu=1_000_000):
+    """CSV veya MAT dalga formu dosyasını (sütun adları, parça) çiftleri halinde okur."""
+    if _ad(kaynak).lower().endswith('.mat'):
+        return _mat_parcalari(kaynak, parca_boyutu)
+    return _csv_parcalari(kaynak, parca_boyutu)
+
+
+class WaveformStore:
+    """
+    İçe aktarılan dalga formlarını sütun başına bir ikili dosya (float64) olarak saklayan depo.
+    Dosyalar parça parça okunup diske eklenir; sinyaller np.memmap ile açıldığından çizim ve
+    özetler için tüm iz belleğe yüklenmez. Kayıtlar dosya içeriğinin özetiyle tutulur.
+    """
+
+    def __init__(self, root=".cache/dalga_formlari"):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _klasor(self, anahtar):
+        return os.path.join(self.root, anahtar)
+
+    def meta(self, anahtar):
+        with open(os.path.join(self._klasor(anahtar), "meta.json"), encoding='utf-8') as f:
+            return json.load(f)
+
+    def ingest(self, kaynak, parca_boyutu=1_000_000, ornekleme_frekansi=None):
+        """
+        Dosyayı parça parça okuyarak sütun dosyalarına ekler. Zaman sütunu yoksa örnekler
+        ornekleme_frekansi (Hz) ile eşit aralıklı kabul edilir.
+
+        Returns:
+            dict: Kayıt anahtarı, satır/sütun sayısı, disk boyutu, okuma hızı ve atlanma durumu.
+        """
+        baslangic = time.perf_counter()
+        anahtar = _dosya_ozeti(kaynak)[:16]
+        klasor = self._klasor(anahtar)
+        if os.path.exists(os.path.join(klasor, "meta.json")):
+            meta = self.meta(anahtar)
+            return {**meta, 'anahtar': anahtar, 'satir_per_saniye': None, 'atlandi': True}
+
+        gecici = f"{klasor}.tmp-{os.getpid()}"
+        shutil.rmtree(gecici, ignore_errors=True)
+        os.makedirs(gecici)
+        # Okuma yarıda kalırsa (bozuk dosya, disk hatası, iptal) geçici klasör depoda bırakılmaz
+        try:
+            sutunlar = None
+            dosyalar = []
+            satir = 0
+            try:
+                for adlar, parca in dalga_parcalari(kaynak, parca_boyutu):
+                    if sutunlar is None:
+                        sutunlar = adlar
+                        dosyalar = [open(os.path.join(gecici, f"{i}.f64"), 'wb') for i in range(len(sutunlar))]
+                    # Sütun dosyalarına sırayla eklenir: her sinyal diskte bitişik durur
+                    for i, dosya in enumerate(dosyalar):
+                        np.ascontiguousarray(parca[:, i]).tofile(dosya)
+                    satir += len(parca)
+            finally:
+                for dosya in dosyalar:
+                    dosya.close()
+            if not satir:
+                raise ValueError(f"{_ad(kaynak)} dosyasında veri satırı yok")
+
+            zaman_sutunu = next((s for s in sutunlar if s.lower() in ZAMAN_SUTUN_ADLARI), None)
+            if zaman_sutunu is not None:
+                zaman = np.memmap(os.path.join(gecici, f"{sutunlar.index(zaman_sutunu)}.f64"), dtype=np.float64,
+                                  mode='r', shape=(satir,))
+                sure_s = float(zaman[-1] - zaman[0])
+                ornekleme_frekansi = (satir - 1) / sure_s if sure_s > 0 else None
+                del zaman
+            elif ornekleme_frekansi:
+                sure_s = (satir - 1) / ornekleme_frekansi
+            else:
+                raise ValueError("Zaman sütunu bulunamadı; örnekleme frekansı verilmelidir")
+
+            meta = {
+                'dosya': _ad(kaynak),
+                'sutunlar': sutunlar,
+                'zaman_sutunu': zaman_sutunu,
+                'satir': satir,
+                'ornekleme_frekansi': ornekleme_frekansi,
+                'sure_s': sure_s,
+                'boyut_mb': satir * len(sutunlar) * 8 / 1024 ** 2,
+                'eklenme': time.time()
+            }
+            with open(os.path.join(gecici, "meta.json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            shutil.rmtree(klasor, ignore_errors=True)
+            os.replace(gecici, klasor)
+        except BaseException:
+            shutil.rmtree(gecici, ignore_errors=True)
+            raise
+
+        gecen = time.perf_counter() - baslangic
+        return {**meta, 'anahtar': anahtar, 'satir_per_saniye': satir / gecen if gecen > 0 else None,
+                'atlandi': False}
+
+    def listele(self):
+        """Depodaki dalga formlarının tablosu (en yeni üstte)."""
+        kayitlar = []
+        for anahtar in os.listdir(self.root):
+            if os.path.exists(os.path.join(self._klasor(anahtar), "meta.json")):
+                meta = self.meta(anahtar)
+                kayitlar.append({
+                    'Anahtar': anahtar,
+                    'Dosya': meta['dosya'],
+                    'Sinyal Sayısı': len(meta['sutunlar']) - (meta['zaman_sutunu'] is not None),
+                    'Örnek Sayısı': meta['satir'],
+                    'Örnekleme (kHz)': (meta['ornekleme_frekansi'] or np.nan) / 1000,
+                    'Süre (s)': meta['sure_s'],
+                    'Boyut (MB)': meta['boyut_mb'],
+                    'eklenme': meta['eklenme']
+                })
+        if not kayitlar:
+            return pd.DataFrame(columns=['Anahtar', 'Dosya', 'Sinyal Sayısı', 'Örnek Sayısı', 'Örnekleme (kHz)',
+                                         'Süre (s)', 'Boyut (MB)'])
+        return pd.DataFrame(kayitlar).sort_values('eklenme', ascending=False).drop(columns='eklenme')
+
+    def sinyal(self, anahtar, sutun):
+        """Sinyali salt okunur np.memmap olarak açar."""
+        meta = self.meta(anahtar)
+        return np.memmap(os.path.join(self._klasor(anahtar), f"{meta['sutunlar'].index(sutun)}.f64"),
+                         dtype=np.float64, mode='r', shape=(meta['satir'],))
+
+    def zaman(self, anahtar, indeksler=None):
+        """Örnek zamanları (s); zaman sütunu yoksa örnekleme frekansından hesaplanır."""
+        meta = self.meta(anahtar)
+        if meta['zaman_sutunu'] is not None:
+            zaman = self.sinyal(anahtar, meta['zaman_sutunu'])
+            return zaman if indeksler is None else np.asarray(zaman[indeksler])
+        indeksler = np.arange(meta['satir']) if indeksler is None else np.asarray(indeksler)
+        return indeksler / meta['ornekleme_frekansi']
+
+    def aralik(self, anahtar, baslangic_s, bitis_s):
+        """[baslangic_s, bitis_s] zaman aralığının örnek indeksleri (ikili arama ile)."""
+        meta = self.meta(anahtar)
+        if meta['zaman_sutunu'] is None:
+            fs = meta['ornekleme_frekansi']
+            return (int(np.clip(np.ceil(baslangic_s * fs), 0, meta['satir'])),
+                    int(np.clip(np.floor(bitis_s * fs) + 1, 0, meta['satir'])))
+        zaman = self.zaman(anahtar)
+        return int(np.searchsorted(zaman, baslangic_s, 'left')), int(np.searchsorted(zaman, bitis_s, 'right'))
+
+    def sil(self, anahtar):
+        shutil.rmtree(self._klasor(anahtar), ignore_errors=True)
+
+
+def minmaks_indeksleri(y, kova_sayisi, blok=1 << 22):
+    """
+    Min-max seyreltme: seriyi eşit boyutlu kovalara bölüp her kovanın en küçük ve en büyük
+    örneğinin indekslerini seçer; tepe değerleri ve anahtarlama geçişleri korunur. Seri en fazla
+    'blok' örneklik dilimler halinde okunduğundan memmap sinyaller belleğe yüklenmez.
+
+    Returns:
+        ndarray: Sıralı, tekil indeksler (ilk ve son örnek dahil).
+    """
+    n = len(y)
+    if n <= 2 * kova_sayisi:
+        return np.arange(n)
+    boy = -(-n // kova_sayisi)
+    tam = n // boy
+    kova_blogu = max(1, blok // boy)
+    parcalar = [np.array([0, n - 1])]
+    for k0 in range(0, tam, kova_blogu):
+        k1 = min(tam, k0 + kova_blogu)
+        kovalar = np.asarray(y[k0 * boy:k1 * boy]).reshape(k1 - k0, boy)
+        taban = np.arange(k0, k1) * boy
+        parcalar += [kovalar.argmin(axis=1) + taban, kovalar.argmax(axis=1) + taban]
+    if tam * boy < n:
+        kalan = np.asarray(y[tam * boy:])
+        parcalar.append(np.array([kalan.argmin(), kalan.argmax()]) + tam * boy)
+    return np.unique(np.concatenate(parcalar))
+
+
+def lttb_indeksleri(x, y, hedef):
+    """
+    Largest-Triangle-Three-Buckets: her kovadan, önceki seçilen nokta ve sonraki kovanın
+    ortalamasıyla en büyük üçgeni oluşturan noktayı seçer. Kova ortalamaları tek seferde hesaplanır.
+
+    Returns:
+        ndarray: Seçilen 'hedef' adet indeks.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if hedef >= n or hedef < 3:
+        return np.arange(n)
+    sinirlar = np.r_[np.linspace(1, n - 1, hedef - 1).astype(int), n]    # iç kovalar + son nokta
+    uzunluk = np.diff(sinirlar)
+    ort_x = np.add.reduceat(x, sinirlar[:-1]) / uzunluk
+    ort_y = np.add.reduceat(y, sinirlar[:-1]) / uzunluk
+
+    secilen = np.empty(hedef, dtype=np.int64)
+    secilen[0], secilen[-1] = 0, n - 1
+    a = 0
+    for i in range(hedef - 2):
+        bas, bit = sinirlar[i], sinirlar[i + 1]
+        alan = np.abs((x[a] - ort_x[i + 1]) * (y[bas:bit] - y[a]) - (x[a] - x[bas:bit]) * (ort_y[i + 1] - y[a]))
+        a = bas + int(alan.argmax())
+        secilen[i + 1] = a
+    return secilen
+
+
+def seyreltilmis_sinyal(depo, anahtar, sutun, hedef=4000, baslangic_s=None, bitis_s=None, yontem='lttb'):
+    """
+    Sinyalin zaman aralığını çizim için 'hedef' kadar noktaya indirir. LTTB, doğrudan milyonlarca
+    örnek üzerinde sıralı çalışamayacağından önce min-max ile 4 × hedef adaya indirgenir.
+
+    Returns:
+        tuple: (zaman (s), değer) dizileri
+    """
+    if baslangic_s is None and bitis_s is None:
+        a, b = 0, depo.meta(anahtar)['satir']
+    else:
+        a, b = depo.aralik(anahtar, -np.inf if baslangic_s is None else baslangic_s,
+                           np.inf if bitis_s is None else bitis_s)
+    y = depo.sinyal(anahtar, sutun)[a:b]
+    if yontem == 'minmaks':
+        indeksler = minmaks_indeksleri(y, max(1, hedef // 2))
+    elif yontem == 'lttb':
+        adaylar = minmaks_indeksleri(y, 2 * hedef)
+        indeksler = adaylar[lttb_indeksleri(depo.zaman(anahtar, adaylar + a), y[adaylar], hedef)]
+    else:
+        raise ValueError(f"Bilinmeyen seyreltme yöntemi: {yontem}")
+    return depo.zaman(anahtar, indeksler + a), np.asarray(y[indeksler])
+
+
+def sinyal_ozeti(depo, anahtar, sutunlar=None, blok=1 << 22):
+    """Sinyallerin ortalama, RMS, en küçük ve en büyük değerlerini bloklar halinde okuyarak hesaplar."""
+    meta = depo.meta(anahtar)
+    sutunlar = sutunlar or [s for s in meta['sutunlar'] if s != meta['zaman_sutunu']]
+    satirlar = []
+    for sutun in sutunlar:
+        y = depo.sinyal(anahtar, sutun)
+        toplam = kare_toplam = 0.0
+        en_kucuk, en_buyuk = np.inf, -np.inf
+        for i in range(0, len(y), blok):
+            parca = np.asarray(y[i:i + blok])
+            toplam += parca.sum()
+            kare_toplam += np.dot(parca, parca)
+            en_kucuk = min(en_kucuk, parca.min())
+            en_buyuk = max(en_buyuk, parca.max())
+        satirlar.append({
+            'Sinyal': sutun,
+            'Ortalama': toplam / len(y),
+            'RMS': np.sqrt(kare_toplam / len(y)),
+            'En Küçük': en_kucuk,
+            'En Büyük': en_buyuk
+        })
+    return pd.DataFrame(satirlar)
+
+
+def ortalama_guc(depo, anahtar, gerilim_sutunu, akim_sutunu, blok=1 << 22):
+    """Anlık güç (v × i) ortalamasını ve tepe değerini (W) bloklar halinde hesaplar."""
+    v = depo.sinyal(anahtar, gerilim_sutunu)
+    i = depo.sinyal(anahtar, akim_sutunu)
+    toplam, tepe = 0.0, -np.inf
+    for bas in range(0, len(v), blok):
+        guc = np.asarray(v[bas:bas + blok]) * np.asarray(i[bas:bas + blok])
+        toplam += guc.sum()
+        tepe = max(tepe, guc.max())
+    return toplam / len(v), tepe
+
+
+def ornek_dalga_dosyasi_olustur(yol, sure_s=2.0, ornekleme_frekansi=20_000, parca_boyutu=1_000_000, seed=0):
+    """
+    Test için Simulink benzeri dalga formu CSV'si yazar: DC bara gerilimi/akımı (MPPT dalgalanmalı)
+    ve 50 Hz inverter çıkış gerilimi/akımı (PWM gürültülü). Dosya parça parça yazılır.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(sure_s * ornekleme_frekansi)
+    with open(yol, 'w', encoding='utf-8') as f:
+        f.write("time,V_dc,I_dc,V_ac,I_ac\n")
+        for bas in range(0, n, parca_boyutu):
+            t = np.arange(bas, min(n, bas + parca_boyutu)) / ornekleme_frekansi
+            v_dc = 583.0 + 2.0 * np.sin(2 * np.pi * 0.5 * t) + rng.normal(0, 0.5, len(t))
+            i_dc = 90.0 + 8.0 * np.sin(2 * np.pi * 0.5 * t + 0.3) + rng.normal(0, 0.3, len(t))
+            v_ac = 325.0 * np.sin(2 * np.pi * 50 * t) + rng.normal(0, 3.0, len(t))
+            i_ac = 150.0 * np.sin(2 * np.pi * 50 * t - 0.1) + rng.normal(0, 1.5, len(t))
+            np.savetxt(f, np.column_stack([t, v_dc, i_dc, v_ac, i_ac]), delimiter=',', fmt='%.9g')